@@ -0,0 +1,19 @@
+"""Outils communs des benchmarks."""
+import resource
+
+
+def memory_kb(pid="self"):
+    """Mémoire du processus ``pid`` en kB : RSS, PSS et USS (pages privées).
+
+    Lue dans ``/proc/<pid>/smaps_rollup`` (Linux). Ailleurs, seul le pic de
+    RSS du processus courant est disponible (PSS et USS à None).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.strip().endswith("kB")}
+    except OSError:
+        if pid != "self":
+            raise
+        return {"rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "pss_kb": None, "uss_kb": None}
+    return {"rss_kb": fields["Rss"], "pss_kb": fields["Pss"],
+            "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)}
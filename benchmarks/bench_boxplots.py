@@ -0,0 +1,62 @@
+"""Boîtes à moustaches : rendu PNG serveur contre résumés envoyés au navigateur.
+
+Pour les sept indicateurs de la page Datavisualisation (données 2005-2020
+agrandies jusqu'à 100 fois), compare :
+
+- ``png``  : tracé seaborn + rastérisation de chaque figure, taille des PNG ;
+- ``spec`` : ``distributions.box_stats`` en une passe sur toutes les colonnes,
+  puis spécifications Vega-Lite, taille du JSON envoyé.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_boxplots [--scales 1 10 100]
+"""
+import argparse
+import io
+import json
+import time
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from whr import registry
+from whr.distributions import box_spec, box_stats
+from whr.figures import RENDER_DPI, draw_boxplot
+
+COLUMNS = ['Life Ladder', 'Log GDP per capita', 'Social support', 'Healthy life expectancy at birth',
+           'Freedom to make life choices', 'Generosity', 'Perceptions of corruption']
+
+
+def render_png(values):
+    fig = draw_boxplot(values, "blue")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=RENDER_DPI, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args(argv)
+
+    base = registry.get("whr_2005_2020")
+    print(f"{'échelle':<9}{'lignes':>10}{'png (ms)':>11}{'png (Ko)':>11}{'spec (ms)':>12}{'spec (Ko)':>11}")
+    for scale in args.scales:
+        frame = pd.concat([base] * scale, ignore_index=True)
+
+        start = time.perf_counter()
+        pngs = [render_png(frame[c]) for c in COLUMNS]
+        png_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        stats, outliers = box_stats(frame, COLUMNS)
+        specs = [json.dumps(box_spec(stats.loc[c], outliers[c], "blue")) for c in COLUMNS]
+        spec_ms = (time.perf_counter() - start) * 1000
+
+        png_kb = sum(map(len, pngs)) / 1024
+        spec_kb = sum(map(len, specs)) / 1024
+        print(f"x{scale:<8}{len(frame):>10}{png_ms:>11.1f}{png_kb:>11.1f}{spec_ms:>12.1f}{spec_kb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
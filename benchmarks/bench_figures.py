@@ -0,0 +1,88 @@
+"""Mémoire en régime permanent de la page Datavisualisation.
+
+Simule des affichages successifs des 14 boîtes à moustaches de la page :
+
+- ``cached``   : chemin actuel, ``whr.figures.FIGURES`` (PNG en cache LRU,
+  figures fermées après rastérisation) ;
+- ``uncached`` : ancien chemin, une figure pyplot créée à chaque affichage
+  et jamais fermée.
+
+La croissance de la mémoire du mode ``cached`` entre le 10e et le dernier
+affichage est affichée ; ``tests/test_figures.py`` vérifie qu'elle reste
+négligeable sur 1 000 affichages.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_figures [--views 1000] [--uncached-views 30]
+"""
+import argparse
+import io
+import time
+
+from benchmarks._util import memory_kb
+
+# (jeu de données, colonne, couleur, ylim) : les 14 graphiques de la page
+CHARTS = [
+    ("whr_2005_2020", "Life Ladder", "blue", (0, 10)), ("whr_2021", "Ladder score", "blue", (0, 10)),
+    ("whr_2005_2020", "Log GDP per capita", "#C832BE", None), ("whr_2021", "Logged GDP per capita", "#C832BE", None),
+    ("whr_2005_2020", "Social support", "#FF7873", None), ("whr_2021", "Social support", "#FF7873", None),
+    ("whr_2005_2020", "Healthy life expectancy at birth", "#009692", None),
+    ("whr_2021", "Healthy life expectancy", "#009692", None),
+    ("whr_2005_2020", "Freedom to make life choices", "#FFA100", None),
+    ("whr_2021", "Freedom to make life choices", "#FFA100", None),
+    ("whr_2005_2020", "Generosity", "#7DB456", None), ("whr_2021", "Generosity", "#7DB456", None),
+    ("whr_2005_2020", "Perceptions of corruption", "#C3175C", None),
+    ("whr_2021", "Perceptions of corruption", "#C3175C", None),
+]
+
+
+def page_view(mode):
+    from whr import registry
+    from whr.figures import FIGURES, draw_boxplot
+
+    version = registry.get("data_version")
+    for dataset, column, color, ylim in CHARTS:
+        values = registry.get(dataset)[column]
+        if mode == "cached":
+            key = ("boxplot", version, dataset, column, color, ylim, None)
+            FIGURES.render(key, lambda: draw_boxplot(values, color, ylim))
+        else:
+            draw_boxplot(values, color, ylim).savefig(io.BytesIO(), format="png")
+
+
+def run(mode, views, checkpoints):
+    rows = []
+    start = time.perf_counter()
+    for view in range(1, views + 1):
+        page_view(mode)
+        if view in checkpoints or view == views:
+            rows.append((view, memory_kb()["rss_kb"] / 1024, time.perf_counter() - start))
+    return rows
+
+
+def growth_mb(rows, warmup=10):
+    """Croissance du RSS (Mo) entre l'affichage ``warmup`` et le dernier, depuis les lignes de :func:`run`."""
+    after_warmup = next(rss for view, rss, _ in rows if view >= min(warmup, rows[-1][0]))
+    return rows[-1][1] - after_warmup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=1000)
+    parser.add_argument("--uncached-views", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    checkpoints = {1, 10, 30, 100, 300, 1000}
+    for mode, views in (("cached", args.views), ("uncached", args.uncached_views)):
+        if views <= 0:
+            continue
+        rows = run(mode, views, checkpoints)
+        print(f"\n{mode} ({views} affichages)")
+        print(f"{'affichage':>10}{'RSS (Mo)':>12}{'temps (s)':>12}")
+        for view, rss, elapsed in rows:
+            print(f"{view:>10}{rss:>12.1f}{elapsed:>12.2f}")
+        if mode == "cached":
+            print(f"croissance après échauffement : {growth_mb(rows):+.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
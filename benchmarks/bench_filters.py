@@ -0,0 +1,98 @@
+"""Latence des filtres région / pays / années : parcours booléen contre index.
+
+Le panel est agrandi en mémoire (chaque pays dupliqué en unités ``ISO_k``)
+jusqu'à 100 fois sa taille. Pour chaque combinaison de filtres on mesure :
+
+- ``scan``  : :func:`filter_panel` (masque booléen sur tout le panel) ;
+- ``index`` : ``filters.PanelIndex`` (intersection de positions) + extraction ;
+- ``cache`` : second appel de ``filters.filtered_panel`` (vue mémorisée).
+
+Les deux méthodes sont vérifiées identiques.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_filters [--scales 1 10 100]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from whr import filters, registry, schema
+
+CASES = {
+    "région": (["Western Europe"], None, None),
+    "années": (None, (2010, 2015), None),
+    "région + années": (["Western Europe", "South Asia"], (2008, 2012), None),
+    "pays + années": (None, (2008, 2012), ["FRA", "IND", "USA", "BRA", "JPN"]),
+    "tous filtres": (["Western Europe"], (2010, 2020), ["FRA", "DEU", "ITA"]),
+}
+
+
+def filter_panel(panel, regions=None, years=None, countries=None):
+    """Sous-ensemble du panel par parcours complet : régions, années ``(début, fin)`` et pays ISO (None = tous).
+
+    Référence de ``whr.filters.PanelIndex``, qui donne le même résultat par index.
+    """
+    mask = np.ones(len(panel), dtype=bool)
+    if regions:
+        mask &= panel['Regional indicator'].isin(regions).to_numpy()
+    if years:
+        year = panel['year'].astype(int).to_numpy()
+        mask &= (year >= years[0]) & (year <= years[1])
+    if countries:
+        mask &= panel['ISO-alpha3 Code'].isin(countries).to_numpy()
+    return panel.loc[mask]
+
+
+def scaled_panel(panel, scale):
+    parts = [panel]
+    for k in range(1, scale):
+        part = panel.copy()
+        part['ISO-alpha3 Code'] = part['ISO-alpha3 Code'].astype('str') + f"_{k}"
+        part['Country name'] = part['Country name'].astype('str') + f" ({k})"
+        parts.append(part)
+    # Mêmes types que le panel réel (catégories recalculées sur les unités ajoutées)
+    return schema.enforce(pd.concat(parts, ignore_index=True))
+
+
+def best_of(fn, repeat=7):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args(argv)
+
+    base = registry.get("df_processed")
+    print(f"{'échelle':<9}{'lignes':>9}  {'filtre':<18}{'scan (ms)':>11}{'index (ms)':>12}{'cache (ms)':>12}")
+    for scale in args.scales:
+        panel = scaled_panel(base, scale)
+        start = time.perf_counter()
+        index = filters.PanelIndex(panel)
+        build_ms = (time.perf_counter() - start) * 1000
+        # Le cache des vues lit le panel courant dans le registre
+        registry.clear()
+        registry.dataset("df_processed")(lambda: panel)
+        registry.dataset("panel_index")(lambda: index)
+        filters.filtered_panel.cache_clear()
+
+        for name, (regions, years, countries) in CASES.items():
+            key = filters.filter_key(regions, years, countries)
+            scan_ms, expected = best_of(lambda: filter_panel(panel, regions, years, countries))
+            index_ms, result = best_of(lambda: filters.apply(panel, index, key))
+            filters.filtered_panel(scale, key)
+            cache_ms, _ = best_of(lambda: filters.filtered_panel(scale, key))
+            assert np.array_equal(result.index, expected.index), name
+            print(f"x{scale:<8}{len(panel):>9}  {name:<18}{scan_ms:>11.2f}{index_ms:>12.2f}{cache_ms:>12.4f}")
+        print(f"{'':<9}{'':>9}  construction de l'index : {build_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
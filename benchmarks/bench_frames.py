@@ -0,0 +1,67 @@
+"""Curseur d'années de la page Tendances : images pré-rendues contre rendu à chaque déplacement.
+
+Sur le panel courant (sans filtre), pour le nuage PIB / Life Ladder de
+``whr.animation`` :
+
+- ``rendu``      : une figure matplotlib dessinée et rastérisée à chaque
+  déplacement du curseur (durée par image, cadrage serré recalculé) ;
+- ``pré-rendu``  : toutes les années rendues une fois par
+  :func:`whr.animation.year_frames`, pour chaque nombre de processus de
+  ``--jobs`` (cache vidé avant chaque mesure) ;
+- ``curseur``    : déplacements suivants, servis par le cache ``FRAMES``.
+
+Pour le mode navigateur, la taille de la spécification Vega-Lite d'une année
+(coordonnées de cette année seulement) est comparée à celle d'une image PNG.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_frames [--jobs 1 4] [--moves 200]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_filters import best_of
+from whr import registry
+from whr.animation import FRAMES, YearPoints, frame_spec, year_frames
+from whr.figures import draw_year_scatter, rasterize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--moves", type=int, default=200, help="déplacements du curseur simulés")
+    args = parser.parse_args(argv)
+
+    points = YearPoints(registry.get("df_processed"))
+    key = ("bench_frames",)
+    sample = np.random.default_rng(0).choice(points.years, args.moves)
+    print(f"{len(points.years)} années, {sum(len(f['x']) for f in points.frames.values())} points")
+
+    year = points.years[-1]
+    frame_args = (points.frames[year], year, points.regions, points.xlim, points.ylim, points.x, points.y)
+    redraw_ms, (png, _) = best_of(lambda: rasterize(draw_year_scatter(*frame_args)), repeat=3)
+    print(f"  {'rendu':<24}{redraw_ms:>10.1f} ms par déplacement")
+
+    for jobs in args.jobs:
+        def cold():
+            FRAMES.clear()
+            return year_frames(points, key, jobs=jobs)
+        ms, _ = best_of(cold, repeat=2)
+        print(f"  {f'pré-rendu ({jobs} processus)':<24}{ms:>10.1f} ms pour toutes les années "
+              f"({FRAMES.nbytes / 1e6:.1f} Mo en cache)")
+
+    start = time.perf_counter()
+    for y in sample:
+        year_frames(points, key)[int(y)]
+    per_move = (time.perf_counter() - start) * 1000 / args.moves
+    print(f"  {'curseur (cache)':<24}{per_move:>10.3f} ms par déplacement")
+
+    spec = np.mean([len(json.dumps(frame_spec(points, y))) for y in points.years])
+    print(f"\nnavigateur : {spec / 1e3:.1f} ko de spécification par année, contre {len(png) / 1e3:.1f} ko par image PNG")
+
+
+if __name__ == "__main__":
+    main()
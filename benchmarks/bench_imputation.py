@@ -0,0 +1,71 @@
+"""Comblement des valeurs manquantes : calcul vectorisé contre groupby pandas.
+
+Le panel est agrandi en mémoire comme dans ``benchmarks.bench_filters``
+(chaque pays dupliqué en unités ``ISO_k``) jusqu'à 100 fois sa taille. Pour
+chaque méthode de ``whr.imputation``, on mesure :
+
+- ``pandas``   : la même opération écrite avec ``groupby`` par pays
+  (``interpolate`` dans un ``transform``, ``ffill``/``bfill`` bornés,
+  médiane par région et année) sur le panel trié par (code ISO, année) ;
+- ``vectorisé`` : :func:`whr.imputation.fill_gaps`.
+
+Les deux résultats sont comparés cellule par cellule (mêmes cellules
+comblées, écart absolu maximal affiché).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_imputation [--scales 1 10 100] [--limit 2]
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.bench_filters import best_of, scaled_panel
+from whr import registry
+from whr.imputation import DEFAULT_LIMIT, METHODS, fill_gaps
+from whr.schema import INDICATORS
+
+
+def pandas_fill(panel, method, limit):
+    """Référence pandas : panel trié par (code ISO, année), indicateurs en float64, remis dans l'ordre d'origine."""
+    frame = panel.assign(**{c: panel[c].astype('float64') for c in INDICATORS})
+    frame = frame.sort_values(['ISO-alpha3 Code', 'year'], kind='stable')
+    groups = frame.groupby('ISO-alpha3 Code', observed=True, sort=False)[INDICATORS]
+    if method == 'linear':
+        filled = groups.transform(lambda s: s.interpolate(limit_area='inside'))
+    elif method == 'time':
+        years = frame['year'].astype('float64')
+        filled = groups.transform(lambda s: s.set_axis(years.loc[s.index])
+                                  .interpolate(method='index', limit_area='inside').set_axis(s.index))
+    elif method == 'ffill':
+        filled = groups.ffill(limit=limit).fillna(groups.bfill(limit=limit))
+    else:
+        medians = frame.groupby(['Regional indicator', 'year'], observed=True)[INDICATORS].transform('median')
+        filled = frame[INDICATORS].fillna(medians)
+    return filled.loc[panel.index].to_numpy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="lignes reportées (méthode ffill)")
+    args = parser.parse_args(argv)
+
+    base = registry.get("df_processed")
+    print(f"{'échelle':<9}{'lignes':>9}  {'méthode':<8}{'pandas (ms)':>13}{'vectorisé (ms)':>16}"
+          f"{'comblées':>10}{'écart max':>11}")
+    for scale in args.scales:
+        panel = scaled_panel(base, scale) if scale > 1 else base
+        for method in METHODS:
+            repeat = 1 if scale >= 100 else 3
+            pandas_ms, expected = best_of(lambda: pandas_fill(panel, method, args.limit), repeat=repeat)
+            vector_ms, result = best_of(lambda: fill_gaps(panel, method, args.limit), repeat=repeat)
+            values = result.panel[INDICATORS].to_numpy(dtype=np.float64)
+            # Même ensemble de cellules renseignées, valeurs égales à la précision float32 près
+            assert np.array_equal(np.isnan(values), np.isnan(expected)), method
+            gap = np.nanmax(np.abs(values - expected.astype(np.float32)), initial=0.0)
+            print(f"x{scale:<8}{len(panel):>9}  {method:<8}{pandas_ms:>13.1f}{vector_ms:>16.1f}"
+                  f"{result.total:>10}{gap:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Chargement des six sources : séquentiel contre parallèle.
+
+Sur les données synthétiques de ``benchmarks.bench_suite`` (``.cache/bench``),
+chaque mesure tourne dans un processus neuf :
+
+- ``cold`` : artefacts supprimés, conversion des six sources puis pipeline ;
+- ``warm`` : artefacts à jour, lecture Parquet puis pipeline.
+
+``sequential`` appelle ``load_and_preprocess_data(parallel=False)`` (une
+source après l'autre), ``parallel`` le chemin par défaut. Le temps de
+conversion de chaque source est relevé dans le manifest : à froid, le chemin
+parallèle est borné par la plus longue (avec assez de cœurs), le chemin
+séquentiel par leur somme.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_loading [--scales 1 10]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from benchmarks.bench_suite import prepare, spawn_child
+
+
+def _run(mode):
+    from whr import ingest, pipeline
+
+    state, path = mode.split("-")
+    if state == "cold":
+        shutil.rmtree(ingest.ARTIFACTS_DIR, ignore_errors=True)
+    start = time.perf_counter()
+    pipeline.load_and_preprocess_data(parallel=path == "parallel")
+    seconds = time.perf_counter() - start
+    sources = {name: entry["seconds"] for name, entry in ingest.read_manifest().items()}
+    return {"seconds": round(seconds, 3), "sources": sources}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run(args.child)))
+        return 0
+
+    print(f"{os.cpu_count()} cœur(s)")
+    print(f"{'échelle':<9}{'état':<6}{'séquentiel (s)':>16}{'parallèle (s)':>15}{'source max (s)':>16}{'somme (s)':>11}")
+    for scale in args.scales:
+        data_dir, _ = prepare(scale)
+        for state in ("cold", "warm"):
+            sequential = spawn_child(f"{state}-sequential", data_dir, module="benchmarks.bench_loading")
+            parallel = spawn_child(f"{state}-parallel", data_dir, module="benchmarks.bench_loading")
+            if "error" in sequential or "error" in parallel:
+                print(f"x{scale:<8}{state:<6} erreur : {sequential.get('error') or parallel.get('error')}")
+                continue
+            line = f"x{scale:<8}{state:<6}{sequential['seconds']:>16.3f}{parallel['seconds']:>15.3f}"
+            if state == "cold":
+                per_source = sequential["sources"].values()
+                line += f"{max(per_source):>16.3f}{sum(per_source):>11.3f}"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Mémoire de plusieurs processus serveur qui chargent le même panel.
+
+Le panel est répété ``--scale`` fois (mêmes pays et catégories, plus de
+lignes) puis écrit une fois au format du snapshot (Arrow IPC,
+``whr.snapshot``) et en pickle. Pour chaque nombre de processus de
+``--workers``, autant de processus neufs chargent le panel en même temps,
+calculent une vue dérivée (sélection de colonnes et d'années, moyennes
+annuelles comme sur les pages d'analyse) et restent en vie pendant la
+mesure :
+
+- ``copy``   : ancien fonctionnement, chaque processus désérialise sa propre
+  copie (pickle, comme ``st.cache_data``) ;
+- ``shared`` : chaque processus mappe le fichier du snapshot
+  (``pa.memory_map``) ; les pages des colonnes sont celles du cache de
+  pages du système, communes à tous les processus.
+
+La mémoire de chaque processus est lue dans ``/proc/<pid>/smaps_rollup``
+(Linux) : RSS (pages partagées comptées dans chaque processus), PSS (pages
+partagées divisées entre les processus qui les utilisent) et USS (pages
+privées). On affiche les totaux sur tous les processus, moins ceux d'autant
+de processus qui chargent de la même façon un panel vide (mêmes colonnes,
+aucune ligne) : seule reste la mémoire due aux lignes du panel. Avec
+``shared``, le PSS total ne croît qu'avec la vue dérivée de chaque processus,
+les colonnes du panel ne sont comptées qu'une fois.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_sessions [--workers 1 4 8] [--scale 100]
+"""
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._util import memory_kb
+
+INDICATORS = ['Life Ladder', 'Logged GDP per capita', 'Healthy life expectancy']
+
+
+def _session_view(df):
+    return df.loc[df['year'] >= 2015, ['year', 'Country name'] + INDICATORS]
+
+
+def _worker(mode, stem):
+    """Processus mesuré : charge le panel ``stem`` selon ``mode``, signale qu'il est prêt, attend la fin de la mesure."""
+    from whr import snapshot
+
+    if mode == "copy":
+        with open(stem + ".pkl", "rb") as f:
+            df = pickle.load(f)
+    else:
+        df = snapshot._map_frame(stem + ".arrow")
+    view = _session_view(df)
+    # Calculs typiques d'une page (moyennes annuelles)
+    view.groupby('year')[INDICATORS].mean()
+    print("ready", flush=True)
+    sys.stdin.read()
+
+
+def _write(panel, stem):
+    """Écrit ``panel`` en ``stem.arrow`` (snapshot) et ``stem.pkl`` ; retourne la taille du snapshot."""
+    from whr import snapshot
+
+    snapshot._write_frame(panel, stem + ".arrow")
+    with open(stem + ".pkl", "wb") as f:
+        pickle.dump(panel, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return os.path.getsize(stem + ".arrow")
+
+
+def _measure(mode, n, stem):
+    """Mémoire (kB) de ``n`` processus ``mode`` vivants en même temps : totaux RSS, PSS et USS."""
+    procs = [subprocess.Popen([sys.executable, "-m", "benchmarks.bench_sessions", "--worker", mode, stem],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True) for _ in range(n)]
+    try:
+        for p in procs:
+            if p.stdout.readline().strip() != "ready":
+                raise RuntimeError(f"Processus {mode} interrompu (code {p.wait()})")
+        totals = {"rss_kb": 0, "pss_kb": 0, "uss_kb": 0}
+        for p in procs:
+            for name, value in memory_kb(p.pid).items():
+                totals[name] += value
+        return totals
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--scale", type=int, default=100, help="taille du panel (multiple du panel réel)")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "FICHIER"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(*args.worker)
+        return
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("Mesure impossible : /proc/<pid>/smaps_rollup n'est disponible que sous Linux.")
+
+    import pandas as pd
+
+    from whr import registry
+
+    panel = pd.concat([registry.get("df_processed")] * args.scale, ignore_index=True)
+    with tempfile.TemporaryDirectory() as data_dir:
+        full, empty = os.path.join(data_dir, "panel"), os.path.join(data_dir, "empty")
+        size = _write(panel, full) / 1e6
+        _write(panel.iloc[:0], empty)
+        print(f"panel x{args.scale} : {len(panel)} lignes, snapshot de {size:.1f} Mo\n")
+
+        print(f"{'mode':<8}{'processus':>10}{'RSS (Mo)':>12}{'PSS (Mo)':>12}{'USS (Mo)':>12}")
+        for n in args.workers:
+            for mode in ("copy", "shared"):
+                base = _measure(mode, n, empty)
+                r = _measure(mode, n, full)
+                print(f"{mode:<8}{n:>10}" + "".join(f"{(r[k] - base[k]) / 1024:>12.1f}"
+                                                      for k in ("rss_kb", "pss_kb", "uss_kb")))
+    print("\nMémoire due aux lignes du panel, totale sur tous les processus "
+          "(processus qui chargent un panel vide déduits).")
+
+
+if __name__ == "__main__":
+    main()
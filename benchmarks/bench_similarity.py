@@ -0,0 +1,96 @@
+"""Recherche des pays similaires : arbre k-d contre distances à tous les pays.
+
+Le panel est agrandi en mémoire comme dans ``benchmarks.bench_filters``
+(chaque pays dupliqué en unités ``ISO_k``, valeurs légèrement bruitées pour
+éviter les points confondus) jusqu'à 100 fois sa taille. Sur l'année la plus
+fournie, pour un échantillon de pays, on mesure par requête :
+
+- ``knn``    : les 10 plus proches voisins ;
+- ``rayon``  : les pays à moins d'un écart-type ;
+- ``paires`` : toutes les paires d'une région à moins d'un demi écart-type.
+
+``brute`` calcule les distances à tous les pays de l'année (matrice complète
+des distances pour les paires), ``arbre`` interroge ``whr.similarity``. Les
+résultats des deux méthodes sont vérifiés identiques.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_similarity [--scales 1 10 100]
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.bench_filters import best_of, scaled_panel
+from whr import registry
+from whr.similarity import FEATURES, SimilarityIndex
+
+K = 10
+RADIUS = 1.0
+PAIR_RADIUS = 0.5
+REGION = "Western Europe"
+SAMPLE = 20
+
+
+def noisy(panel, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(1.0, 0.01, (len(panel), len(FEATURES)))
+    return panel.assign(**{f: panel[f] * noise[:, j] for j, f in enumerate(FEATURES)})
+
+
+def brute_knn(points, i, k):
+    d = np.sqrt(((points - points[i]) ** 2).sum(axis=1))
+    nearest = np.argpartition(d, min(k, len(d) - 1))[:k + 1]
+    return np.sort(d[nearest])
+
+
+def brute_radius(points, i, radius):
+    d = np.sqrt(((points - points[i]) ** 2).sum(axis=1))
+    return np.flatnonzero(d <= radius)
+
+
+def brute_pairs(points, members, radius):
+    sub = points[members]
+    d = np.sqrt(((sub[:, None, :] - sub[None, :, :]) ** 2).sum(axis=2))
+    left, right = np.nonzero(np.triu(d <= radius, k=1))
+    return len(left)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args(argv)
+
+    base = registry.get("df_processed")
+    print(f"{'échelle':<9}{'pays/an':>9}  {'requête':<8}{'brute (ms)':>12}{'arbre (ms)':>12}")
+    for scale in args.scales:
+        panel = noisy(scaled_panel(base, scale)) if scale > 1 else base
+        build_ms, index = best_of(lambda: SimilarityIndex(panel), repeat=1)
+        year = max(index.years, key=lambda y: len(index.years[y]['points']))
+        entry = index.years[year]
+        points, tree = entry['points'], entry['tree']
+        sample = np.random.default_rng(0).choice(len(points), min(SAMPLE, len(points)), replace=False)
+        members = np.flatnonzero(entry['region'] == REGION)
+
+        def per_query(fn):
+            return best_of(lambda: [fn(i) for i in sample])[0] / len(sample)
+
+        for i in sample:
+            assert np.allclose(tree.query(points[i], K + 1)[0], brute_knn(points, i, K))
+            assert set(tree.query_radius(points[i], RADIUS)[1]) == set(brute_radius(points, i, RADIUS))
+        pairs = index.region_pairs(year, REGION, PAIR_RADIUS)
+        assert len(pairs) == brute_pairs(points, members, PAIR_RADIUS)
+
+        rows = [
+            ("knn", per_query(lambda i: brute_knn(points, i, K)), per_query(lambda i: tree.query(points[i], K + 1))),
+            ("rayon", per_query(lambda i: brute_radius(points, i, RADIUS)),
+             per_query(lambda i: tree.query_radius(points[i], RADIUS))),
+            ("paires", best_of(lambda: brute_pairs(points, members, PAIR_RADIUS), repeat=3)[0],
+             best_of(lambda: index.region_pairs(year, REGION, PAIR_RADIUS), repeat=3)[0]),
+        ]
+        for name, brute_ms, tree_ms in rows:
+            print(f"x{scale:<8}{len(points):>9}  {name:<8}{brute_ms:>12.4f}{tree_ms:>12.4f}")
+        print(f"{'':<9}{'':>9}  construction des arbres ({len(index.years)} années) : {build_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
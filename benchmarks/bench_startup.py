@@ -0,0 +1,110 @@
+"""Démarrage de l'application : temps jusqu'au premier affichage et imports par page.
+
+Chaque mesure tourne dans un processus neuf lancé avec ``python -X importtime``
+qui exécute le script Streamlit avec ``streamlit.testing.v1.AppTest`` (sans
+serveur ni navigateur) :
+
+- ``premier affichage`` : première exécution du script, page d'accueil
+  (imports de l'application compris, hors imports du banc d'essai) ;
+- ``changement de page`` : exécution suivante, la page mesurée choisie dans
+  la barre latérale (imports et chargements propres à la page).
+
+Les lignes de ``-X importtime`` sont attribuées à l'une ou l'autre phase ;
+on affiche le temps cumulé des modules de premier niveau les plus coûteux et
+les bibliothèques lourdes (pandas, matplotlib...) chargées par chaque phase.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_startup [--pages "Accueil" "Classements"] [--top 8]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "Streamlit_Projet_Analyse_Bien-etre_VF.py")
+HEAVY = ("pandas", "numpy", "pyarrow", "matplotlib", "seaborn", "scipy", "plotly")
+PHASES = ("premier affichage", "changement de page")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _run(title):
+    from streamlit.testing.v1 import AppTest
+
+    def run(app, phase):
+        print(f"--- {phase}", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        app.run()
+        seconds = time.perf_counter() - start
+        errors = [e.message for e in app.exception]
+        return {"seconds": round(seconds, 4), "errors": errors,
+                "heavy": [m for m in HEAVY if m in sys.modules]}
+
+    app = AppTest.from_file(SCRIPT, default_timeout=600)
+    result = {PHASES[0]: run(app, PHASES[0])}
+    if title != "Accueil":
+        app.sidebar.radio[0].set_value(title)
+        result[PHASES[1]] = run(app, PHASES[1])
+    return result
+
+
+def parse_importtime(stderr):
+    """Temps cumulé (µs) des imports de premier niveau de chaque phase, d'après ``-X importtime``."""
+    phases, current = {}, None
+    for line in stderr.splitlines():
+        if line.startswith("--- "):
+            current = phases.setdefault(line[4:], {})
+            continue
+        match = _IMPORT_LINE.match(line)
+        # Les imports imbriqués sont comptés dans le temps cumulé de leur parent de premier niveau
+        if current is not None and match and len(match.group(3)) == 1:
+            current[match.group(4)] = int(match.group(2))
+    return phases
+
+
+def measure(title):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+               PYTHONWARNINGS="ignore")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "benchmarks.bench_startup", "--child", title],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "échec"}, {}
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", help="titres des pages (défaut : toutes)")
+    parser.add_argument("--top", type=int, default=8, help="nombre d'imports affichés par phase")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run(args.child)))
+        return 0
+
+    from vues import PAGE_MODULES
+
+    for title in args.pages or list(PAGE_MODULES):
+        result, imports = measure(title)
+        print(f"== {title}")
+        if "error" in result:
+            print(f"   erreur : {result['error']}")
+            continue
+        for phase, run in result.items():
+            modules = imports.get(phase, {})
+            print(f"   {phase:<20}{run['seconds'] * 1000:>9.0f} ms   imports {sum(modules.values()) / 1000:>7.0f} ms"
+                  f"   chargés : {', '.join(run['heavy']) or '-'}")
+            for name, us in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+                print(f"      {us / 1000:>8.1f} ms  {name}")
+            for error in run["errors"]:
+                print(f"      erreur de la page : {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Suite de benchmarks de bout en bout sur des données synthétiques.
+
+Pour chaque facteur d'échelle, les fichiers sources sont générés par
+:mod:`benchmarks.synthetic` (dans ``.cache/bench/x<N>``, réutilisés d'une
+exécution à l'autre) puis chaque phase est mesurée dans un processus neuf
+lancé dans ce répertoire, pour que le pic mémoire soit celui de la phase :
+
+- ``ingest``        : validation et conversion des sources brutes (à froid) ;
+- ``pipeline``      : ``load_and_preprocess_data`` depuis les artefacts ;
+- ``load_cold``     : ``snapshot.load_panel`` sans snapshot (pipeline + écriture) ;
+- ``load_warm``     : ``snapshot.load_panel`` avec snapshot existant ;
+- ``page:<titre>``  : rendu headless de chaque page (premier rendu, puis rendu
+  à caches chauds dans ``warm_s``).
+
+Les résultats (durées, pic de RSS, tailles des sources) sont écrits en JSON.
+``--compare`` confronte le résultat à une exécution précédente et sort en
+erreur si une durée a régressé au-delà de la tolérance.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.bench_suite [--scales 1 10 100] [--compare ancien.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks import synthetic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(".cache", "bench")
+RESULTS_DIR = os.path.join("build", "bench")
+PHASES = ["ingest", "pipeline", "load_cold", "load_warm"]
+
+# Régressions ignorées sous ce seuil absolu (bruit de mesure)
+MIN_REGRESSION_S = 0.05
+
+
+def _peak_rss_mb():
+    """Pic de RSS du processus (VmHWM sous Linux ; ``ru_maxrss`` hérite de celui du parent après fork)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_phase(phase):
+    """Exécute une phase dans le processus courant (répertoire de travail = données synthétiques)."""
+    from whr import ingest, snapshot
+
+    if phase == "ingest":
+        shutil.rmtree(".cache", ignore_errors=True)
+        start = time.perf_counter()
+        ingest.ingest(force=True)
+    elif phase == "pipeline":
+        from whr import pipeline
+        start = time.perf_counter()
+        df_processed, _ = pipeline.load_and_preprocess_data()
+        rows = len(df_processed)
+    elif phase == "load_cold":
+        shutil.rmtree(snapshot.CACHE_DIR, ignore_errors=True)
+        start = time.perf_counter()
+        snapshot.load_panel()
+    elif phase == "load_warm":
+        start = time.perf_counter()
+        snapshot.load_panel()
+    elif phase.startswith("page:"):
+        import vues
+        from whr import report
+        title = phase[len("page:"):]
+        vues.page_module(title)  # imports hors mesure
+        start = time.perf_counter()
+        report.render_page(title)
+        cold = time.perf_counter() - start
+        warm_start = time.perf_counter()
+        report.render_page(title)
+        return {"wall_s": round(cold, 4), "warm_s": round(time.perf_counter() - warm_start, 4),
+                "peak_rss_mb": _peak_rss_mb()}
+    else:
+        raise ValueError(f"Phase inconnue : {phase!r}")
+    result = {"wall_s": round(time.perf_counter() - start, 4), "peak_rss_mb": _peak_rss_mb()}
+    if phase == "pipeline":
+        result["rows"] = rows
+    return result
+
+
+def spawn_child(phase, data_dir, module="benchmarks.bench_suite"):
+    """Lance ``python -m module --child phase`` dans ``data_dir`` ; retourne le JSON de sa dernière ligne."""
+    env = {k: v for k, v in os.environ.items() if k not in ("WHR_CACHE_DIR", "WHR_ARTIFACTS_DIR")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    env["PYTHONWARNINGS"] = "ignore"
+    proc = subprocess.run([sys.executable, "-m", module, "--child", phase],
+                          cwd=data_dir, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "échec"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def prepare(scale, regenerate=False, seed=0):
+    """Génère (ou réutilise) les sources synthétiques de l'échelle ``scale`` ; retourne le répertoire et les tailles."""
+    data_dir = os.path.abspath(os.path.join(BENCH_DIR, f"x{scale}"))
+    marker = os.path.join(data_dir, "synthetic.json")
+    if not regenerate and os.path.exists(marker):
+        with open(marker, encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("seed") == seed:
+            return data_dir, info["rows"]
+    shutil.rmtree(data_dir, ignore_errors=True)
+    rows = synthetic.generate(scale, data_dir, source_dir=ROOT, seed=seed)
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump({"scale": scale, "seed": seed, "rows": rows}, f)
+    return data_dir, rows
+
+
+def run(scales, repeat=1, regenerate=False, log=print):
+    import vues
+
+    phases = PHASES + [f"page:{title}" for title in vues.PAGES]
+    results = {}
+    for scale in scales:
+        log(f"x{scale} : préparation des données...")
+        data_dir, rows = prepare(scale, regenerate)
+        measures = {}
+        for phase in phases:
+            runs = [spawn_child(phase, data_dir) for _ in range(repeat)]
+            ok = [r for r in runs if "error" not in r]
+            best = min(ok, key=lambda r: r["wall_s"]) if ok else runs[0]
+            measures[phase] = dict(best, runs=[r.get("wall_s") for r in runs])
+            if "error" in best:
+                log(f"  {phase:<45} erreur : {best['error']}")
+            else:
+                warm = f"  (chaud {best['warm_s']:.3f} s)" if "warm_s" in best else ""
+                log(f"  {phase:<45}{best['wall_s']:>9.3f} s{best['peak_rss_mb']:>9.1f} Mo{warm}")
+        results[f"x{scale}"] = {"scale": scale, "rows": rows, "phases": measures}
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous, tolerance, log=print):
+    """Affiche les écarts de durée ; retourne la liste des régressions au-delà de ``tolerance``."""
+    regressions = []
+    for scale, result in current["results"].items():
+        old_phases = previous.get("results", {}).get(scale, {}).get("phases", {})
+        for phase, measure in result["phases"].items():
+            old = old_phases.get(phase, {})
+            if "wall_s" not in measure or "wall_s" not in old:
+                continue
+            delta = measure["wall_s"] - old["wall_s"]
+            ratio = measure["wall_s"] / old["wall_s"] if old["wall_s"] else float("inf")
+            flag = ""
+            if ratio > 1 + tolerance and delta > MIN_REGRESSION_S:
+                regressions.append((scale, phase, old["wall_s"], measure["wall_s"]))
+                flag = "  <-- régression"
+            log(f"  {scale:<6}{phase:<45}{old['wall_s']:>9.3f} ->{measure['wall_s']:>9.3f} s ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de bout en bout sur des données synthétiques.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=1, help="mesures par phase (la meilleure est retenue)")
+    parser.add_argument("--output", help=f"fichier JSON de résultats (défaut : {RESULTS_DIR}/suite-<date>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="résultats précédents à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="régression tolérée (défaut : 0.2 = +20 %%)")
+    parser.add_argument("--regenerate", action="store_true", help="régénère les données synthétiques")
+    parser.add_argument("--child", metavar="PHASE", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run_phase(args.child)))
+        return 0
+
+    started = datetime.now(timezone.utc)
+    results = run(args.scales, repeat=args.repeat, regenerate=args.regenerate)
+    report = {"meta": {"date": started.isoformat(timespec="seconds"), "commit": _git_commit(),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "cpus": os.cpu_count(), "repeat": args.repeat},
+              "results": results}
+
+    output = args.output or os.path.join(RESULTS_DIR, f"suite-{started.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"Comparaison avec {args.compare} :")
+        regressions = compare(report, previous, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de +{args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Mise à jour incrémentale du snapshot : identité avec une reconstruction complète et durée.
+
+Sur une copie des sources (réelles, ou synthétiques avec ``--scale``), un
+snapshot complet est construit puis les sources sont modifiées étape par
+étape, chaque étape partant du snapshot de la précédente :
+
+- ``gdp``     : révision du PIB (Banque mondiale) de quelques pays ;
+- ``whr``     : une valeur corrigée et une nouvelle année pour un pays ;
+- ``release`` : nouveau rapport annuel déclaré dans ``releases.json``.
+
+Après chaque étape, ``snapshot.load_snapshot`` met à jour le snapshot
+(``whr.delta``) puis une reconstruction complète est faite dans une autre
+copie des mêmes fichiers. Les deux snapshots doivent être identiques : mêmes
+DataFrames (``check_exact``) et mêmes fichiers Arrow, octet pour octet ;
+``tests/test_delta.py`` le vérifie sur les sources du dépôt.
+
+Chaque mesure tourne dans un processus neuf, artefacts d'ingestion à jour.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.check_delta [--scale 10]
+"""
+import argparse
+import filecmp
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_suite import ROOT, prepare, spawn_child
+
+GDP_COUNTRIES = ["FRA", "IND", "BRA"]
+CACHE = os.path.join(".cache", "whr")
+
+
+def _run(phase):
+    from whr import ingest, snapshot, tracing
+
+    if phase == "ingest":
+        ingest.ingest()
+        return {}
+    tracing.enable()
+    start = time.perf_counter()
+    state = snapshot.load_snapshot()
+    seconds = time.perf_counter() - start
+    # Nombre de pays recalculés : entrée de l'étape "delta_rebuild" (absente d'une reconstruction complète)
+    countries = [r["rows_in"] for r in tracing.records() if r["name"] == "delta_rebuild"]
+    return {"seconds": round(seconds, 4), "rows": len(state["processed"]),
+            "countries": countries[0] if countries else "tous"}
+
+
+def _source_files(data_dir):
+    from whr.sources import SOURCE_FILES
+    return [os.path.join(data_dir, path) for path in SOURCE_FILES]
+
+
+def edit_gdp(data_dir):
+    path = os.path.join(data_dir, "Logged_GDP_per_Capita_2005-2023.xlsx")
+    gdp = pd.read_excel(path)
+    rows = gdp['Country Code'].isin(GDP_COUNTRIES)
+    gdp.loc[rows, 'LN'] = gdp.loc[rows, 'LN'] + 0.01
+    gdp.to_excel(path, index=False)
+
+
+def edit_whr(data_dir):
+    path = os.path.join(data_dir, "world-happiness-report.csv")
+    whr = pd.read_csv(path)
+    whr.loc[whr['Country name'] == "Denmark", 'Generosity'] += 0.001
+    last = whr.loc[whr['Country name'] == "Chile"].sort_values('year').iloc[[-1]]
+    whr = pd.concat([whr, last.assign(year=last['year'] + 1)], ignore_index=True)
+    whr.to_csv(path, index=False)
+
+
+def edit_release(data_dir):
+    """Nouveau rapport (copie perturbée du rapport 2021) pour l'année qui suit toutes les autres."""
+    whr = pd.read_csv(os.path.join(data_dir, "world-happiness-report.csv"), usecols=['year'])
+    release = max(int(whr['year'].max()), 2021) + 1
+    report = pd.read_csv(os.path.join(data_dir, "world-happiness-report-2021.csv"))
+    report['Ladder score'] = report['Ladder score'] - 0.05
+    report.to_csv(os.path.join(data_dir, f"WHR{release}.csv"), index=False)
+    with open(os.path.join(data_dir, "releases.json"), "w", encoding="utf-8") as f:
+        json.dump([{"name": f"whr_{release}", "path": f"WHR{release}.csv", "release": release}], f)
+
+
+STEPS = {"gdp": edit_gdp, "whr": edit_whr, "release": edit_release}
+
+
+def _snapshot_dir(data_dir):
+    with open(os.path.join(data_dir, CACHE, "LATEST"), encoding="utf-8") as f:
+        return os.path.join(data_dir, CACHE, f.read().strip())
+
+
+def compare_snapshots(left, right):
+    """Différences entre deux snapshots (liste vide s'ils sont identiques)."""
+    from whr import snapshot
+
+    problems = []
+    for name, file in snapshot.SNAPSHOT_FILES.items():
+        a = snapshot._map_frame(os.path.join(left, file))
+        b = snapshot._map_frame(os.path.join(right, file))
+        try:
+            pd.testing.assert_frame_equal(a, b, check_exact=True)
+        except AssertionError as exc:
+            problems.append(f"{name} : {str(exc).splitlines()[0]}")
+        if not filecmp.cmp(os.path.join(left, file), os.path.join(right, file), shallow=False):
+            problems.append(f"{file} : fichiers Arrow différents")
+    return problems
+
+
+def initial_snapshot(source_dir, incremental):
+    """Copie les sources de ``source_dir`` dans ``incremental`` et y construit le snapshot complet."""
+    os.makedirs(incremental)
+    for path in _source_files(source_dir):
+        shutil.copy2(path, incremental)
+        if path.endswith(".xlsx"):
+            # Valeurs en cache des formules Excel : une première réécriture par pandas les arrondit,
+            # les suivantes sont exactes (seules les cellules modifiées changent ensuite)
+            target = os.path.join(incremental, os.path.basename(path))
+            pd.read_excel(target).to_excel(target, index=False)
+    return spawn_child("load", incremental, module="benchmarks.check_delta")
+
+
+def run_steps(incremental, full):
+    """Applique chaque étape de ``STEPS`` ; produit ``(étape, delta, complet, différences)``."""
+    for step, edit in STEPS.items():
+        edit(incremental)
+        spawn_child("ingest", incremental, module="benchmarks.check_delta")
+        delta = spawn_child("load", incremental, module="benchmarks.check_delta")
+
+        # Reconstruction complète des mêmes fichiers (artefacts repris, sans snapshot)
+        shutil.rmtree(full, ignore_errors=True)
+        shutil.copytree(incremental, full, ignore=shutil.ignore_patterns("whr"))
+        rebuilt = spawn_child("load", full, module="benchmarks.check_delta")
+        if "error" in delta or "error" in rebuilt:
+            yield step, delta, rebuilt, [f"erreur : {delta.get('error') or rebuilt.get('error')}"]
+        else:
+            yield step, delta, rebuilt, compare_snapshots(_snapshot_dir(incremental), _snapshot_dir(full))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, help="données synthétiques agrandies (défaut : sources du dépôt)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run(args.child)))
+        return
+
+    source_dir = prepare(args.scale)[0] if args.scale else ROOT
+    work = tempfile.mkdtemp(prefix="whr-delta-")
+    incremental, full = os.path.join(work, "incremental"), os.path.join(work, "full")
+    try:
+        first = initial_snapshot(source_dir, incremental)
+        if "error" in first:
+            print(f"construction initiale : {first['error']}")
+            return
+        print(f"snapshot initial : {first['rows']} lignes, {first['seconds']:.3f} s")
+        print(f"{'étape':<9}{'pays recalculés':>16}{'delta (s)':>11}{'complet (s)':>13}  résultat")
+        for step, delta, rebuilt, problems in run_steps(incremental, full):
+            if "error" in delta or "error" in rebuilt:
+                print(f"{step:<9} {problems[0]}")
+                continue
+            print(f"{step:<9}{delta['countries']:>16}{delta['seconds']:>11.3f}{rebuilt['seconds']:>13.3f}  "
+                  f"{'identique' if not problems else 'DIFFÉRENT'}")
+            for problem in problems:
+                print(f"{'':<9}  {problem}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
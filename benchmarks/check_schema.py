@@ -0,0 +1,160 @@
+"""Schéma compact du panel : mémoire gagnée et résultats inchangés.
+
+Le panel est construit deux fois depuis les mêmes sources : avec le schéma
+de ``whr.schema`` (``int16``, catégories, ``float32``), et dans l'ancien
+format (``id`` stocké, année et libellés en texte, indicateurs en
+``float64``). Pour chacun, agrandi en mémoire comme dans
+``benchmarks.bench_filters``, on mesure :
+
+- la mémoire d'une copie (``memory_usage(deep=True)``) ;
+- la taille sérialisée : pickle (cache de résultats) et Arrow IPC (snapshot).
+
+Puis les résultats des pages sont recalculés sur les deux panels et comparés
+(tolérance relative ``--rtol``) : table annuelle, corrélations, filtres,
+classements, régressions, pays similaires, valeurs manquantes.
+``tests/test_schema.py`` vérifie que tous restent dans la tolérance par
+défaut (``RTOL``).
+
+Certaines valeurs des sources sont des ``float32`` élargis (``4.310999870300293``
+à côté de ``4.311``) : ``float32`` les confond de nouveau. Les rangs denses
+et les corrélations de Spearman, sensibles aux ex aequo, sont donc comparés
+avec la même tolérance et non à l'identique.
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.check_schema [--scales 1 10 100] [--rtol 1e-3]
+"""
+import argparse
+import os
+import pickle
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_filters import CASES, scaled_panel
+from whr import aggregates, correlations, filters, pipeline, regression, schema, snapshot
+from whr.missingness import MissingProfile
+from whr.rankings import RankTables
+from whr.similarity import SimilarityIndex
+
+
+# Écart relatif toléré entre les résultats des deux panels
+RTOL = 1e-3
+
+
+def wide(panel):
+    """Panel dans l'ancien format : ``id``, année et libellés en texte, indicateurs en ``float64``."""
+    year = panel['year'].astype('str')
+    iso = panel['ISO-alpha3 Code'].astype('str')
+    return pd.concat([pd.DataFrame({
+        'id': year + "-" + iso,
+        'year': year,
+        'Country name': panel['Country name'].astype('str'),
+        'ISO-alpha3 Code': iso,
+        'Regional indicator': panel['Regional indicator'].astype('str'),
+    }, index=panel.index), panel[schema.INDICATORS].astype('float64')], axis=1)
+
+
+def sizes(panel):
+    """Mémoire d'une copie, taille pickle et taille Arrow IPC (octets)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "panel.arrow")
+        snapshot._write_frame(panel, path)
+        arrow = os.path.getsize(path)
+    return panel.memory_usage(deep=True).sum(), len(pickle.dumps(panel, protocol=pickle.HIGHEST_PROTOCOL)), arrow
+
+
+def _gap(a, b):
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if a.shape != b.shape or not np.array_equal(np.isnan(a), np.isnan(b)):
+        return np.inf
+    both = ~np.isnan(a)
+    return float(np.max(np.abs(a[both] - b[both]) / np.maximum(np.abs(b[both]), 1e-12), initial=0.0))
+
+
+def _correlation(panel, method):
+    return correlations.pairwise_corr(panel[schema.INDICATORS].to_numpy(dtype=np.float64), method)[0]
+
+
+def compare(compact, reference):
+    """Écart relatif maximal de chaque résultat entre le panel compact et le panel de référence."""
+    gaps = {}
+    summary = aggregates.yearly_summary(compact)
+    expected = aggregates.yearly_summary(reference)
+    gaps["table annuelle"] = (_gap(summary, expected)
+                              if list(summary.index) == [int(y) for y in expected.index] else np.inf)
+    for method in ("pearson", "spearman"):
+        gaps[f"corrélations {method}"] = _gap(_correlation(compact, method), _correlation(reference, method))
+
+    index, expected_index = filters.PanelIndex(compact), filters.PanelIndex(reference)
+    gaps["filtres"] = max(0.0 if np.array_equal(index.positions(*case), expected_index.positions(*case)) else np.inf
+                          for case in CASES.values())
+
+    # Valeurs dans l'ordre du classement (les rangs denses peuvent différer là où float32 confond deux valeurs)
+    ranks, expected_ranks = RankTables(compact), RankTables(reference)
+    same_counts = np.array_equal(ranks.counts, expected_ranks.counts)
+    gaps["classements"] = _gap(np.take_along_axis(ranks.values[None], ranks.order, axis=-1),
+                               np.take_along_axis(expected_ranks.values[None], expected_ranks.order, axis=-1)
+                               ) if same_counts else np.inf
+
+    for by in regression.GROUPINGS:
+        table, expected_table = regression.fit(compact, by), regression.fit(reference, by)
+        same_groups = table.index.get_level_values(0).astype('str').equals(
+            expected_table.index.get_level_values(0).astype('str'))
+        gaps[f"régression {by or 'panel'}"] = _gap(table, expected_table) if same_groups else np.inf
+
+    index, expected_index = SimilarityIndex(compact), SimilarityIndex(reference)
+    year = max(index.years)
+    gap = 0.0
+    for country in expected_index.years[year]['position']:
+        found, expected = index.neighbours(country, year), expected_index.neighbours(country, year)
+        if list(found['ISO-alpha3 Code']) != list(expected['ISO-alpha3 Code']):
+            gap = np.inf
+            break
+        gap = max(gap, _gap(found['Distance'], expected['Distance']))
+    gaps["pays similaires"] = gap
+
+    profile, expected_profile = MissingProfile(compact), MissingProfile(reference)
+    same = profile.by_column.equals(expected_profile.by_column.drop('id'))
+    for name in ('by_year', 'by_country', 'by_region'):
+        counts, expected_counts = getattr(profile, name), getattr(expected_profile, name).drop(columns='id')
+        same &= (np.array_equal(counts.to_numpy(), expected_counts.to_numpy())
+                 and list(counts.index.astype('str')) == list(expected_counts.index.astype('str')))
+    gaps["valeurs manquantes"] = 0.0 if same and np.array_equal(profile.bitmap, expected_profile.bitmap) else np.inf
+    return gaps
+
+
+def panels():
+    """Panel construit avec le schéma compact et le même panel dans l'ancien format : ``(compact, reference)``."""
+    compact = pipeline.load_and_preprocess_data()[0]
+    # Même traitement, types de l'ancien format en sortie (valeurs float64 d'origine)
+    with mock.patch.object(schema, "enforce", wide):
+        reference = pipeline.load_and_preprocess_data()[0]
+    return compact, reference
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rtol", type=float, default=RTOL)
+    args = parser.parse_args(argv)
+
+    compact, reference = panels()
+
+    print(f"{'échelle':<9}{'lignes':>9}  {'':<10}{'mémoire (Mo)':>14}{'pickle (Mo)':>13}{'Arrow (Mo)':>12}")
+    for scale in args.scales:
+        small = scaled_panel(compact, scale)
+        large = wide(small) if scale > 1 else reference
+        before, after = sizes(large), sizes(small)
+        for label, values in (("avant", before), ("après", after)):
+            print(f"x{scale:<8}{len(small):>9}  {label:<10}" + "".join(f"{v / 1e6:>{w}.2f}" for v, w in zip(values, (14, 13, 12))))
+        print(f"{'':<9}{'':>9}  {'rapport':<10}" + "".join(f"{b / a:>{w - 1}.1f}x" for b, a, w in zip(before, after, (14, 13, 12))))
+
+    print(f"\n{'résultat':<26}{'écart relatif max':>18}  contrôle")
+    for name, gap in compare(compact, reference).items():
+        print(f"{name:<26}{gap:>18.2e}  {'conforme' if gap <= args.rtol else 'DIFFÉRENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Générateur de jeux de données synthétiques au format du WHR.
+
+Produit, dans un répertoire, les six fichiers sources avec les mêmes noms,
+colonnes et formats que les originaux, agrandis d'un facteur ``scale`` :
+
+- chaque pays est décliné en ``units`` unités infranationales
+  (``"France (3)"``, code ``"FRA_3"``) ;
+- l'historique est prolongé vers le passé par ``periods`` blocs décalés de
+  ``YEAR_SHIFT`` ans (les fichiers 2020 et 2021 restent des millésimes fixes).
+
+Les valeurs sont celles des fichiers réels, légèrement bruitées. Le
+répertoire produit s'utilise comme répertoire de travail de l'application
+ou des benchmarks (les chemins des sources sont relatifs).
+
+Usage (depuis la racine du dépôt) :
+    python -m benchmarks.synthetic --scale 10 --out .cache/bench/x10
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from whr.sources import (FILE_PATH_GDP, FILE_PATH_LIFE, FILE_PATH_MERGE_ID, FILE_PATH_WHR, FILE_PATH_WHR_2020,
+                         FILE_PATH_WHR_2021)
+
+# Décalage entre blocs d'années : supérieur à la plus longue période d'une source (OMS : 2000-2021)
+YEAR_SHIFT = 25
+
+# Facteur d'échelle -> (unités par pays, blocs d'années)
+LAYOUTS = {1: (1, 1), 10: (5, 2), 100: (25, 4)}
+
+
+def layout(scale):
+    if scale in LAYOUTS:
+        return LAYOUTS[scale]
+    periods = 1 if scale < 4 else 2 if scale < 30 else 4
+    return max(1, round(scale / periods)), periods
+
+
+def _unit_name(names, k):
+    return names if k == 0 else names + f" ({k})"
+
+
+def _unit_code(codes, k):
+    return codes if k == 0 else codes + f"_{k}"
+
+
+def _expand(frame, units, periods, name_cols=(), code_cols=(), year_col=None, value_cols=(), rng=None):
+    """Réplique ``frame`` pour chaque unité et chaque bloc d'années, avec un bruit léger sur les valeurs."""
+    parts = []
+    for period in range(periods if year_col else 1):
+        for k in range(units):
+            part = frame.copy()
+            for col in name_cols:
+                part[col] = _unit_name(part[col].astype(str), k).where(frame[col].notna())
+            for col in code_cols:
+                part[col] = _unit_code(part[col].astype(str), k).where(frame[col].notna())
+            if year_col:
+                part[year_col] = part[year_col] - YEAR_SHIFT * period
+            if (k or period) and rng is not None:
+                for col in value_cols:
+                    noise = rng.normal(1.0, 0.01, len(part))
+                    part[col] = pd.to_numeric(part[col], errors="coerce") * noise
+            parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def generate(scale, out_dir, source_dir=".", seed=0):
+    """Ecrit les six fichiers sources à l'échelle ``scale`` dans ``out_dir`` ; retourne leurs tailles en lignes."""
+    units, periods = layout(scale)
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    def src(path):
+        return os.path.join(source_dir, path)
+
+    def dst(path):
+        return os.path.join(out_dir, path)
+
+    rows = {}
+
+    whr = pd.read_csv(src(FILE_PATH_WHR), sep=',')
+    whr_values = [c for c in whr.columns if c not in ('Country name', 'year')]
+    whr = _expand(whr, units, periods, name_cols=['Country name'], year_col='year', value_cols=whr_values, rng=rng)
+    whr.to_csv(dst(FILE_PATH_WHR), sep=',', index=False)
+    rows['whr'] = len(whr)
+
+    id_base = pd.read_csv(src(FILE_PATH_MERGE_ID), sep=';')
+    id_base = _expand(id_base, units, periods, name_cols=['Country name'], code_cols=['ISO-alpha3 Code'],
+                      year_col='year')
+    id_base['id'] = id_base['year'].astype(str) + "-" + id_base['Country name']
+    id_base.to_csv(dst(FILE_PATH_MERGE_ID), sep=';', index=False)
+    rows['id_base'] = len(id_base)
+
+    for path, reader, writer in ((FILE_PATH_WHR_2020, pd.read_excel, "excel"),
+                                 (FILE_PATH_WHR_2021, pd.read_csv, "csv")):
+        frame = reader(src(path))
+        values = [c for c in frame.columns if c not in ('Country name', 'Regional indicator')]
+        frame = _expand(frame, units, 1, name_cols=['Country name'], value_cols=values, rng=rng)
+        if writer == "excel":
+            frame.to_excel(dst(path), index=False)
+        else:
+            frame.to_csv(dst(path), sep=',', index=False)
+        rows[os.path.splitext(path)[0]] = len(frame)
+
+    gdp = pd.read_excel(src(FILE_PATH_GDP))
+    gdp = _expand(gdp, units, periods, name_cols=['Country Name'], code_cols=['Country Code'], year_col='Time',
+                  value_cols=['LN'], rng=rng)
+    gdp['Time Code'] = "YR" + gdp['Time'].astype(str)
+    gdp.to_excel(dst(FILE_PATH_GDP), index=False)
+    rows['gdp'] = len(gdp)
+
+    life = pd.read_csv(src(FILE_PATH_LIFE), sep=';')
+    life = _expand(life, units, periods, name_cols=['Location'], code_cols=['SpatialDimValueCode'],
+                   year_col='Period', value_cols=['FactValueNumeric'], rng=rng)
+    life.to_csv(dst(FILE_PATH_LIFE), sep=';', index=False)
+    rows['life'] = len(life)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère des fichiers sources synthétiques au format du WHR.")
+    parser.add_argument("--scale", type=int, default=10, help="facteur d'échelle (1, 10, 100...)")
+    parser.add_argument("--out", required=True, help="répertoire de sortie")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows = generate(args.scale, args.out, seed=args.seed)
+    units, periods = layout(args.scale)
+    print(f"x{args.scale} ({units} unités/pays, {periods} bloc(s) d'années) -> {args.out}")
+    for name, n in rows.items():
+        print(f"  {name:<35}{n:>10} lignes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Mise à jour incrémentale du snapshot : même résultat qu'une reconstruction complète."""
+from benchmarks.bench_suite import ROOT
+from benchmarks.check_delta import initial_snapshot, run_steps
+
+
+def test_incremental_update_matches_full_rebuild(tmp_path):
+    incremental, full = str(tmp_path / "incremental"), str(tmp_path / "full")
+    first = initial_snapshot(ROOT, incremental)
+    assert "error" not in first, first["error"]
+
+    differences = {step: problems for step, _, _, problems in run_steps(incremental, full)}
+    assert differences == {"gdp": [], "whr": [], "release": []}
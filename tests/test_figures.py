@@ -0,0 +1,11 @@
+"""Cache des figures de la page Datavisualisation : mémoire stable après 1 000 affichages."""
+from benchmarks.bench_figures import growth_mb, run
+from whr.figures import FIGURES
+
+
+def test_memory_is_flat_after_1000_views():
+    FIGURES.clear()
+    rows = run("cached", 1000, {10, 100, 1000})
+    assert growth_mb(rows) <= 5.0
+    # Les 14 graphiques ne sont rendus qu'au premier affichage
+    assert len(FIGURES) == 14
@@ -0,0 +1,8 @@
+"""Schéma compact du panel : résultats des pages identiques à ceux de l'ancien format, à la tolérance près."""
+from benchmarks.check_schema import RTOL, compare, panels
+
+
+def test_compact_schema_keeps_page_results():
+    compact, reference = panels()
+    gaps = compare(compact, reference)
+    assert {name: gap for name, gap in gaps.items() if gap > RTOL} == {}
@@ -0,0 +1,48 @@
+"""Pages de l'application d'analyse du World Happiness Report.
+
+Chaque page est une fonction sans argument qui écrit dans ``st``, dans son
+propre module de ce paquet. Elles sont appelées par le script Streamlit
+principal et par le générateur de rapport statique (``python -m
+whr.report``), qui remplace ``st`` par un enregistreur HTML.
+
+Les modules des pages ne sont importés qu'au premier affichage de la page :
+la page d'accueil n'importe ni pandas, ni matplotlib, ni seaborn, et ne
+charge aucun jeu de données. Chaque page ne demande au registre
+(``whr/registry.py``) que les jeux de données dont elle a besoin.
+"""
+import importlib
+
+# Titre affiché dans la barre latérale -> (module de vues, fonction de la page)
+PAGE_MODULES = {
+    "Accueil": ("accueil", "home_page"),
+    "Synthèse jeux de données": ("donnees", "presentation_donnees"),
+    "Datavisualisation": ("dataviz", "dataviz"),
+    "Pré Processing des données": ("preprocessing", "pre_processing"),
+    "Analyse des Tendances": ("tendances", "analyse_des_tendances_page"),
+    "Matrice de corrélation": ("correlations", "correlations"),
+    "Facteurs du bonheur": ("facteurs", "facteurs"),
+    "Classements": ("classements", "classements"),
+    "Pays similaires": ("similaires", "pays_similaires"),
+}
+
+
+def page_module(title):
+    """Module de la page ``title``, importé au premier appel."""
+    return importlib.import_module(f"{__name__}.{PAGE_MODULES[title][0]}")
+
+
+def _lazy_page(title):
+    def render():
+        return getattr(page_module(title), PAGE_MODULES[title][1])()
+    render.__name__ = PAGE_MODULES[title][1]
+    return render
+
+
+# Titre affiché dans la barre latérale -> fonction de la page
+PAGES = {title: _lazy_page(title) for title in PAGE_MODULES}
+
+
+def debug_panel(*args, **kwargs):
+    # Panneau de diagnostic : pandas et le pipeline ne sont importés que si le mode diagnostic est actif
+    from vues.diagnostic import debug_panel as panel
+    return panel(*args, **kwargs)
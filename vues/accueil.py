@@ -0,0 +1,49 @@
+"""Page "Accueil" : texte seul, sans données ni graphique."""
+import streamlit as st
+
+
+def home_page(): 
+
+    st.title("🌍 Projet Analyse du bien-être sur Terre - Data Analyse - Feb25 Continu")
+
+    st.markdown("---")
+
+    st.image('STREAMLIT-Couv.jpg')
+
+
+    st.markdown("---")
+    st.subheader(" 🌟 Présentation du sujet, du problème et des enjeux")
+    st.markdown(" ##### Dans ce projet nous allons effectuer une analyse approfondie des données collectées par le World Happiness Report mené par l’Organisation des Nations Unies.")
+    
+    st.markdown("""
+    
+    Cette enquête a pour objectif d’estimer le bonheur des pays autour de la planète et de comparer la qualité de vie des populations par nation et par zone géographique 
+    en collectant de nombreuses données socio-économiques. Les données sur lesquelles travaille l’ONU intègrent différents aspects comme le PIB par habitant, le soutien social, 
+    l'espérance de vie d’un individu en bonne santé depuis sa naissance, la liberté de faire des propres choix de vie, la générosité et la perception de la corruption, 
+    mettant ainsi en lumière des disparités parfois significatives entre pays. 
+                          
+     """)
+    
+    st.info("######  L’objectif de ce projet est de présenter ces données à l’aide de visualisations interactives et de déterminer les combinaisons de facteurs permettant " \
+    "d’expliquer pourquoi certains pays sont mieux classés que les autres.")
+    
+    st.markdown("### 🎯 Nos Questions Clés")  
+
+    st.markdown("""          
+
+    **- Quels sont les 10 pays les plus heureux ?** 
+                
+    **- Quels sont les 10 pays les moins heureux ?** 
+                
+    **- Les Etats les plus riches sont-ils considérés comme les plus heureux ?** 
+                
+    **- Quels sont les facteurs les plus déterminants du bonheur ?**
+                
+    **- Existe-t-il une fracture du bonheur entre zones géographiques ou entre continents ?** 
+                
+    **- Et surtout : comment ces facteurs interagissent-ils pour favoriser, ou au contraire freiner, le bien-être global d’une population ?**       
+    
+    """)
+
+
+    st.info("###### C’est à travers une analyse structurée du bien-être sur Terre que nous tenterons d'apporter des éléments de réponse à ces questions.")
@@ -0,0 +1,67 @@
+"""Page "Classements" : premiers et derniers pays par indicateur, année et région."""
+import streamlit as st
+
+from vues.commun import filtered, load_dataset, panel_filters
+from whr.rankings import cached_rank_tables
+
+
+def classements():
+    filters = panel_filters()
+    if filtered(filters).empty:
+        st.warning("Aucune observation ne correspond aux filtres sélectionnés.")
+        return
+    # Rangs de tous les indicateurs, années et régions retenus par les filtres, calculés une fois par version
+    # des données et combinaison de filtres (whr/rankings.py) : changer d'année ou de région ne fait que lire
+    # des tranches de tableaux
+    ranks = cached_rank_tables(load_dataset("data_version"), filters)
+
+    st.title("🌍 Classement des pays")
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        indicator = st.selectbox("Indicateur", ranks.indicators)
+    with col2:
+        region = st.selectbox("Région", (None,) + tuple(ranks.regions), format_func=lambda r: r or "Monde")
+    with col3:
+        n = st.slider("Nombre de pays", 5, 20, 10)
+    year = st.select_slider("Année", options=list(ranks.years), value=ranks.years[-1])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader(f"Les {n} valeurs les plus élevées")
+        st.dataframe(ranks.top(indicator, year, n, region), hide_index=True)
+    with col2:
+        st.subheader(f"Les {n} valeurs les plus faibles")
+        st.dataframe(ranks.bottom(indicator, year, n, region), hide_index=True)
+
+    st.markdown("---")
+    st.subheader("Rang d'un pays")
+    options = load_dataset("filter_options")
+    ranked = set(ranks.countries)
+    countries = [c for c in options['countries'] if c in ranked]
+    country = st.selectbox("Pays", countries, format_func=options['country_names'].get)
+    if country is not None:
+        rank, count = ranks.rank(country, indicator, year, region)
+        if rank:
+            st.write(f"**{options['country_names'][country]}** : **{rank}e** sur {count} pays classés en {year}.")
+        else:
+            st.write(f"**{options['country_names'][country]}** n'est pas classé en {year} (donnée manquante ou hors région).")
+
+    st.markdown("---")
+    st.subheader("Plus fortes progressions")
+    if len(ranks.years) < 2:
+        st.write("Sélectionnez au moins deux années dans les filtres pour comparer les rangs.")
+        return
+    first, last = st.select_slider("Entre les années", options=list(ranks.years), value=(ranks.years[0], ranks.years[-1]))
+    gains, losses = ranks.movers(indicator, first, last, n, region)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("##### Places gagnées")
+        st.dataframe(gains, hide_index=True)
+    with col2:
+        st.write("##### Places perdues")
+        st.dataframe(losses, hide_index=True)
+
+    st.info("##### Rang 1 : valeur la plus élevée de l'indicateur. Pour les émotions négatives et la perception de la corruption, "
+            "une valeur élevée est défavorable.")
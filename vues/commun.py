@@ -0,0 +1,58 @@
+"""Accès aux données et filtres communs des pages d'analyse."""
+import streamlit as st
+
+from whr import registry
+from whr.filters import NO_FILTER, filter_key, filtered_panel
+from whr.imputation import METHODS, cached_filled_panel
+from whr.missingness import cached_missing_profile
+
+
+# --- Accès aux données ---
+# Les fichiers ne sont plus lus à chaque ré-exécution du script : chaque jeu de données
+# (brut ou dérivé) est chargé une seule fois par processus serveur dans whr/registry.py,
+# puis partagé par toutes les sessions. Chaque page ne demande que ceux dont elle a besoin.
+def load_dataset(name):
+    if registry.is_loaded(name):
+        return registry.get(name)
+    with st.spinner('Chargement et prétraitement des données...'):
+        return registry.get(name)
+
+
+# --- Filtres communs des pages d'analyse ---
+# Région, pays, période et comblement des valeurs manquantes choisis dans la barre latérale s'appliquent
+# au panel de toutes les pages d'analyse. La sélection est résolue par les index de whr/filters.py ; la vue filtrée et les résultats
+# qui en dérivent sont mis en cache par combinaison de filtres.
+def panel_filters():
+    """Affiche les filtres dans la barre latérale ; retourne la clé de filtre (``whr.filters.filter_key``)."""
+    options = load_dataset("filter_options")
+    st.sidebar.markdown("### Filtres")
+    regions = st.sidebar.multiselect("Régions", options['regions'], key="filter_regions")
+    countries = st.sidebar.multiselect("Pays", options['countries'], format_func=options['country_names'].get,
+                                       key="filter_countries")
+    years = st.sidebar.slider("Années", *options['years'], value=options['years'], key="filter_years")
+    labels = {None: "Aucun (données brutes)", **METHODS}
+    fill = st.sidebar.selectbox("Comblement des valeurs manquantes", list(labels), format_func=labels.get,
+                                key="filter_fill", help="Méthodes décrites sur la page Pré Processing des données")
+    return filter_key(regions, years if tuple(years) != options['years'] else None, countries, fill)
+
+
+def filtered(key):
+    """Panel filtré par ``key`` ; indique le nombre d'observations retenues quand un filtre est actif."""
+    version = load_dataset("data_version")
+    panel = filtered_panel(version, key)
+    if key[:3] != NO_FILTER[:3]:
+        st.caption(f"Filtres actifs : {len(panel)} observations sur {len(load_dataset('df_processed'))}.")
+    if key[3] is not None:
+        filled = cached_filled_panel(version, key[3])
+        st.caption(f"Valeurs manquantes comblées ({METHODS[key[3]].lower()}) : "
+                   f"{int(filled.flags.loc[panel.index].to_numpy().sum())} cellules de la sélection.")
+    return panel
+
+
+def missing_profile(dataset):
+    # Comptes de valeurs manquantes calculés une fois par version des données (whr/missingness.py)
+    version = load_dataset("data_version")
+    if registry.is_loaded(dataset):
+        return cached_missing_profile(version, dataset)
+    with st.spinner('Chargement et prétraitement des données...'):
+        return cached_missing_profile(version, dataset)
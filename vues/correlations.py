@@ -0,0 +1,46 @@
+"""Page "Matrice de corrélation"."""
+import streamlit as st
+
+from vues.commun import filtered, load_dataset, panel_filters
+from whr.correlations import MIN_OVERLAP, cached_correlation
+from whr.figures import FIGURES, draw_corr_heatmap
+
+
+def correlations():
+    filters = panel_filters()
+    if filtered(filters).empty:
+        st.warning("Aucune observation ne correspond aux filtres sélectionnés.")
+        return
+    options = load_dataset("filter_options")
+    years = filters[1] or options['years']
+
+    st.title("🌍 Matrice de corrélation")
+    st.markdown("---")
+
+    st.write("##### La matrice ci-dessous montre la corrélation entre les différents indicateurs du World Happiness Report.")
+
+    method = st.radio("Méthode", ("pearson", "spearman"), format_func=str.capitalize, horizontal=True)
+
+    # Matrice et heatmap servies depuis le cache tant que la combinaison de filtres a déjà été vue
+    version = load_dataset("data_version")
+    cor, counts = cached_correlation(version, method, filters)
+    title = f"Matrice de Corrélation WHR ({years[0]}-{years[1]})"
+    png, _ = FIGURES.render(("corr_heatmap", version, method, filters, st.get_option("theme.base")),
+                            lambda: draw_corr_heatmap(cor, counts, MIN_OVERLAP, title))
+    st.image(png, width="stretch")
+
+    if (counts.to_numpy() < MIN_OVERLAP).any():
+        st.warning(f"\\* Couples calculés sur moins de {MIN_OVERLAP} observations communes : résultat peu fiable.")
+    with st.expander("**Nombre d'observations communes par couple d'indicateurs**"):
+        st.dataframe(counts)
+
+    st.markdown("""#####
+    Les indicateurs comme le PIB par habitant, l’espérance de vie en bonne santé, le support social ont l’air d’être fortement corrélés au score du bonheur. 
+    D’autres indicateurs comme la corruption ou la générosité ont quant à eux, au contraire, une très faible corrélation. 
+    Attention, toutefois il s’agit des indicateurs avec le plus de données manquantes.
+    """)
+
+    st.markdown("---")
+
+ 
+    st.info("#### 🌟 A présent poursuivons notre analyse du bien-être sur terre avec l'outil PowerBI. Nous étofferons notre analyse avec des indicateurs externes.")
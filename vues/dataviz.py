@@ -0,0 +1,151 @@
+"""Page "Datavisualisation" : boîtes à moustaches des deux jeux WHR."""
+import streamlit as st
+
+from vues.commun import load_dataset
+from whr.distributions import box_spec, cached_box_stats
+from whr.figures import FIGURES, draw_boxplot
+
+
+def boxplot(dataset, column, color, ylim=None, client=False):
+    version = load_dataset("data_version")
+    if client:
+        # Résumés précalculés en une passe pour tout le jeu de données (whr/distributions.py), tracés par le navigateur
+        stats, outliers = cached_box_stats(version, dataset)
+        st.vega_lite_chart(box_spec(stats.loc[column], outliers[column], color, ylim), width="stretch")
+        return
+    # Image servie depuis le cache de figures : matplotlib n'est appelé qu'au premier affichage
+    key = ("boxplot", version, dataset, column, color, ylim, st.get_option("theme.base"))
+    png, width = FIGURES.render(key, lambda: draw_boxplot(load_dataset(dataset)[column], color, ylim))
+    st.image(png, width=width)
+
+
+def dataviz():
+    st.title("🌍 Analyse des données du WHR avec figures de DataVizualization")
+    client = st.toggle("Graphiques interactifs (tracés par le navigateur)",
+                       help="Envoie au navigateur les quartiles et valeurs aberrantes au lieu d'images rendues par le serveur")
+
+    st.subheader("1.1 Score du bonheur")
+
+    st.markdown("""
+    Les variables “Ladder score” et “Life Ladder” correspondent à l'indice de bonheur subjectif sur "l'échelle du Bonheur". 
+                
+    Selon l'étude, chaque pays a obtenu un score basé sur une échelle de 0 à 10 (le 0 représente le score le plus bas et le 10 le meilleur).
+    
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Distribution Life Ladder")
+        boxplot("whr_2005_2020", "Life Ladder", color="blue", ylim=(0, 10), client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Distribution Ladder Score")
+        boxplot("whr_2021", "Ladder score", color="blue", ylim=(0, 10), client=client)
+
+    st.subheader("1.2 PIB par habitant")
+
+    st.markdown("""
+    Les variables “Logged GDP per Capita” et “Log GDP per Capita” représentent le PIB par habitant. Ces variables sont “logarithmées” pour atténuer l’impact des valeurs extrêmes.
+    
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Distribution Log GDP per capita")
+        boxplot("whr_2005_2020", "Log GDP per capita", color="#C832BE", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Distribution Logged GDP per capita")
+        boxplot("whr_2021", "Logged GDP per capita", color="#C832BE", client=client)
+
+    st.subheader("1.3 Support Social")
+
+    st.markdown("""
+    La variable Social support mesure la perception des citoyens d’avoir quelqu’un sur qui compter en cas de besoin.
+    
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Distribution Social Support")
+        boxplot("whr_2005_2020", "Social support", color="#FF7873", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Distribution Social Support")
+        boxplot("whr_2021", "Social support", color="#FF7873", client=client)
+
+    st.subheader("1.4 Espérance de vie en bonne santé")
+
+    st.markdown("""
+    Les variables “Healthy life expectancy” et “Healthy life expectancy at birth” représentent l’espérance de vie ajustée sur la santé, 
+    c’est-à-dire le nombre moyen d’années qu’un individu peut espérer vivre en bonne santé dans chaque pays.
+
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Healthy life expectancy at birth")
+        boxplot("whr_2005_2020", "Healthy life expectancy at birth", color="#009692", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Healthy life expectancy")
+        boxplot("whr_2021", "Healthy life expectancy", color="#009692", client=client)
+
+    st.subheader("1.5 Liberté de faire des choix")
+
+    st.markdown("""
+    La variable “Freedom to make life choices” reflète la perception des individus quant à leur liberté de choisir leur mode de vie, leurs décisions personnelles et leur avenir. 
+    
+    Elle est mesurée sur une échelle de 0 à 1, où 1 représente un haut niveau de liberté perçue.
+
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Freedom to make life choices")
+        boxplot("whr_2005_2020", "Freedom to make life choices", color="#FFA100", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Freedom to make life choices")
+        boxplot("whr_2021", "Freedom to make life choices", color="#FFA100", client=client)
+
+    st.subheader("1.6 Générosité")
+
+    st.markdown("""
+    La variable Generosity mesure la tendance des citoyens à faire des dons (en argent ou en temps) à des œuvres caritatives, rapportée à leur revenu. 
+
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Generosity")
+        boxplot("whr_2005_2020", "Generosity", color="#7DB456", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Generosity")
+        boxplot("whr_2021", "Generosity", color="#7DB456", client=client)
+
+    st.subheader("1.7 Perception de la corruption")
+
+    st.markdown("""
+    La variable Perceptions of corruption mesure le niveau de corruption perçue par les citoyens d’un pays dans les institutions publiques (gouvernement, entreprises). 
+    
+    Elle est exprimée sur une échelle de 0 à 1 (0 = corruption perçue comme très forte et 1 = très faible corruption perçue)
+
+    """)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("DATA 2005-2020 : Perceptions of corruption")
+        boxplot("whr_2005_2020", "Perceptions of corruption", color="#C3175C", client=client)
+
+    with col2:
+        st.subheader("DATA 2021 : Perceptions of corruption")
+        boxplot("whr_2021", "Perceptions of corruption", color="#C3175C", client=client)
@@ -0,0 +1,31 @@
+"""Panneau de diagnostic de la barre latérale (traces du pipeline et des pages)."""
+import json
+
+import pandas as pd
+import streamlit as st
+
+from whr import pipeline, tracing
+
+
+def debug_panel(max_rows=50):
+    """Derniers spans tracés (pipeline, jeux de données, figures, pages) et export Chrome trace."""
+    with st.sidebar.expander("Traces", expanded=True):
+        if st.button("Tracer le pipeline", help="Ré-exécute le prétraitement complet pour en mesurer chaque étape"):
+            pipeline.load_and_preprocess_data()
+        if st.button("Effacer les traces"):
+            tracing.clear()
+        spans = tracing.records()
+        if not spans:
+            st.caption("Aucune trace pour l'instant.")
+            return
+        recent = spans[-max_rows:][::-1]
+        st.dataframe(pd.DataFrame({
+            'étape': ["· " * s['depth'] + s['name'] for s in recent],
+            'durée (ms)': [s['wall_s'] * 1000 for s in recent],
+            'CPU (ms)': [s['cpu_s'] * 1000 for s in recent],
+            'lignes entrée': [s['rows_in'] for s in recent],
+            'lignes sortie': [s['rows_out'] for s in recent],
+            'Δ mémoire (Mo)': [s['mem_delta'] / 2**20 if s['mem_delta'] is not None else None for s in recent],
+        }).round(1), hide_index=True)
+        st.download_button("Exporter (Chrome trace)", json.dumps(tracing.chrome_trace(spans)),
+                           file_name="whr-trace.json", mime="application/json")
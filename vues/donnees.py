@@ -0,0 +1,55 @@
+"""Page "Synthèse jeux de données"."""
+import io
+
+import streamlit as st
+
+from vues.commun import load_dataset, missing_profile
+
+
+def presentation_donnees():
+    WHR_2005_2020 = load_dataset("whr_2005_2020")
+    WHR_2021 = load_dataset("whr_2021")
+
+    st.title("🌍 Présentation des jeux de données du WHR")
+
+    st.markdown("""
+                
+    Les fichiers “world-happiness-report-2021.csv” et “world-happiness-report.csv” regroupent les résultats du rapport sur le bonheur mené sous la direction de l’ONU. 
+    
+    Les principales données proviennent d’un sondage réalisé par l’entreprise Gallup. "
+                
+    """)
+    st.subheader(" Voici un aperçu des premières lignes et des informations générales des dataset initiaux :")
+    st.markdown("""
+    
+    **🌟 Chaque ligne des deux jeux de données représente un pays, une année et les scores de bien-être selon plusieurs critères établis.**
+                
+    """)
+
+    st.markdown("---")
+    st.subheader("1.1 WHR 2005-2020")
+    st.write(f"Nombre de lignes dataframe 2005 à 2020 : **{len(WHR_2005_2020)}**")
+    st.write(f"Nombre de colonnes : **{WHR_2005_2020.shape[1]}**")
+    st.write(f"Nombre total de valeurs manquantes : **{missing_profile('whr_2005_2020').total}**")
+    st.dataframe(WHR_2005_2020.head())
+
+    with st.expander("**Afficher les informations détaillées du DataFrame 2005-2020**"):
+        buffer = io.StringIO()
+        WHR_2005_2020.info(buf=buffer)
+        st.text(buffer.getvalue())
+
+    st.dataframe(WHR_2005_2020.describe())
+
+    st.markdown("---")
+    st.subheader("1.2 WHR 2021")
+    st.write(f"Nombre de lignes dataframe 2021 : **{len(WHR_2021)}**")
+    st.write(f"Nombre de colonnes : **{WHR_2021.shape[1]}**")
+    st.write(f"Nombre total de valeurs manquantes : **{missing_profile('whr_2021').total}**")
+    st.dataframe(WHR_2021.head())
+    
+    with st.expander("**Afficher les informations détaillées du DataFrame 2021**"):
+        buffer = io.StringIO()
+        WHR_2021.info(buf=buffer)
+        st.text(buffer.getvalue())
+
+    st.dataframe(WHR_2021.describe())
@@ -0,0 +1,47 @@
+"""Page "Facteurs du bonheur" : régressions du Life Ladder sur les facteurs du WHR."""
+import streamlit as st
+
+from vues.commun import filtered, load_dataset, panel_filters
+from whr.figures import FIGURES, draw_coefficients
+from whr.regression import cached_regression
+
+
+def facteurs():
+    filters = panel_filters()
+    if filtered(filters).empty:
+        st.warning("Aucune observation ne correspond aux filtres sélectionnés.")
+        return
+
+    st.title("🌍 Quels sont les facteurs les plus déterminants du bonheur ?")
+    st.markdown("---")
+    st.write("##### Régression du Life Ladder sur les six facteurs du WHR, variables centrées-réduites : "
+             "chaque coefficient est l'effet d'un écart-type du facteur, en écarts-types du Life Ladder, les autres facteurs étant fixés.")
+
+    groupings = {"Panel complet": None, "Par année": 'year', "Par région": 'Regional indicator'}
+    grouping = st.radio("Modèle", tuple(groupings), horizontal=True)
+    by_year = groupings[grouping] == 'year'
+    # Par année, chaque pays n'a qu'une observation : les effets fixes absorberaient toute la variation
+    fixed_effects = st.checkbox("Effets fixes pays", disabled=by_year,
+                                help="Compare chaque pays à lui-même au fil des années (indisponible par année)")
+    fixed_effects = fixed_effects and not by_year
+    n_boot = 500 if st.checkbox("Intervalles bootstrap (500 tirages)", help="Plus long au premier affichage") else 0
+
+    # Tous les groupes estimés en un seul calcul matriciel, résultat mis en cache par filtre et modèle (whr/regression.py)
+    version = load_dataset("data_version")
+    with st.spinner("Estimation des modèles..."):
+        table = cached_regression(version, filters, groupings[grouping], fixed_effects, n_boot)
+    if table['coef'].isna().all():
+        st.warning("Pas assez d'observations complètes pour estimer le modèle avec ces filtres.")
+        return
+
+    title = f"Coefficients standardisés ({grouping.lower()}{', effets fixes pays' if fixed_effects else ''})"
+    png, _ = FIGURES.render(("coefficients", version, filters, grouping, fixed_effects, n_boot, st.get_option("theme.base")),
+                            lambda: draw_coefficients(table, title))
+    st.image(png, width="stretch")
+
+    st.caption("Intervalles à 95 % : " + ("percentile bootstrap." if n_boot else "approximation normale (coef ± 1,96 erreur type)."))
+    with st.expander("**Coefficients, erreurs types et R² par modèle**"):
+        st.dataframe(table.round(3))
+
+    st.markdown("---")
+    st.info("##### Plus un coefficient est éloigné de 0, plus le facteur pèse sur le score du bonheur à autres facteurs égaux.")
@@ -0,0 +1,141 @@
+"""Page "Pré Processing des données" : valeurs manquantes avant et après traitement."""
+import pandas as pd
+import streamlit as st
+
+from vues.commun import load_dataset, missing_profile
+from whr.figures import FIGURES, draw_coverage_heatmap
+from whr.imputation import METHODS, cached_filled_panel
+from whr.schema import INDICATORS, with_id
+
+
+def missing_summary(profile, label, cells=None):
+    """Total et pourcentage de valeurs manquantes, puis leur nombre par colonne."""
+    cells = cells or profile.cells
+    st.write(f"Nombre total de valeurs manquantes {label} : **{profile.total}**")
+    st.write(f"Pourcentage de valeurs manquantes {label} : **{round(profile.total / cells * 100, 2)}%**")
+    st.dataframe(profile.by_column.reset_index())
+
+
+def gap_filling(missing_processed):
+    # Mode d'analyse optionnel : copie comblée calculée une fois par version et par méthode (whr/imputation.py),
+    # seulement pour la méthode affichée ; la comparaison des quatre méthodes est faite à la demande
+    version = load_dataset("data_version")
+    cells = missing_processed.rows * len(INDICATORS)
+    missing = int(missing_processed.by_column[INDICATORS].sum())
+    st.write(f"Valeurs manquantes des indicateurs : **{missing}** sur {cells} cellules.")
+
+    labels = {None: "Aucune (données brutes)", **METHODS}
+    method = st.selectbox("Méthode de comblement", list(labels), format_func=labels.get, key="fill_method")
+    if method is None:
+        st.dataframe(with_id(load_dataset("df_processed").head(10)))
+    else:
+        filled = cached_filled_panel(version, method)
+        show_filled = st.toggle("Afficher les valeurs comblées", value=True, key="fill_view")
+        # Lignes contenant au moins une valeur comblée, cellules comblées listées à part
+        rows = filled.flags.any(axis=1).to_numpy()
+        preview = with_id(filled.view(show_filled).loc[rows].head(10))
+        preview['Valeurs comblées'] = [", ".join(c for c in INDICATORS if flag[c])
+                                       for _, flag in filled.flags.loc[rows].head(10).iterrows()]
+        st.dataframe(preview)
+        st.caption(f"{filled.total} cellules comblées ({filled.total / cells:.1%} des cellules), "
+                   f"{missing - filled.total} restent manquantes.")
+
+    if st.toggle("Comparer les quatre méthodes", key="fill_compare",
+                 help="Calcule le panel comblé par chaque méthode (plus long au premier affichage)"):
+        st.write("Cellules comblées par chaque méthode :")
+        st.dataframe(pd.DataFrame({label: cached_filled_panel(version, m).counts
+                                   for m, label in METHODS.items()}).T.assign(
+            Total=lambda t: t.sum(axis=1)))
+
+
+def pre_processing():
+    missing_whr = missing_profile("whr_2005_2020")
+    missing_original = missing_profile("df_original")
+    missing_merge = missing_profile("merge_df_ISO")
+    missing_processed = missing_profile("df_processed")
+    years = missing_processed.years
+
+    st.title("🌍 Pré Processing et nettoyage des données")
+    
+    st.markdown(f""" #####
+    La base de données de 2005 à 2020 ne comporte pas énormément de valeurs manquantes ({missing_whr.total} NaN). 
+    
+    Toutefois, en approfondissant l’analyse, en fusionnant le dataframe avec une base continue: Id -> Année & pays de 2005 à 2020. Ajout du code ISO alpha 3: code universel par pays.
+    
+    Le constat n'est plus le même : il manque un grand nombre de données par année et par pays.
+
+    """)
+
+    st.subheader("🎯 Poursuivons notre analyse afin d'enrichir le dataset sur les valeurs manquantes, en voici les différentes étapes :")
+
+    st.markdown("""
+                
+    - Enrichir l'année 2020 avec le rapport du WHR disponible en ligne
+    - Fusion de notre 2ème jeu de données du WHR sur l'année 2021
+    - Enrichir les données de l'indicateur du PIB avec les données de la Banque Mondiale
+    - Enrichir les données de l'indicateur de l'espérance de vie avec les données de l'OMS.
+
+    """)
+
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.subheader("1.1 Données Originales")
+        st.write(f"Nombre de lignes dataframe 2005-2020 : **{missing_original.rows}**")
+        st.write(f"Nombre de colonnes : **{missing_original.n_columns}**")
+        missing_summary(missing_original, "originales", cells=missing_whr.cells)
+    
+    with col2:
+        st.subheader("1.2 Données avec code ID & Pays")
+        st.write(f"Nombre de lignes dataframe 2005-2020 : **{missing_merge.rows}**")
+        st.write(f"Nombre de colonnes : **{missing_merge.n_columns}**")
+        missing_summary(missing_merge, "originales")
+
+    with col3:
+        st.subheader("1.3 Données Prétraitées et Enrichies")
+        st.write(f"Nombre de lignes après traitement : **{missing_processed.rows}**")
+        st.write(f"Nombre de colonnes après traitement : **{missing_processed.n_columns}**")
+        missing_summary(missing_processed, "après traitement")
+
+    st.markdown("---")
+    st.subheader("1.4 Aperçu de notre dataset final")
+
+    st.write("Le dataset a été fusionné avec des données supplémentaires et les valeurs manquantes ont été traitées. En voici les premières lignes :")
+
+    st.dataframe(with_id(load_dataset("df_processed").head(10)))
+
+    st.markdown("---")
+    st.subheader("1.5 Couverture des indicateurs par année")
+    st.write("Part des pays du panel pour lesquels chaque indicateur est renseigné, année par année :")
+    version = load_dataset("data_version")
+    png, _ = FIGURES.render(("coverage_heatmap", version, st.get_option("theme.base")),
+                            lambda: draw_coverage_heatmap(missing_processed.coverage(), "Couverture des indicateurs"))
+    st.image(png, width="stretch")
+    with st.expander("**Valeurs manquantes par région et par pays**"):
+        st.dataframe(missing_processed.by_region)
+        st.dataframe(missing_processed.by_country)
+
+    st.markdown("---")
+    st.subheader("1.6 Comblement optionnel des valeurs manquantes")
+    st.write("Pour les modèles qui exigent des séries complètes, le panel peut être comblé pays par pays "
+             "(interpolation, report borné de la valeur voisine) ou par la médiane de la région la même année. "
+             "Les pages d'analyse travaillent par défaut sur le panel brut ; la méthode choisie dans la "
+             "barre latérale (« Comblement des valeurs manquantes ») les fait passer au panel comblé.")
+    gap_filling(missing_processed)
+
+    st.markdown("---")
+    st.markdown(f"""
+    Il nous reste encore {missing_processed.total} données manquantes, soit {missing_processed.share:.0%} de valeurs manquantes dans notre jeu de données. 
+    Nous nous rendons compte que notre analyse ne va pas être si aisée au vu du grand nombre de données absentes.
+    
+    Nous avons fait le choix de ne pas dénaturer l’analyse du WHR et de ne pas remplacer les valeurs manquantes par des moyennes ou des données externes.
+    En effet, l’analyse du WHR est bien spécifique avec des questions posées sur un échantillon de personnes. 
+                
+    Nous allons donc poursuivre notre analyse avec, tout de même, un grand nombre de données exploitables sur un large panel de {len(missing_processed.countries)} pays 
+    et avec une amplitude temporelle de {len(years)} années ({years[0]} à {years[-1]}).
+    
+
+    """)
+    st.markdown("---")
+    st.info("#### 🌟 Le dataset est maintenant prêt pour une analyse approfondie.")
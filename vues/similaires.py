@@ -0,0 +1,55 @@
+"""Page "Pays similaires" : plus proches voisins d'un pays une année donnée."""
+import streamlit as st
+
+from vues.commun import filtered, load_dataset, panel_filters
+from whr.similarity import MAX_MISSING, cached_similarity_index
+
+
+def pays_similaires():
+    filters = panel_filters()
+    if filtered(filters).empty:
+        st.warning("Aucune observation ne correspond aux filtres sélectionnés.")
+        return
+    # Un arbre k-d par année sur les pays retenus par les filtres, construit une fois par version des données
+    # et combinaison de filtres (whr/similarity.py)
+    index = cached_similarity_index(load_dataset("data_version"), filters)
+    options = load_dataset("filter_options")
+    indexed = {iso for entry in index.years.values() for iso in entry['position']}
+    countries = [c for c in options['countries'] if c in indexed]
+    if not countries:
+        st.warning("Pas assez d'indicateurs renseignés pour les pays sélectionnés.")
+        return
+
+    st.title("🌍 Pays similaires")
+    st.markdown("---")
+    st.write("##### Pays les plus proches sur le Life Ladder et les six facteurs du WHR, centrés-réduits année par année "
+             "(distance en écarts-types). Seuls les pays et années retenus par les filtres sont comparés.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        country = st.selectbox("Pays", countries, format_func=options['country_names'].get,
+                               index=countries.index("FRA") if "FRA" in countries else 0)
+    years = index.available_years(country)
+    if not years:
+        st.warning("Pas assez d'indicateurs renseignés pour ce pays.")
+        return
+    with col2:
+        k = st.slider("Nombre de voisins", 1, 20, 5)
+    year = st.select_slider("Année", options=years, value=years[-1])
+
+    st.dataframe(index.neighbours(country, year, k).round(3), hide_index=True)
+
+    st.markdown("---")
+    st.subheader("Paires de pays proches dans une région")
+    regions = sorted(index.years[year]['regions'])
+    col1, col2 = st.columns(2)
+    with col1:
+        region = st.selectbox("Région", regions)
+    with col2:
+        radius = st.slider("Distance maximale", 0.1, 3.0, 0.8, step=0.1)
+    pairs = index.region_pairs(year, region, radius)
+    st.write(f"**{len(pairs)}** paires à moins de {radius} écart-type en {year}.")
+    st.dataframe(pairs.round(3), hide_index=True)
+
+    st.info(f"##### Un pays auquel il manque plus de {MAX_MISSING} indicateurs une année n'est pas comparé cette année-là ; "
+            "les autres valeurs manquantes comptent comme la moyenne de l'année.")
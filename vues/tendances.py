@@ -0,0 +1,79 @@
+"""Page "Analyse des Tendances" : moyennes annuelles des indicateurs."""
+import streamlit as st
+
+from vues.commun import filtered, load_dataset, panel_filters
+from whr.aggregates import cached_yearly_summary
+from whr.animation import cached_year_points, frame_spec, year_frames
+from whr.figures import FIGURES, draw_yearly_bars
+
+
+def yearly_bars(filters, indicator, palette, ylim, title, ylabel):
+    # Moyennes et intervalles de confiance lus dans la table annuelle précalculée (whr/aggregates.py)
+    version = load_dataset("data_version")
+    key = ("yearly_bars", version, filters, indicator, palette, ylim, title, ylabel, st.get_option("theme.base"))
+    png, _ = FIGURES.render(key, lambda: draw_yearly_bars(cached_yearly_summary(version, filters), indicator, palette,
+                                                          ylim, title, "Année", ylabel))
+    st.image(png, width="stretch")
+
+
+def year_scatter(filters):
+    # Toutes les années rendues une fois par version et filtre (whr/animation.py) : le curseur ne lit que le cache
+    version = load_dataset("data_version")
+    points = cached_year_points(version, filters)
+    if not points.years:
+        st.warning("Aucun pays n'a à la fois le PIB et le Life Ladder renseignés pour ces filtres.")
+        return
+    client = st.toggle("Graphique interactif (tracé par le navigateur)", key="scatter_client",
+                       help="Envoie au navigateur les coordonnées des pays de l'année choisie au lieu d'une image")
+    year = st.select_slider("Année", options=points.years, value=points.years[-1], key="scatter_year")
+    if client:
+        st.vega_lite_chart(frame_spec(points, year), width="stretch")
+        return
+    frames = year_frames(points, ("year_scatter", version, filters, st.get_option("theme.base")))
+    png, _ = frames[year]
+    st.image(png, width="stretch")
+
+
+def analyse_des_tendances_page():
+    filters = panel_filters()
+    df_processed = filtered(filters)
+    if df_processed.empty:
+        st.warning("Aucune observation ne correspond aux filtres sélectionnés.")
+        return
+    yearly_summary = cached_yearly_summary(load_dataset("data_version"), filters)
+
+    st.title("🌍 Tendances Globales (2005-2021)")
+    st.markdown("---")
+    st.write("Explorons comment les indicateurs clés du bonheur ont évolué au fil des ans.")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.subheader("Bonheur Global (Life Ladder)")
+        yearly_bars(filters, 'Life Ladder', 'viridis', (3, 7), "Évolution du Life Ladder", "Score Life Ladder")
+
+    with col2:
+        st.subheader("Espérance de Vie en Bonne Santé")
+        yearly_bars(filters, 'Healthy life expectancy', 'mako', (45, 70), "Évolution de l'Espérance de Vie", "Années")
+
+    with col3:
+        st.subheader("PIB par Habitant")
+        yearly_bars(filters, 'Logged GDP per capita', 'rocket', (7, 10), "Évolution du Logged GDP per capita", "Log PIB par Habitant")
+
+    st.markdown("---")
+    st.subheader("Évolution pays par pays : PIB et bonheur")
+    st.write("Chaque point est un pays, coloré par région ; faites glisser le curseur pour parcourir les années.")
+    year_scatter(filters)
+
+    st.markdown("---")
+    st.markdown(f"""
+    L'année {yearly_summary.index[0]} contient seulement {yearly_summary[('Life Ladder', 'count')].iloc[0]} données sur les {df_processed['Country name'].nunique()} pays présents, ce qui explique cet écart.
+    
+    Il faudra pousser l’analyse en détail par indicateurs afin de comprendre ces différentes évolutions du “life ladder” au fil des années. 
+    Ici, on représente seulement une moyenne de l’ensemble des pays par année. 
+    
+    Attention toutefois, toutes les années ne disposent pas du même nombre de pays par année.
+                
+    """)
+
+    st.info("##### Les graphiques montrent une tendance générale à l'amélioration de l'espérance de vie et du PIB, tandis que le score du bonheur reste relativement stable avec des variations annuelles.")
@@ -0,0 +1 @@
+"""Couche données de l'application d'analyse du World Happiness Report."""
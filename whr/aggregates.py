@@ -0,0 +1,126 @@
+"""Agrégats annuels du panel (page "Analyse des Tendances").
+
+``yearly_summary`` calcule, pour chaque année et chaque indicateur,
+l'effectif, la moyenne, l'écart-type et un intervalle de confiance de la
+moyenne. Le bootstrap (1 000 tirages par défaut, comme ``sns.barplot``) est
+fait par lots avec NumPy, une seule fois par version des données, au lieu
+d'un rééchantillonnage par barre à chaque affichage. Chaque cellule
+(année, indicateur) a son propre générateur aléatoire : après une mise à
+jour des sources, ``update_summary`` ne recalcule que les cellules dont les
+observations ont changé.
+"""
+import functools
+import zlib
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import NO_FILTER, filtered_panel
+from whr.pipeline import INDICATORS
+
+STATS = ['count', 'mean', 'std', 'ci_low', 'ci_high']
+
+
+def bootstrap_ci(values, n_boot=1000, ci=95, seed=0, batch=100):
+    """Intervalle de confiance percentile de la moyenne de ``values`` (sans NaN).
+
+    Les rééchantillonnages sont tirés par lots de ``batch``.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(values)
+    means = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        size = min(batch, n_boot - start)
+        means[start:start + size] = values[rng.integers(0, n, (size, n))].mean(axis=1)
+    alpha = (100 - ci) / 2
+    return np.percentile(means, [alpha, 100 - alpha])
+
+
+def cell_stats(values, method="bootstrap", n_boot=1000, ci=95, seed=0):
+    """Statistiques ``STATS`` d'un indicateur sur les observations d'une année (NaN ignorés)."""
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return np.array([0, np.nan, np.nan, np.nan, np.nan])
+    mean = values.mean()
+    std = values.std(ddof=1) if n > 1 else np.nan
+
+    if method == "bootstrap":
+        low, high = bootstrap_ci(values, n_boot=n_boot, ci=ci, seed=seed)
+    elif method == "analytic":
+        half = NormalDist().inv_cdf(0.5 + ci / 200) * std / np.sqrt(n)
+        low, high = mean - half, mean + half
+    else:
+        raise ValueError(f"Méthode d'intervalle inconnue : {method!r}")
+    return np.array([n, mean, std, low, high])
+
+
+def _cell_seed(seed, year, indicator):
+    # Un générateur par cellule (année, indicateur) : chaque cellule se recalcule seule à l'identique
+    return [seed, int(year), zlib.crc32(indicator.encode())]
+
+
+def _year_blocks(panel, indicators):
+    """Observations de chaque année, dans l'ordre du panel : {année: matrice (lignes, indicateurs)}."""
+    years, year_code = np.unique(panel['year'].to_numpy(), return_inverse=True)
+    values = panel[indicators].to_numpy(dtype=np.float64)
+    order = np.argsort(year_code, kind="stable")
+    bounds = np.searchsorted(year_code[order], np.arange(len(years) + 1))
+    return {year: values[order[bounds[i]:bounds[i + 1]]] for i, year in enumerate(years)}
+
+
+def _summary_frame(stats, years, indicators):
+    columns = pd.MultiIndex.from_product([indicators, STATS], names=['indicator', 'stat'])
+    stats = np.asarray(stats, dtype=np.float64).reshape(len(years), -1)
+    summary = pd.DataFrame(stats, index=pd.Index(years, name='year'), columns=columns)
+    summary[[(ind, 'count') for ind in indicators]] = summary[[(ind, 'count') for ind in indicators]].astype(np.int64)
+    return summary
+
+
+def yearly_summary(panel, indicators=INDICATORS, method="bootstrap", n_boot=1000, ci=95, seed=0):
+    """Table par année : (indicateur, statistique) en colonnes, statistiques de ``STATS``.
+
+    ``method`` vaut ``"bootstrap"`` (percentile, comme seaborn) ou ``"analytic"``
+    (approximation normale ``mean ± z * std / sqrt(n)``).
+    """
+    blocks = _year_blocks(panel, indicators)
+    stats = [[cell_stats(block[:, j], method, n_boot, ci, _cell_seed(seed, year, indicator))
+              for j, indicator in enumerate(indicators)] for year, block in blocks.items()]
+    return _summary_frame(stats, list(blocks), indicators)
+
+
+def _same_sample(old, new):
+    return np.array_equal(old[~np.isnan(old)], new[~np.isnan(new)])
+
+
+def update_summary(summary, previous, panel, indicators=INDICATORS, method="bootstrap", n_boot=1000, ci=95, seed=0):
+    """Table annuelle de ``panel`` à partir de celle (``summary``) du panel ``previous``.
+
+    Seules les cellules (année, indicateur) dont les observations ont changé
+    sont recalculées ; le résultat est identique à ``yearly_summary(panel)``.
+    """
+    old_blocks = _year_blocks(previous, indicators)
+    old_stats = summary[indicators].to_numpy(dtype=np.float64).reshape(len(summary), len(indicators), len(STATS))
+    blocks = _year_blocks(panel, indicators)
+    stats = []
+    for year, block in blocks.items():
+        old = old_blocks.get(year)
+        row = []
+        for j, indicator in enumerate(indicators):
+            if old is not None and _same_sample(old[:, j], block[:, j]):
+                row.append(old_stats[summary.index.get_loc(year), j])
+            else:
+                row.append(cell_stats(block[:, j], method, n_boot, ci, _cell_seed(seed, year, indicator)))
+        stats.append(row)
+    return _summary_frame(stats, list(blocks), indicators)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_yearly_summary(version, key):
+    """Table annuelle du panel filtré par ``key`` (``whr.filters``) ; ``version`` invalide le cache."""
+    from whr import registry
+
+    if key == NO_FILTER:
+        return registry.get("yearly_summary")
+    return yearly_summary(filtered_panel(version, key))
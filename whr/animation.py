@@ -0,0 +1,149 @@
+"""Évolution des pays année par année (page "Analyse des Tendances").
+
+Un curseur d'années fait défiler le nuage PIB par habitant / Life Ladder des
+pays, coloré par région. Les coordonnées de chaque année sont extraites une
+fois par version des données et clé de filtre (:class:`YearPoints`, cache
+LRU), sans repasser sur le panel à chaque déplacement du curseur.
+
+Deux modes d'affichage :
+
+- images : toutes les années sont rendues en PNG en une fois, en parallèle
+  dans un pool de processus (:func:`year_frames`). Chaque processus dessine
+  une seule figure pour sa suite d'années, dont seuls les points et l'année
+  changent ; le cadrage (``bbox_inches``) est calculé une fois, toutes les
+  images ont la même taille. Elles sont conservées dans
+  ``FRAMES``, un cache LRU borné distinct de ``whr.figures.FIGURES`` (les
+  images d'une animation ne chassent pas celles des autres pages). Un
+  déplacement du curseur est alors une lecture du cache, sans matplotlib ;
+- navigateur : seules les coordonnées de l'année choisie (pays, région,
+  x, y) sont envoyées dans une spécification Vega-Lite (:func:`frame_spec`),
+  avec les mêmes axes et couleurs pour toutes les années.
+"""
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from whr import tracing
+from whr.figures import FigureCache, draw_year_scatter, rasterize_frames, set_year_points
+from whr.filters import filtered_panel
+
+X = 'Logged GDP per capita'
+Y = 'Life Ladder'
+NO_REGION = "Non renseignée"
+
+# Images des animations : 17 années par combinaison de filtres, une quinzaine de combinaisons
+FRAMES = FigureCache(max_entries=256, max_bytes=48 * 1024 * 1024)
+
+
+def _limits(values, margin=0.04):
+    if not len(values):
+        return (0.0, 1.0)
+    low, high = float(values.min()), float(values.max())
+    pad = (high - low) * margin or 0.5
+    return (low - pad, high + pad)
+
+
+class YearPoints:
+    """Coordonnées ``(x, y)`` des pays de chaque année, code de région et nom du pays.
+
+    ``frames[year]`` est un dict de tableaux ``x``, ``y``, ``region`` (position
+    dans ``regions``) et ``country`` ; ``xlim`` et ``ylim`` couvrent toutes
+    les années.
+    """
+
+    def __init__(self, panel, x=X, y=Y):
+        self.x, self.y = x, y
+        xs = panel[x].to_numpy(dtype=np.float64)
+        ys = panel[y].to_numpy(dtype=np.float64)
+        keep = ~np.isnan(xs) & ~np.isnan(ys)
+        year = panel['year'].to_numpy()[keep]
+        region, regions = pd.factorize(panel['Regional indicator'].to_numpy(dtype=object)[keep], sort=True)
+        self.regions = [str(r) for r in regions]
+        if (region < 0).any():
+            region = np.where(region < 0, len(self.regions), region)
+            self.regions.append(NO_REGION)
+        country = panel['Country name'].to_numpy(dtype=object)[keep]
+        xs, ys = xs[keep], ys[keep]
+
+        order = np.argsort(year, kind="stable")
+        self.years = [int(v) for v in np.unique(year)]
+        bounds = np.append(np.searchsorted(year[order], self.years), len(order))
+        self.frames = {}
+        for i, value in enumerate(self.years):
+            rows = order[bounds[i]:bounds[i + 1]]
+            self.frames[value] = {'x': xs[rows], 'y': ys[rows], 'region': region[rows], 'country': country[rows]}
+        self.xlim, self.ylim = _limits(xs), _limits(ys)
+
+    def records(self, year):
+        """Points de l'année ``year`` pour Vega-Lite (une entrée par pays)."""
+        frame = self.frames[year]
+        return [{'country': c, 'region': self.regions[r], 'x': round(float(a), 4), 'y': round(float(b), 4)}
+                for c, r, a, b in zip(frame['country'], frame['region'], frame['x'], frame['y'])]
+
+
+@functools.lru_cache(maxsize=64)
+def cached_year_points(version, key):
+    """Coordonnées par année du panel filtré par ``key`` (``whr.filters``) ; ``version`` invalide le cache."""
+    return YearPoints(filtered_panel(version, key))
+
+
+def _render_frames(frames, regions, xlim, ylim, xlabel, ylabel):
+    """Images ``(png, width)`` des années de ``frames`` (dict année -> points), sur une seule figure."""
+    years = list(frames)
+    fig = draw_year_scatter(frames[years[0]], years[0], regions, xlim, ylim, xlabel, ylabel)
+    return rasterize_frames(fig, lambda f, year: set_year_points(f, frames[year], year), years)
+
+
+def year_frames(points, key, jobs=None):
+    """Image ``(png, width)`` de chaque année de ``points`` : ``{année: image}``.
+
+    ``key`` identifie l'animation (version des données, filtres, thème) ;
+    chaque image est rangée dans ``FRAMES`` sous ``key + (année,)``. Seules les
+    années absentes du cache sont rendues, en suites d'années consécutives
+    réparties sur ``jobs`` processus (défaut : nombre de cœurs, ``jobs=1`` en
+    séquence).
+    """
+    frames = {year: FRAMES.get(key + (year,)) for year in points.years}
+    todo = [year for year, entry in frames.items() if entry is None]
+    if not todo:
+        return frames
+    FRAMES.misses += len(todo)
+    jobs = min(len(todo), jobs or os.cpu_count() or 1)
+    chunks = [{int(year): points.frames[int(year)] for year in chunk} for chunk in np.array_split(todo, jobs)]
+    args = [(chunk, points.regions, points.xlim, points.ylim, points.x, points.y) for chunk in chunks]
+    with tracing.span(f"frames:{key[0]}", cat="figure", rows_in=len(todo)):
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                rendered = [image for images in pool.map(_render_frames, *zip(*args)) for image in images]
+        else:
+            rendered = _render_frames(*args[0])
+    for year, entry in zip(todo, rendered):
+        FRAMES.put(key + (year,), entry)
+        frames[year] = entry
+    return frames
+
+
+def frame_spec(points, year, height=400):
+    """Spécification Vega-Lite du nuage de l'année ``year`` : données de cette année seulement, axes communs."""
+    def axis(field, title, limits):
+        return {"field": field, "type": "quantitative", "title": title,
+                "scale": {"domain": list(limits), "nice": False, "zero": False}}
+
+    return {
+        "height": height,
+        "data": {"values": points.records(year)},
+        "mark": {"type": "circle", "size": 45, "opacity": 0.8},
+        "encoding": {
+            "x": axis("x", points.x, points.xlim),
+            "y": axis("y", points.y, points.ylim),
+            "color": {"field": "region", "type": "nominal", "title": None,
+                      "scale": {"domain": points.regions, "scheme": "tableau10"}},
+            "tooltip": [{"field": "country", "title": "Pays"}, {"field": "region", "title": "Région"},
+                        {"field": "x", "title": points.x, "format": ".2f"},
+                        {"field": "y", "title": points.y, "format": ".2f"}],
+        },
+        "title": str(year),
+    }
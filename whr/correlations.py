@@ -0,0 +1,67 @@
+"""Matrices de corrélation filtrées (page "Matrice de corrélation").
+
+Les corrélations sont calculées sur les observations complètes par paire,
+comme ``DataFrame.corr`` ; celles de Pearson en quelques produits matriciels sur des
+données masquées (NaN remplacés par 0 et matrice de présence), sans boucle
+sur les couples de colonnes. Chaque résultat est mis en cache par clé de
+filtre (``whr.filters``) : changer de région ou de période déjà vue ne coûte
+qu'une lecture.
+
+Le coefficient de Spearman classe les valeurs de chaque paire sur ses seules
+observations complètes : il ne se ramène pas à un produit matriciel et est
+délégué à ``DataFrame.corr``.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import filtered_panel
+from whr.pipeline import INDICATORS
+
+# En dessous de ce nombre d'observations communes, un couple est signalé comme peu fiable
+MIN_OVERLAP = 30
+
+
+def _pearson(values, present, weights, n):
+    """Corrélations de Pearson par paire en produits matriciels (``n`` : observations communes)."""
+    # Centrage par colonne (ne change pas la corrélation, limite les erreurs d'arrondi)
+    with np.errstate(invalid="ignore"):
+        centered = values - np.nanmean(values, axis=0)
+    x = np.where(present, centered, 0.0)
+
+    sx = x.T @ weights                      # sx[i, j] : somme de x_i là où i et j sont renseignés
+    sxx = (x * x).T @ weights
+    sxy = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+        return cov / np.sqrt(var)
+
+
+def pairwise_corr(values, method="pearson"):
+    """Corrélations et effectifs par paire d'une matrice (observations x variables) avec NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    if method not in ("pearson", "spearman"):
+        raise ValueError(f"Méthode de corrélation inconnue : {method!r}")
+
+    present = ~np.isnan(values)
+    weights = present.astype(np.float64)
+    n = weights.T @ weights                 # observations communes
+    if method == "spearman":
+        # Rangs recalculés sur les observations complètes de chaque paire
+        corr = pd.DataFrame(values).corr(method="spearman").to_numpy(copy=True)
+    else:
+        corr = _pearson(values, present, weights, n)
+    corr[n < 2] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr, n.astype(np.int64)
+
+
+@functools.lru_cache(maxsize=256)
+def cached_correlation(version, method, key):
+    """Corrélation du panel courant pour une clé de ``filter_key`` ; ``version`` invalide le cache."""
+    subset = filtered_panel(version, key)
+    corr, counts = pairwise_corr(subset[INDICATORS].to_numpy(dtype=np.float64), method)
+    return (pd.DataFrame(corr, index=INDICATORS, columns=INDICATORS),
+            pd.DataFrame(counts, index=INDICATORS, columns=INDICATORS))
@@ -0,0 +1,124 @@
+"""Référentiel des pays : code ISO3 canonique, nom et index des alias.
+
+Toutes les sources sont rattachées à un code ISO3 avant toute jointure. La
+table de référence (:class:`CountryTable`) est construite à partir de la
+base ``Merge_ID_Year_Country.csv`` (nom et code de chaque pays du panel) ;
+son index des alias réunit :
+
+- les noms de la base de référence (orthographe du WHR) ;
+- les codes eux-mêmes (Banque mondiale et OMS désignent les pays par code) ;
+- les noms de la Banque mondiale dont le code est dans la table ;
+- les orthographes déclarées dans ``ALIASES`` (noms des anciens rapports).
+
+Une valeur est cherchée d'abord telle quelle dans l'index (table de hachage
+de ``pd.Index``), puis sous sa forme normalisée (:func:`normalize` : casse,
+accents, ponctuation). La recherche est faite une fois par valeur distincte
+puis diffusée à toutes les lignes. Les valeurs introuvables sont relevées
+dans ``unresolved`` et signalées par un avertissement
+(:class:`UnresolvedCountryWarning`) au lieu de produire des lignes sans code.
+"""
+import hashlib
+import json
+import re
+import unicodedata
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Orthographes absentes de la base de référence -> code ISO3
+ALIASES = {'Macedonia': 'MKD'}
+
+# Régions des pays absents de tous les rapports annuels
+REGIONS = {
+    'AGO': 'Sub-Saharan Africa', 'BLZ': 'Latin America and Caribbean', 'BTN': 'South Asia',
+    'CUB': 'Latin America and Caribbean', 'DJI': 'Sub-Saharan Africa', 'GUY': 'Latin America and Caribbean',
+    'MKD': 'Central and Eastern Europe', 'OMN': 'Middle East and North Africa',
+    'QAT': 'Middle East and North Africa', 'SOM': 'Middle East and North Africa',
+    'NON ISO SOM': 'Middle East and North Africa', 'SDN': 'Sub-Saharan Africa',
+    'SUR': 'Latin America and Caribbean', 'SYR': 'Middle East and North Africa'
+}
+
+UNRESOLVED = -1
+
+
+def reference_digest():
+    """Empreinte de ``ALIASES`` et ``REGIONS`` : un snapshot construit avec un autre référentiel est reconstruit."""
+    content = json.dumps({'aliases': ALIASES, 'regions': REGIONS}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class UnresolvedCountryWarning(UserWarning):
+    """Des noms ou codes de pays d'une source ne sont pas dans le référentiel."""
+
+
+def normalize(values):
+    """Forme normalisée de noms de pays : sans accents ni ponctuation, en minuscules, ``&`` -> ``and``."""
+    def key(value):
+        # Accents retirés (marques combinantes), toute autre ponctuation devient un espace
+        value = "".join(c for c in unicodedata.normalize("NFKD", str(value)) if not unicodedata.combining(c))
+        value = re.sub(r"[^0-9a-z]+", " ", value.casefold().replace("&", " and "))
+        return re.sub(r"^the ", "", value.strip())
+    return [key(v) for v in values]
+
+
+class CountryTable:
+    """Codes ISO3 canoniques (triés), nom de chaque code et index des alias vers ces codes."""
+
+    def __init__(self, codes, names, aliases=()):
+        table = pd.DataFrame({'code': np.asarray(codes, dtype=object), 'name': np.asarray(names, dtype=object)})
+        table = table.drop_duplicates('code').sort_values('code', ignore_index=True)
+        self.codes = pd.Index(table['code'].to_numpy(dtype=object))
+        self.names = table['name'].to_numpy(dtype=object)
+        self.unresolved = {}
+
+        # Alias -> position du code ; un alias déjà pris garde sa première cible
+        pairs = pd.concat([pd.DataFrame({'alias': self.codes, 'code': self.codes}),
+                           pd.DataFrame({'alias': self.names, 'code': self.codes}),
+                           pd.DataFrame(list(aliases), columns=['alias', 'code'], dtype=object)], ignore_index=True)
+        pairs = pairs.assign(target=self.codes.get_indexer(pairs['code'].to_numpy(dtype=object)))
+        pairs = pairs.loc[pairs['target'] >= 0].drop_duplicates('alias')
+        self._aliases = pd.Index(pairs['alias'].to_numpy(dtype=object))
+        # Cibles suivies de UNRESOLVED : la position -1 de get_indexer (alias introuvable) y mène
+        self._targets = np.append(pairs['target'].to_numpy(dtype=np.int64), UNRESOLVED)
+
+        # Formes normalisées sans ambiguïté (une seule cible)
+        normal = pairs.assign(normal=normalize(pairs['alias'])).drop_duplicates(['normal', 'target'])
+        normal = normal.loc[~normal['normal'].duplicated(keep=False)]
+        self._normal = pd.Index(normal['normal'].to_numpy(dtype=object))
+        self._normal_targets = np.append(normal['target'].to_numpy(dtype=np.int64), UNRESOLVED)
+
+    @classmethod
+    def from_sources(cls, id_base, gdp=None):
+        """Table de la base de référence ; alias de ``ALIASES`` et des noms de la Banque mondiale (``gdp``)."""
+        aliases = list(ALIASES.items())
+        if gdp is not None:
+            names = gdp[['Country Name', 'Country Code']].drop_duplicates()
+            aliases += list(zip(names['Country Name'], names['Country Code']))
+        return cls(id_base['ISO-alpha3 Code'], id_base['Country name'], aliases)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def resolve(self, values, source=None):
+        """Position dans ``codes`` de chaque valeur (nom ou code) ; ``UNRESOLVED`` si introuvable.
+
+        Les valeurs introuvables (hors NaN) sont ajoutées à ``unresolved[source]`` ;
+        sans ``source`` (Banque mondiale et OMS, qui couvrent aussi des pays et
+        agrégats hors panel), elles ne sont pas relevées.
+        """
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        found = self._targets[self._aliases.get_indexer(uniques)]
+        missing = np.flatnonzero(found == UNRESOLVED)
+        if len(missing):
+            found[missing] = self._normal_targets[self._normal.get_indexer(normalize(uniques[missing]))]
+            unknown = uniques[missing][found[missing] == UNRESOLVED]
+            if len(unknown) and source is not None:
+                self.unresolved.setdefault(source, set()).update(unknown)
+        return np.where(codes >= 0, found[codes], UNRESOLVED)
+
+    def warn_unresolved(self):
+        """Signale les valeurs introuvables relevées par :meth:`resolve`, source par source."""
+        for source, values in sorted(self.unresolved.items(), key=lambda item: str(item[0])):
+            warnings.warn(f"Pays absents du référentiel ({source}), lignes ignorées : {sorted(values)}",
+                          UnresolvedCountryWarning, stacklevel=2)
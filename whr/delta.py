@@ -0,0 +1,142 @@
+"""Mise à jour incrémentale du panel quand une source change.
+
+Un snapshot conserve, en plus du panel, l'empreinte de chaque ligne de
+chaque source (pays, année, hash du contenu). Quand une source est modifiée
+ou ajoutée (nouveau rapport annuel déclaré dans ``whr.sources``, révision
+des fichiers Banque mondiale ou OMS), seules ses lignes sont relues et
+comparées aux empreintes : les pays dont une ligne est apparue, a disparu ou
+a changé sont les seuls recalculés. Les pays sont identifiés par leur code
+ISO3, les noms des sources étant résolus par le référentiel
+(``whr.countries``).
+
+Le traitement (``pipeline.build_panel``) ne fait que des opérations pays par
+pays ; il est donc appliqué aux seules lignes des pays touchés, puis leurs
+lignes remplacent les anciennes dans le panel. Dans la table annuelle, seules
+les cellules (année, indicateur) dont les observations ont changé sont
+recalculées. Le résultat est identique, bit à
+bit, à une reconstruction complète (vérifié par
+``python -m benchmarks.check_delta``).
+"""
+import numpy as np
+import pandas as pd
+
+from whr import aggregates, countries, pipeline, schema, storage, tracing
+from whr.ingest import read_source
+from whr.sources import SOURCES
+
+
+def source_digests():
+    """Hash SHA-256 de chaque fichier source déclaré."""
+    return {name: storage.file_digest(source.path) for name, source in SOURCES.items()}
+
+
+def row_hashes(name, frame):
+    """Empreintes des lignes d'une source : ``(entity, year, hash)``, une ligne par ligne de la source."""
+    source = SOURCES[name]
+    year = frame[source.year].to_numpy(np.int64) if source.year else np.full(len(frame), source.release, np.int64)
+    return pd.DataFrame({
+        'source': name,
+        'entity': frame[source.entity].astype('str').to_numpy(),
+        'year': year,
+        'hash': pd.util.hash_pandas_object(frame, index=False).to_numpy(),
+    })
+
+
+def _changed_entities(old, new):
+    """Entités (pays ou codes ISO) dont au moins une ligne diffère entre deux tables d'empreintes."""
+    def fingerprint(rows):
+        return pd.util.hash_pandas_object(rows[['entity', 'year', 'hash']], index=False).to_numpy()
+
+    old_fp, new_fp = fingerprint(old), fingerprint(new)
+    added = new['entity'].to_numpy()[~np.isin(new_fp, old_fp)]
+    removed = old['entity'].to_numpy()[~np.isin(old_fp, new_fp)]
+    return set(added) | set(removed)
+
+
+def full_build():
+    """Etat complet : panel, données brutes, table annuelle, empreintes des lignes et des fichiers."""
+    df_processed, df_original = pipeline.load_and_preprocess_data()
+    with tracing.span("row_hashes"):
+        rows = pd.concat([row_hashes(name, read_source(name)) for name in SOURCES], ignore_index=True)
+    return {
+        "processed": df_processed,
+        "original": df_original,
+        "summary": aggregates.yearly_summary(df_processed),
+        "rows": rows,
+        "digests": source_digests(),
+    }
+
+
+def incremental_build(previous):
+    """Etat à jour obtenu depuis ``previous`` (état d'un snapshot antérieur).
+
+    L'état retourné contient aussi, dans ``"changed"``, les sources et pays
+    recalculés. Si une source a été retirée de ``whr.sources``, le
+    panel est reconstruit entièrement.
+    """
+    digests = source_digests()
+    if set(previous["digests"]) - set(SOURCES):
+        return {**full_build(), "changed": {"sources": list(SOURCES), "countries": None}}
+    changed_sources = [name for name in SOURCES if previous["digests"].get(name) != digests[name]]
+    if not changed_sources:
+        return {**previous, "changed": {"sources": [], "countries": []}}
+
+    old_rows = previous["rows"]
+    frames, new_rows, names, isos = {}, {}, set(), set()
+    with tracing.span("delta_diff") as sp:
+        for name in changed_sources:
+            frames[name] = read_source(name)
+            new_rows[name] = row_hashes(name, frames[name])
+            entities = _changed_entities(old_rows.loc[old_rows['source'] == name], new_rows[name])
+            (names if SOURCES[name].entity == 'Country name' else isos).update(entities)
+        sp.rows_out = len(names) + len(isos)
+
+    for name in SOURCES:
+        if name not in frames:
+            frames[name] = read_source(name)
+
+    # Pays touchés en codes ISO3 : noms résolus par le référentiel, et pays du panel précédent
+    # portant ces noms (nom retiré de la base Id)
+    old_panel = previous["processed"]
+    table = countries.CountryTable.from_sources(frames['id_base'], frames['gdp'])
+    if names:
+        resolved = table.resolve(sorted(names))
+        isos |= set(table.codes[resolved[resolved != countries.UNRESOLVED]])
+        isos |= set(old_panel.loc[old_panel['Country name'].isin(names), 'ISO-alpha3 Code'])
+    touched = np.flatnonzero(table.codes.isin(isos))
+
+    # Sous-ensemble des sources limité aux pays touchés
+    def subset(name):
+        frame, entity = frames[name], SOURCES[name].entity
+        if entity == 'Country name':
+            keep = np.isin(table.resolve(frame[entity]), touched)
+        else:
+            keep = frame[entity].isin(isos).to_numpy()
+        return frame.loc[keep].reset_index(drop=True)
+
+    with tracing.span("delta_rebuild", rows_in=len(isos)) as sp:
+        fresh = pipeline.build_panel(subset)
+        sp.rows_out = len(fresh)
+
+    with tracing.span("delta_splice", rows_in=len(old_panel)) as sp:
+        kept = old_panel.loc[~old_panel['ISO-alpha3 Code'].isin(isos)]
+        # Catégories recalculées sur le panel fusionné : les mêmes qu'une reconstruction complète
+        df_processed = schema.enforce(pd.concat([kept, fresh], ignore_index=True)
+                                      .sort_values(['year', 'Country name'], kind='stable', ignore_index=True))
+        sp.rows_out = len(df_processed)
+
+    with tracing.span("delta_summary", rows_in=len(df_processed)):
+        summary = aggregates.update_summary(previous["summary"], old_panel, df_processed)
+
+    df_original = (pipeline.original_frame(frames['whr']) if 'whr' in changed_sources
+                   else previous["original"])
+    rows = pd.concat([new_rows[name] if name in new_rows else old_rows.loc[old_rows['source'] == name]
+                      for name in SOURCES], ignore_index=True)
+    return {
+        "processed": df_processed,
+        "original": df_original,
+        "summary": summary,
+        "rows": rows,
+        "digests": digests,
+        "changed": {"sources": changed_sources, "countries": sorted(isos)},
+    }
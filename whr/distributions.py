@@ -0,0 +1,106 @@
+"""Résumés de distribution pour des boîtes à moustaches tracées côté navigateur.
+
+Au lieu de rastériser chaque boîte à moustaches côté serveur à partir des
+lignes brutes, ``box_stats`` calcule en une passe vectorisée, pour toutes
+les colonnes numériques d'un jeu de données, les quartiles, les moustaches
+(convention de matplotlib/seaborn : valeurs extrêmes à moins de 1,5 IQR des
+quartiles) et les valeurs aberrantes. ``box_spec`` traduit un résumé en
+spécification Vega-Lite (``st.vega_lite_chart``) : le navigateur dessine la
+boîte et la taille des données envoyées ne dépend plus du nombre de lignes
+(les valeurs aberrantes sont plafonnées à ``MAX_OUTLIERS``).
+"""
+import functools
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import NO_FILTER, filtered_panel
+
+# Nombre maximal de valeurs aberrantes transmises par boîte (les plus éloignées des moustaches)
+MAX_OUTLIERS = 100
+
+STATS = ['count', 'min', 'whisker_low', 'q1', 'median', 'q3', 'whisker_high', 'max']
+
+
+def box_stats(frame, columns=None, whis=1.5, max_outliers=MAX_OUTLIERS):
+    """Résumé en cinq nombres, moustaches et valeurs aberrantes de chaque colonne numérique.
+
+    Retourne ``(stats, outliers)`` : ``stats`` est un DataFrame indexé par
+    colonne (colonnes de ``STATS``), ``outliers`` un dict colonne -> tableau
+    des valeurs aberrantes (au plus ``max_outliers``, les plus extrêmes).
+    """
+    if columns is None:
+        columns = [c for c in frame.select_dtypes("number").columns if c != 'year']
+    values = frame[list(columns)].to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    count = present.sum(axis=0)
+
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # colonne vide : nanpercentile renvoie NaN
+        q1, median, q3 = np.nanpercentile(values, [25, 50, 75], axis=0)
+        low_fence = q1 - whis * (q3 - q1)
+        high_fence = q3 + whis * (q3 - q1)
+        inside = present & (values >= low_fence) & (values <= high_fence)
+        whisker_low = np.where(inside, values, np.inf).min(axis=0, initial=np.inf)
+        whisker_high = np.where(inside, values, -np.inf).max(axis=0, initial=-np.inf)
+        lowest = np.where(present, values, np.inf).min(axis=0, initial=np.inf)
+        highest = np.where(present, values, -np.inf).max(axis=0, initial=-np.inf)
+
+    empty = count == 0
+    stats = np.stack([count, lowest, whisker_low, q1, median, q3, whisker_high, highest], axis=1).astype(np.float64)
+    stats[empty, 1:] = np.nan
+    stats = pd.DataFrame(stats, index=pd.Index(columns, name='column'), columns=STATS)
+    stats['count'] = stats['count'].astype(np.int64)
+
+    # Distance de chaque valeur aberrante à la clôture dépassée (-1 pour les autres)
+    outside = present & ~inside
+    distance = np.where(outside, np.maximum(low_fence - values, values - high_fence), -1.0)
+    outliers = {}
+    for j, column in enumerate(columns):
+        rows = np.flatnonzero(outside[:, j])
+        if len(rows) > max_outliers:
+            rows = rows[np.argsort(distance[rows, j])[-max_outliers:]]
+        outliers[column] = np.sort(values[rows, j])
+    return stats, outliers
+
+
+@functools.lru_cache(maxsize=64)
+def cached_box_stats(version, dataset, key=NO_FILTER):
+    """Résumés de toutes les colonnes numériques du jeu ``dataset`` ; ``version`` invalide le cache.
+
+    Les filtres de ``key`` (``whr.filters``) ne s'appliquent qu'au panel ``df_processed``.
+    """
+    from whr import registry
+
+    if dataset == "df_processed":
+        frame = filtered_panel(version, key)
+    elif key != NO_FILTER:
+        raise ValueError(f"Filtres non pris en charge pour le jeu de données {dataset!r}")
+    else:
+        frame = registry.get(dataset)
+    return box_stats(frame)
+
+
+def box_spec(stats, outliers, color, ylim=None, height=300):
+    """Spécification Vega-Lite d'une boîte à moustaches à partir d'une ligne de ``box_stats``."""
+    row = {k: (None if pd.isna(v) else float(v)) for k, v in stats.items()}
+    scale = {"domain": list(ylim), "clamp": True} if ylim else {"zero": False}
+    y = {"type": "quantitative", "scale": scale, "title": None}
+    tooltip = [{"field": f, "type": "quantitative", "format": ".3~f"} for f in STATS]
+    return {
+        "height": height,
+        "layer": [
+            {"data": {"values": [row]}, "layer": [
+                {"mark": {"type": "rule"},
+                 "encoding": {"y": {"field": "whisker_low", **y}, "y2": {"field": "whisker_high"}}},
+                {"mark": {"type": "bar", "size": 60, "color": color, "stroke": "#3f3f3f"},
+                 "encoding": {"y": {"field": "q1", **y}, "y2": {"field": "q3"}, "tooltip": tooltip}},
+                {"mark": {"type": "tick", "size": 60, "color": "#3f3f3f", "thickness": 2},
+                 "encoding": {"y": {"field": "median", **y}}},
+            ]},
+            {"data": {"values": [{"value": float(v)} for v in outliers]},
+             "mark": {"type": "point", "shape": "diamond", "color": "#3f3f3f", "filled": True, "size": 25},
+             "encoding": {"y": {"field": "value", **y}, "tooltip": [{"field": "value", "type": "quantitative"}]}},
+        ],
+    }
@@ -0,0 +1,243 @@
+"""Cache des figures rendues.
+
+Les figures matplotlib sont rastérisées une seule fois en PNG puis fermées
+immédiatement (``plt.close``) : elles ne s'accumulent plus dans le registre
+global de pyplot. Les octets PNG sont conservés dans un cache LRU borné en
+nombre d'entrées et en taille mémoire, partagé par toutes les sessions du
+processus ; une page déjà vue est resservie sans appeler matplotlib.
+
+La clé d'une figure doit contenir la version des données, la description
+complète du graphique et le thème d'affichage.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib
+
+# Rendu hors écran : aucune fenêtre, utilisable sans session Streamlit
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import seaborn as sns  # noqa: E402
+from matplotlib.ticker import PercentFormatter  # noqa: E402
+
+from whr import tracing  # noqa: E402
+
+# Résolution de rastérisation (identique à st.pyplot), affichée à moitié pour les écrans haute densité
+RENDER_DPI = 200
+
+
+class FigureCache:
+    """Cache LRU thread-safe d'images PNG, borné en entrées et en octets."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        png = entry[0]
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= len(self._entries.pop(key)[0])
+            self._entries[key] = entry
+            self._nbytes += len(png)
+            while self._entries and (len(self._entries) > self.max_entries or self._nbytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= len(evicted[0])
+
+    def render(self, key, draw):
+        """Retourne ``(png, width)`` pour ``key`` ; ``draw()`` n'est appelé qu'en cas d'absence.
+
+        ``draw`` doit retourner une figure matplotlib, fermée ici après rastérisation.
+        ``width`` est la largeur d'affichage en pixels.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        self.misses += 1
+        with tracing.span(f"figure:{key[0]}", cat="figure"):
+            entry = rasterize(draw())
+        self.put(key, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+def rasterize(fig, bbox_inches="tight", close=True):
+    """``(png, width)`` d'une figure matplotlib ; ``width`` en pixels d'affichage.
+
+    La figure est fermée après rastérisation, sauf ``close=False`` (figure
+    réutilisée pour plusieurs images, fermée par l'appelant).
+    """
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=RENDER_DPI, bbox_inches=bbox_inches)
+    finally:
+        if close:
+            plt.close(fig)
+    png = buffer.getvalue()
+    return png, _png_width(png) * 100 // RENDER_DPI
+
+
+def rasterize_frames(fig, update, steps):
+    """Images ``(png, width)`` successives d'une même figure : ``update(fig, step)`` avant chaque image.
+
+    Le cadrage serré est calculé une fois : seul le contenu des axes doit
+    changer d'une étape à l'autre, toutes les images ont la même taille. La
+    figure est fermée à la fin.
+    """
+    try:
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+        images = []
+        for step in steps:
+            update(fig, step)
+            images.append(rasterize(fig, bbox_inches=bbox, close=False))
+        return images
+    finally:
+        plt.close(fig)
+
+
+def _png_width(png):
+    # Largeur lue dans l'en-tête IHDR (octets 16 à 20)
+    return int.from_bytes(png[16:20], "big")
+
+
+def draw_boxplot(values, color, ylim=None, figsize=(3, 3)):
+    """Boîte à moustaches d'une série, au format des figures de la page Datavisualisation."""
+    fig, ax = plt.subplots(figsize=figsize)
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    sns.boxplot(y=values, color=color, ax=ax)
+    ax.set_ylabel("")
+    return fig
+
+
+def draw_yearly_bars(summary, indicator, palette, ylim, title, xlabel, ylabel, figsize=(8, 4)):
+    """Moyenne annuelle d'un indicateur avec son intervalle de confiance, depuis ``yearly_summary``.
+
+    L'effectif de chaque année (nombre de pays renseignés) est écrit au pied de la barre.
+    """
+    stats = summary[indicator]
+    x = np.arange(len(stats))
+    fig, ax = plt.subplots(figsize=figsize)
+    bars = ax.bar(x, stats['mean'], color=sns.color_palette(palette, len(stats)))
+    ax.errorbar(x, stats['mean'], yerr=[stats['mean'] - stats['ci_low'], stats['ci_high'] - stats['mean']],
+                fmt='none', ecolor='#424242', elinewidth=1.5)
+    ax.set_ylim(*ylim)
+    for bar, count in zip(bars, stats['count']):
+        ax.text(bar.get_x() + bar.get_width() / 2, ylim[0] + (ylim[1] - ylim[0]) * 0.02, f"n={count}",
+                ha='center', va='bottom', rotation=90, fontsize=7, color='white')
+    ax.set_xticks(x, stats.index)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+
+def draw_corr_heatmap(corr, counts, min_overlap, title, figsize=(10, 8)):
+    """Heatmap annotée ; les couples avec moins de ``min_overlap`` observations communes sont marqués d'un *."""
+    labels = corr.map(lambda r: "" if np.isnan(r) else f"{r:.2f}")
+    labels = labels.where(counts >= min_overlap, labels + "*")
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.heatmap(corr, annot=labels, ax=ax, cmap='coolwarm', fmt="")
+    ax.set_title(title)
+    return fig
+
+
+def draw_coverage_heatmap(coverage, title, figsize=(10, 5)):
+    """Part des pays renseignés (0 à 1) par année (en abscisse) et indicateur, depuis ``MissingProfile.coverage``."""
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.heatmap(coverage.T, ax=ax, cmap='rocket', vmin=0, vmax=1, annot=True, fmt=".0%", annot_kws={"fontsize": 6},
+                cbar_kws={"format": PercentFormatter(1.0)})
+    ax.set_title(title)
+    ax.set_xlabel("Année")
+    ax.set_ylabel("")
+    return fig
+
+
+def draw_coefficients(table, title, figsize=(10, 5)):
+    """Coefficients et intervalles de ``whr.regression`` : barres pour un seul modèle, une courbe par facteur sinon."""
+    groups = table.index.get_level_values(0).unique()
+    fig, ax = plt.subplots(figsize=figsize)
+    if len(groups) == 1:
+        coef = table.loc[groups[0]]
+        y = np.arange(len(coef))
+        ax.barh(y, coef['coef'], color=sns.color_palette('viridis', len(coef)))
+        ax.errorbar(coef['coef'], y, xerr=[coef['coef'] - coef['ci_low'], coef['ci_high'] - coef['coef']],
+                    fmt='none', ecolor='#424242', elinewidth=1.5)
+        ax.set_yticks(y, coef.index)
+        ax.invert_yaxis()
+        ax.axvline(0, color='#424242', linewidth=0.8)
+        ax.set_xlabel("Coefficient standardisé")
+    else:
+        coef = table['coef'].unstack('factor')
+        low, high = table['ci_low'].unstack('factor'), table['ci_high'].unstack('factor')
+        x = np.arange(len(coef))
+        for factor, color in zip(coef.columns, sns.color_palette('tab10', coef.shape[1])):
+            ax.plot(x, coef[factor], marker='o', color=color, label=factor)
+            ax.fill_between(x, low[factor], high[factor], color=color, alpha=0.15)
+        ax.axhline(0, color='#424242', linewidth=0.8)
+        ax.set_xticks(x, coef.index)
+        ax.tick_params(axis='x', rotation=45)
+        ax.set_ylabel("Coefficient standardisé")
+        ax.legend(fontsize=7, loc='upper left', bbox_to_anchor=(1, 1))
+    ax.set_title(title)
+    return fig
+
+
+def draw_year_scatter(points, year, regions, xlim, ylim, xlabel, ylabel, figsize=(8, 5)):
+    """Nuage des pays d'une année coloré par région, depuis ``whr.animation.YearPoints``.
+
+    Axes et couleurs ne dépendent que de ``xlim``, ``ylim`` et ``regions`` :
+    la même figure sert à toutes les années (:func:`set_year_points`).
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    for region, color in zip(regions, sns.color_palette('tab10', len(regions))):
+        ax.scatter([], [], s=20, color=color, alpha=0.8, edgecolors='none', label=region)
+    ax.text(0.98, 0.04, "", transform=ax.transAxes, ha='right', va='bottom', fontsize=32, color='#c8c8c8')
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(fontsize=7, loc='upper left', bbox_to_anchor=(1, 1))
+    set_year_points(fig, points, year)
+    return fig
+
+
+def set_year_points(fig, points, year):
+    """Remplace les points et l'année d'une figure de :func:`draw_year_scatter`."""
+    ax = fig.axes[0]
+    for code, collection in enumerate(ax.collections):
+        selected = points['region'] == code
+        collection.set_offsets(np.column_stack([points['x'][selected], points['y'][selected]]))
+    ax.texts[0].set_text(str(year))
+
+
+# Cache partagé par toutes les sessions du processus serveur
+FIGURES = FigureCache()
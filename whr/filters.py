@@ -0,0 +1,108 @@
+"""Filtres région / pays / années du panel par index précalculés.
+
+:class:`PanelIndex` est construit une fois par version des données :
+
+- un ``MultiIndex`` trié ``(ISO-alpha3 Code, year)`` vers les positions des
+  lignes : les pays sélectionnés et l'intervalle d'années se résolvent par
+  recherche dichotomique (``get_locs``) ;
+- les positions des lignes de chaque région ;
+- les positions des lignes triées par année, découpées par intervalle.
+
+Un filtre est une intersection de tableaux de positions triés, sans
+parcours du panel. La clé peut aussi désigner une méthode de comblement des
+valeurs manquantes (``whr.imputation``) : les positions s'appliquent alors
+à la copie comblée du panel, qui a les mêmes lignes dans le même ordre. La vue filtrée est extraite une seule fois par
+combinaison de filtres puis partagée (cache LRU) ; les résultats qui en
+dérivent (agrégats, corrélations, figures) sont mis en cache sur la même
+clé.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from whr.imputation import cached_filled_panel
+
+
+def filter_key(regions=None, years=None, countries=None, fill=None):
+    """Clé hashable et indépendante de l'ordre de sélection pour un jeu de filtres.
+
+    ``fill`` est une méthode de ``whr.imputation.METHODS`` (None : données brutes).
+    """
+    return (tuple(sorted(regions or ())), tuple(years) if years else None, tuple(sorted(countries or ())), fill)
+
+
+NO_FILTER = filter_key()
+
+
+class PanelIndex:
+    """Index de positions du panel par (pays ISO, année), région et année."""
+
+    def __init__(self, panel):
+        iso = panel['ISO-alpha3 Code'].to_numpy(dtype=object)
+        year = panel['year'].to_numpy().astype(np.int64)
+        region = panel['Regional indicator'].to_numpy(dtype=object)
+        self.size = len(panel)
+
+        iso_codes, iso_values = pd.factorize(iso, sort=True)
+        order = np.lexsort((year, iso_codes))
+        self.keys = pd.MultiIndex.from_arrays([iso[order], year[order]], names=['ISO-alpha3 Code', 'year'])
+        self._key_positions = order
+
+        self._year_order = np.argsort(year, kind="stable")
+        self._years_sorted = year[self._year_order]
+
+        region_codes, region_values = pd.factorize(region, sort=True)
+        by_region = np.argsort(region_codes, kind="stable")
+        bounds = np.searchsorted(region_codes[by_region], np.arange(len(region_values) + 1))
+        self.regions = {r: by_region[bounds[i]:bounds[i + 1]] for i, r in enumerate(region_values)}
+        self.countries = set(iso_values)
+
+    def year_positions(self, first, last):
+        """Positions (triées) des lignes des années ``first`` à ``last`` incluses."""
+        lo = np.searchsorted(self._years_sorted, first, side="left")
+        hi = np.searchsorted(self._years_sorted, last, side="right")
+        return np.sort(self._year_order[lo:hi])
+
+    def country_positions(self, countries, years=None):
+        """Positions (triées) des lignes des pays ``countries`` (codes ISO), bornées aux années ``years``."""
+        countries = [c for c in countries if c in self.countries]
+        if not countries:
+            return np.empty(0, dtype=np.intp)
+        year_slice = slice(*years) if years else slice(None)
+        locs = self.keys.get_locs([countries, year_slice])
+        return np.sort(self._key_positions[locs])
+
+    def positions(self, regions=None, years=None, countries=None):
+        """Positions triées des lignes retenues par les filtres ; None si aucun filtre ne s'applique."""
+        selected = []
+        if countries:
+            selected.append(self.country_positions(countries, years))
+        elif years:
+            selected.append(self.year_positions(*years))
+        if regions:
+            parts = [self.regions[r] for r in regions if r in self.regions]
+            selected.append(np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp))
+        if not selected:
+            return None
+        result = selected[0]
+        for other in selected[1:]:
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+
+def apply(panel, index, key):
+    """Sous-ensemble du panel pour une clé de ``filter_key`` (le panel lui-même si aucun filtre)."""
+    regions, years, countries, _ = key
+    positions = index.positions(regions, years, countries)
+    return panel if positions is None else panel.iloc[positions]
+
+
+@functools.lru_cache(maxsize=64)
+def filtered_panel(version, key):
+    """Panel courant (ou sa copie comblée) filtré par ``key``, extrait une fois par combinaison ; ``version`` invalide le cache."""
+    from whr import registry
+
+    fill = key[3]
+    panel = registry.get("df_processed") if fill is None else cached_filled_panel(version, fill).panel
+    return apply(panel, registry.get("panel_index"), key)
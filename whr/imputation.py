@@ -0,0 +1,172 @@
+"""Comblement optionnel des valeurs manquantes du panel (mode d'analyse).
+
+Le panel prétraité garde ses valeurs manquantes (``whr.schema``) : ce module
+produit, à la demande, une copie comblée pour les analyses qui en ont
+besoin, sans jamais modifier le panel partagé. Méthodes (``METHODS``) :
+
+- ``linear`` : interpolation linéaire entre les deux observations du pays
+  qui encadrent le trou, au prorata des lignes ;
+- ``time``   : même chose au prorata des années (un trou de 2011 à 2014 ne
+  pèse pas comme deux années consécutives) ;
+- ``ffill``  : report de la dernière observation du pays sur au plus
+  ``limit`` lignes, puis de la suivante vers l'arrière sur au plus
+  ``limit`` lignes ;
+- ``median`` : médiane des observations de la même région la même année.
+
+Les interpolations ne comblent que l'intérieur de la série d'un pays, jamais
+avant sa première ni après sa dernière observation. Toutes les méthodes
+travaillent sur le panel trié par (code ISO, année), tous indicateurs à la
+fois : pour chaque cellule, la position de l'observation précédente et de
+la suivante dans le pays est obtenue par un maximum (minimum) cumulé des
+positions des cellules renseignées, borné au début (fin) du pays. Aucune
+boucle sur les pays.
+
+Chaque cellule comblée est marquée (:attr:`FilledPanel.flags`) : les pages
+peuvent afficher les données brutes ou comblées et distinguer les valeurs
+imputées. Le résultat est calculé une fois par version des données et par
+méthode (:func:`cached_filled_panel`). La méthode choisie dans la barre
+latérale fait partie de la clé de filtre (``whr.filters.filter_key``) : les
+pages d'analyse travaillent alors sur le panel comblé.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from whr.schema import INDICATORS
+
+# Méthode -> libellé affiché
+METHODS = {
+    'linear': "Interpolation linéaire",
+    'time': "Interpolation selon l'année",
+    'ffill': "Report borné de la valeur voisine",
+    'median': "Médiane région-année",
+}
+
+# Nombre maximal de lignes comblées de part et d'autre d'une observation (méthode ``ffill``)
+DEFAULT_LIMIT = 2
+
+
+class FilledPanel:
+    """Panel comblé par une méthode de ``METHODS`` et marques des cellules comblées.
+
+    ``panel`` a les lignes, l'index et les types du panel d'origine ;
+    ``flags`` est un DataFrame booléen (mêmes index, colonnes ``INDICATORS``)
+    vrai pour chaque cellule manquante à l'origine et comblée.
+    """
+
+    def __init__(self, raw, panel, flags, method):
+        self.raw = raw
+        self.panel = panel
+        self.flags = flags
+        self.method = method
+
+    @property
+    def counts(self):
+        """Nombre de cellules comblées par indicateur."""
+        return self.flags.sum().rename('Filled')
+
+    @property
+    def total(self):
+        return int(self.flags.to_numpy().sum())
+
+    def view(self, filled=True):
+        """Panel comblé, ou brut si ``filled`` est faux."""
+        return self.panel if filled else self.raw
+
+
+def _country_order(panel):
+    """Ordre (code ISO, année) des lignes, années triées, et bornes [début, fin] du pays de chaque ligne triée."""
+    iso = pd.factorize(panel['ISO-alpha3 Code'])[0]
+    year = panel['year'].to_numpy().astype(np.int64)
+    order = np.lexsort((year, iso))
+    iso = iso[order]
+    n = len(order)
+    idx = np.arange(n, dtype=np.int32)
+    first = np.r_[True, iso[1:] != iso[:-1]] if n else np.zeros(0, dtype=bool)
+    last = np.r_[iso[1:] != iso[:-1], True] if n else np.zeros(0, dtype=bool)
+    start = np.maximum.accumulate(np.where(first, idx, 0)) if n else idx
+    end = np.minimum.accumulate(np.where(last, idx, n)[::-1])[::-1] if n else idx
+    return order, year[order], start, end
+
+
+def _neighbours(valid, start, end):
+    """Positions de l'observation précédente et suivante du même pays (``-1`` si aucune), indicateur par indicateur.
+
+    ``valid`` est une matrice (indicateurs, lignes triées) : les cumuls se font
+    sur des lignes contiguës en mémoire.
+    """
+    n = valid.shape[1]
+    idx = np.arange(n, dtype=np.int32)
+    prev = np.maximum.accumulate(np.where(valid, idx, -1), axis=1)
+    nxt = np.minimum.accumulate(np.where(valid, idx, n)[:, ::-1], axis=1)[:, ::-1]
+    prev[prev < start] = -1
+    nxt[nxt > end] = -1
+    return prev, nxt
+
+
+def _interpolate(values, prev, nxt, axis):
+    """Interpolation linéaire des cellules manquantes encadrées, au prorata de ``axis`` (positions ou années)."""
+    out = np.full(values.shape, np.nan)
+    row, col = np.nonzero(np.isnan(values) & (prev >= 0) & (nxt >= 0))
+    p, q = prev[row, col], nxt[row, col]
+    before, after = values[row, p], values[row, q]
+    out[row, col] = before + (axis[col] - axis[p]) / (axis[q] - axis[p]) * (after - before)
+    return out
+
+
+def _carry(values, prev, nxt, limit):
+    """Report de la valeur précédente (puis suivante) du pays sur au plus ``limit`` lignes."""
+    out = np.full(values.shape, np.nan)
+    row, col = np.nonzero(np.isnan(values))
+    p, q = prev[row, col], nxt[row, col]
+    forward = (p >= 0) & (col - p <= limit)
+    backward = ~forward & (q >= 0) & (q - col <= limit)
+    out[row[forward], col[forward]] = values[row[forward], p[forward]]
+    out[row[backward], col[backward]] = values[row[backward], q[backward]]
+    return out
+
+
+def _region_year_median(panel, values):
+    """Médiane des observations de chaque (région, année), diffusée à ses lignes (NaN sans région)."""
+    keys = [pd.factorize(panel['Regional indicator'])[0], panel['year'].to_numpy()]
+    frame = pd.DataFrame(values)
+    medians = frame.groupby(keys).transform('median').to_numpy()
+    return np.where((keys[0] >= 0)[:, None], medians, np.nan)
+
+
+def fill_gaps(panel, method='linear', limit=DEFAULT_LIMIT, indicators=INDICATORS):
+    """Copie comblée de ``panel`` par ``method`` (clé de ``METHODS``) ; retourne un :class:`FilledPanel`."""
+    if method not in METHODS:
+        raise ValueError(f"Méthode de comblement inconnue : {method!r} (disponibles : {', '.join(METHODS)})")
+    values = panel[indicators].to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+
+    if method == 'median':
+        candidates = _region_year_median(panel, values)
+    else:
+        order, year, start, end = _country_order(panel)
+        # Une ligne de matrice par indicateur, colonnes dans l'ordre (code ISO, année)
+        sorted_values = np.ascontiguousarray(values[order].T)
+        prev, nxt = _neighbours(~np.isnan(sorted_values), start, end)
+        if method == 'ffill':
+            filled = _carry(sorted_values, prev, nxt, limit)
+        else:
+            axis = year.astype(np.float64) if method == 'time' else np.arange(len(order), dtype=np.float64)
+            filled = _interpolate(sorted_values, prev, nxt, axis)
+        candidates = np.empty_like(values)
+        candidates[order] = filled.T
+
+    flags = missing & ~np.isnan(candidates)
+    values = np.where(flags, candidates, values)
+    # Mêmes types que le panel d'origine (float32 des indicateurs, catégories conservées)
+    result = panel.assign(**{col: values[:, j].astype(panel[col].dtype) for j, col in enumerate(indicators)})
+    return FilledPanel(panel, result, pd.DataFrame(flags, index=panel.index, columns=indicators), method)
+
+
+@functools.lru_cache(maxsize=16)
+def cached_filled_panel(version, method, limit=DEFAULT_LIMIT):
+    """Panel courant comblé par ``method`` ; ``version`` invalide le cache."""
+    from whr import registry
+
+    return fill_gaps(registry.get("df_processed"), method, limit)
@@ -0,0 +1,187 @@
+"""Ingestion des fichiers sources vers des artefacts Parquet typés.
+
+Chaque source déclarée dans ``whr.sources`` est validée contre son schéma
+(colonnes présentes, types convertibles), réduite aux colonnes et aux lignes
+utiles, puis écrite en Parquet dans ``ARTIFACTS_DIR``. Un ``manifest.json``
+enregistre pour chaque artefact l'empreinte du fichier source et le schéma
+appliqué : l'application ne relit que les artefacts à jour et ne reparse un
+fichier Excel ou le CSV de l'OMS que si la source ou son schéma a changé.
+Les sources à reconstruire sont converties en parallèle dans un pool de
+processus (le parsing Excel d'openpyxl ne libère pas le GIL) : la durée est
+celle du fichier le plus long, non la somme.
+
+Exécutable seul ou au build du conteneur :
+    python -m whr.ingest              # toutes les sources
+    python -m whr.ingest gdp life     # certaines sources seulement
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from whr import storage
+from whr.sources import SOURCES
+
+ARTIFACTS_DIR = os.environ.get("WHR_ARTIFACTS_DIR", os.path.join(".cache", "artifacts"))
+MANIFEST_FILE = "manifest.json"
+
+
+class SchemaError(ValueError):
+    """Un fichier source ne correspond plus au schéma déclaré."""
+
+
+def _read_header(source):
+    if source.is_excel:
+        return list(pd.read_excel(source.path, nrows=0).columns)
+    return list(pd.read_csv(source.path, sep=source.sep, nrows=0).columns)
+
+
+def validate_columns(source):
+    found = _read_header(source)
+    missing = [col for col in source.columns if col not in found]
+    if missing:
+        raise SchemaError(
+            f"Source '{source.name}' ({source.path}) : colonne(s) attendue(s) absente(s) {missing}. "
+            f"Colonnes trouvées : {found}"
+        )
+
+
+def _read_raw(source):
+    usecols = list(source.columns)
+    if source.is_excel:
+        return pd.read_excel(source.path, usecols=usecols)
+    return pd.read_csv(source.path, sep=source.sep, usecols=usecols)
+
+
+def _apply_schema(source, frame):
+    for col, value in source.row_filter.items():
+        frame = frame.loc[frame[col] == value]
+    frame = frame.reset_index(drop=True)
+    for col, dtype in source.columns.items():
+        try:
+            frame[col] = frame[col].astype(dtype)
+        except (TypeError, ValueError) as exc:
+            raise SchemaError(
+                f"Source '{source.name}' ({source.path}) : colonne {col!r} non convertible en {dtype} ({exc})"
+            ) from exc
+    return frame
+
+
+def _manifest_entry(source):
+    return {
+        "source": source.path,
+        "sha256": storage.file_digest(source.path),
+        "columns": source.columns,
+        "row_filter": source.row_filter,
+        "artifact": f"{source.name}.parquet",
+    }
+
+
+def read_manifest(artifacts_dir=None):
+    path = os.path.join(artifacts_dir or ARTIFACTS_DIR, MANIFEST_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_fresh(entry, source, artifacts_dir):
+    if not entry:
+        return False
+    expected = _manifest_entry(source)
+    return (all(entry.get(k) == v for k, v in expected.items())
+            and os.path.exists(os.path.join(artifacts_dir, entry["artifact"])))
+
+
+def _convert(name, artifacts_dir):
+    """Valide et convertit une source en artefact Parquet ; retourne son entrée de manifest."""
+    source = SOURCES[name]
+    start = time.perf_counter()
+    validate_columns(source)
+    frame = _apply_schema(source, _read_raw(source))
+    entry = _manifest_entry(source)
+    with storage.atomic_path(os.path.join(artifacts_dir, entry["artifact"])) as tmp:
+        frame.to_parquet(tmp, index=False)
+    entry.update(rows=len(frame), seconds=round(time.perf_counter() - start, 3))
+    return entry
+
+
+def stale_sources(names=None, artifacts_dir=None):
+    """Sources dont l'artefact est absent ou périmé."""
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    manifest = read_manifest(artifacts_dir)
+    return [name for name in (names or SOURCES) if not _is_fresh(manifest.get(name), SOURCES[name], artifacts_dir)]
+
+
+def ingest(names=None, artifacts_dir=None, force=False, jobs=None):
+    """Ingère les sources ``names`` (toutes par défaut) et retourne le manifest.
+
+    Les sources à convertir le sont dans ``jobs`` processus (défaut : une par
+    source, au plus le nombre de cœurs) ; ``jobs=1`` convertit en séquence.
+    """
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    os.makedirs(artifacts_dir, exist_ok=True)
+    names = list(names or SOURCES)
+
+    with storage.file_lock(os.path.join(artifacts_dir, "ingest.lock")):
+        manifest = read_manifest(artifacts_dir)
+        todo = names if force else stale_sources(names, artifacts_dir)
+        jobs = min(len(todo), jobs or os.cpu_count() or 1)
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                # Le plus gros fichier d'abord : il borne la durée totale
+                todo = sorted(todo, key=lambda name: os.path.getsize(SOURCES[name].path), reverse=True)
+                manifest.update(zip(todo, pool.map(_convert, todo, [artifacts_dir] * len(todo))))
+        else:
+            for name in todo:
+                manifest[name] = _convert(name, artifacts_dir)
+        if not todo:
+            return manifest
+
+        with storage.atomic_path(os.path.join(artifacts_dir, MANIFEST_FILE)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def read_source(name, artifacts_dir=None):
+    """Lit l'artefact de la source ``name``, en le (re)construisant s'il n'est pas à jour."""
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    source = SOURCES[name]
+    entry = read_manifest(artifacts_dir).get(name)
+    if not _is_fresh(entry, source, artifacts_dir):
+        entry = ingest([name], artifacts_dir)[name]
+    return pd.read_parquet(os.path.join(artifacts_dir, entry["artifact"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convertit les fichiers sources en artefacts Parquet typés.")
+    parser.add_argument("sources", nargs="*", metavar="SOURCE",
+                        help=f"sources à ingérer parmi {', '.join(SOURCES)} (toutes par défaut)")
+    parser.add_argument("--artifacts-dir", default=ARTIFACTS_DIR)
+    parser.add_argument("--force", action="store_true", help="réingère même les artefacts à jour")
+    parser.add_argument("--jobs", type=int, default=None, help="processus de conversion (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.sources if name not in SOURCES]
+    if unknown:
+        parser.error(f"source(s) inconnue(s) : {', '.join(unknown)}")
+
+    try:
+        manifest = ingest(args.sources or None, args.artifacts_dir, force=args.force, jobs=args.jobs)
+    except SchemaError as exc:
+        print(f"Erreur de schéma : {exc}", file=sys.stderr)
+        return 1
+
+    for name in args.sources or SOURCES:
+        entry = manifest[name]
+        print(f"{name:<10} {entry['rows']:>7} lignes  {len(entry['columns']):>3} colonnes  -> {entry['artifact']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Clés de jointure entières du panel.
+
+Un couple (année, pays) est codé par un entier ``year * n + code``, où
+``code`` est la position du pays dans la table triée des ``n`` codes ISO3
+du référentiel (``whr.countries``). Les jointures se font ainsi sur des
+entiers et non sur des chaînes ``"année-pays"``, et l'ordre des clés est
+celui de (année, code ISO).
+"""
+import numpy as np
+
+MISSING_KEY = -1
+
+
+def pack(year, codes, size):
+    """Clé entière de chaque couple (année, code pays) ; ``MISSING_KEY`` si le code est négatif (pays non résolu)."""
+    codes = np.asarray(codes, dtype=np.int64)
+    key = np.asarray(year, dtype=np.int64) * size + codes
+    return np.where(codes >= 0, key, MISSING_KEY)
+
+
+def unpack(key, size):
+    """Retourne ``(year, code)`` à partir des clés produites par :func:`pack`."""
+    key = np.asarray(key, dtype=np.int64)
+    year, code = np.divmod(key, size)
+    return year.astype(np.int16), code.astype(np.int32)
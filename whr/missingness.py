@@ -0,0 +1,90 @@
+"""Profil des valeurs manquantes d'un jeu de données (page "Pré Processing").
+
+:class:`MissingProfile` est construit une fois par jeu de données et par
+version des données, à partir d'un seul masque des valeurs manquantes :
+
+- le nombre de valeurs manquantes par colonne (comptage des bits du masque
+  compacté par ``np.packbits``) et au total ;
+- le nombre de valeurs manquantes par année, par pays et par région
+  (``np.bincount`` sur les cellules manquantes, sans boucle sur les groupes) ;
+- une carte de bits pays x année x indicateur : un bit par indicateur
+  renseigné, deux octets par couple (pays, année) pour neuf indicateurs. Un
+  couple absent du jeu de données a tous ses bits à 0.
+
+La page s'affiche ensuite depuis le profil, sans parcourir les DataFrames à
+chaque ré-exécution.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+# Nombre de bits à 1 de chaque octet
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _group_counts(mask, values, columns, name):
+    """Valeurs manquantes par groupe (lignes) et par colonne ; NaN forme un groupe comme les autres."""
+    codes, labels = pd.factorize(np.asarray(values, dtype=object), sort=True, use_na_sentinel=False)
+    n_cols = mask.shape[1]
+    cells = (codes[:, None] * n_cols + np.arange(n_cols))[mask]
+    counts = np.bincount(cells, minlength=len(labels) * n_cols).reshape(len(labels), n_cols)
+    return pd.DataFrame(counts, index=pd.Index(labels, name=name), columns=columns)
+
+
+class MissingProfile:
+    """Comptes de valeurs manquantes et carte de présence pays x année x indicateur d'un jeu de données."""
+
+    def __init__(self, frame, year='year', country='Country name', region='Regional indicator'):
+        columns = list(frame.columns)
+        mask = frame.isna().to_numpy()
+        self.rows, self.n_columns = mask.shape
+        self.cells = mask.size
+        self.by_column = pd.Series(_POPCOUNT[np.packbits(mask, axis=0)].sum(axis=0, dtype=np.int64),
+                                   index=pd.Index(columns, name='Column'), name='NaN Count')
+        self.total = int(self.by_column.sum())
+
+        def grouped(name):
+            return _group_counts(mask, frame[name].to_numpy(), columns, name) if name in frame.columns else None
+
+        self.by_year = grouped(year)
+        self.by_country = grouped(country)
+        self.by_region = grouped(region)
+
+        # Carte de présence des indicateurs (colonnes numériques hors année) par (pays, année)
+        self.indicators = [c for c in frame.select_dtypes("number").columns if c != year]
+        self.countries = self.years = self.bitmap = None
+        if year in frame.columns and country in frame.columns:
+            self._build_bitmap(frame, mask, columns, year, country)
+
+    def _build_bitmap(self, frame, mask, columns, year, country):
+        keep = frame[year].notna().to_numpy() & frame[country].notna().to_numpy()
+        country_codes, self.countries = pd.factorize(frame[country].to_numpy()[keep], sort=True)
+        year_codes, self.years = pd.factorize(frame[year].to_numpy()[keep], sort=True)
+        present = ~mask[keep][:, [columns.index(c) for c in self.indicators]]
+        packed = np.packbits(present, axis=1, bitorder='little')
+        self.bitmap = np.zeros((len(self.countries), len(self.years), packed.shape[1]), dtype=np.uint8)
+        # OU bit à bit : une ligne en double complète la présence au lieu de l'écraser
+        np.bitwise_or.at(self.bitmap, (country_codes, year_codes), packed)
+
+    @property
+    def share(self):
+        """Part des cellules manquantes (0 à 1)."""
+        return self.total / self.cells if self.cells else 0.0
+
+    def presence(self):
+        """Cube booléen (pays, années, indicateurs) : True si l'indicateur est renseigné."""
+        return np.unpackbits(self.bitmap, axis=2, count=len(self.indicators), bitorder='little').astype(bool)
+
+    def coverage(self):
+        """Part des pays renseignés par année et indicateur (années en lignes)."""
+        share = self.presence().mean(axis=0) if len(self.countries) else np.zeros((0, len(self.indicators)))
+        return pd.DataFrame(share, index=pd.Index(self.years, name='year'), columns=self.indicators)
+
+
+@functools.lru_cache(maxsize=16)
+def cached_missing_profile(version, dataset):
+    """Profil des valeurs manquantes du jeu ``dataset`` (``whr.registry``) ; ``version`` invalide le cache."""
+    from whr import registry
+
+    return MissingProfile(registry.get(dataset))
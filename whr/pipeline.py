@@ -0,0 +1,180 @@
+"""Chargement et prétraitement des données du World Happiness Report.
+
+Ce module ne dépend pas de Streamlit : il est utilisé par l'application
+comme par les outils en ligne de commande. Les sources sont lues depuis les
+artefacts typés produits par ``whr.ingest``.
+
+Les six sources sont chargées en parallèle : les artefacts périmés sont
+reconvertis dans un pool de processus, puis tous sont lus dans un pool de
+threads. Chaque étape n'attend que ses propres entrées : les données de
+l'OMS continuent de se charger pendant l'assemblage du panel.
+
+Chaque source est d'abord rattachée aux codes ISO3 du référentiel
+(``whr.countries``) ; les lignes du panel sont ensuite assemblées sur des
+clés entières (année, pays), sans jointure sur des noms.
+
+``build_panel`` ne fait que des opérations pays par pays : appliqué aux
+lignes de quelques pays, il produit exactement leurs lignes du panel
+complet. ``whr.delta`` s'en sert
+pour la mise à jour incrémentale.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from whr import countries, keys, schema, tracing
+from whr.ingest import ingest, read_source
+from whr.schema import INDICATORS
+from whr.sources import RELEASES, SOURCES
+
+# A incrémenter à chaque modification du traitement : invalide les snapshots sur disque
+PIPELINE_VERSION = 5
+
+
+def merge_id_base(ID, df):
+    """Fusionne la base continue Id -> Année & pays avec les données WHR 2005-2020.
+
+    Version texte (jointure sur ``id``) utilisée pour l'affichage de l'étape
+    intermédiaire sur la page "Pré Processing des données".
+    """
+    merge_df = ID.merge(df, on='id', how='outer')
+    merge_df = merge_df.drop(columns=['Country name_y', 'year_y'])
+    merge_df = merge_df.rename(columns={'year_x': 'year', 'Country name_x': 'Country name'})
+    return merge_df
+
+
+def load_and_preprocess_data(parallel=True):
+    """Construit le panel final à partir des six fichiers sources.
+
+    Toutes les jointures se font sur des clés entières (année, pays) construites
+    par ``whr.keys`` ; les identifiants texte ``id`` ne sont produits qu'à la fin,
+    pour l'affichage. Retourne le couple ``(df_processed, df_original)``.
+    Chaque étape est tracée par ``whr.tracing``. ``parallel=False`` charge les
+    sources l'une après l'autre (référence de comparaison).
+    """
+    with tracing.span("load_and_preprocess_data") as sp:
+        with tracing.span("ingest"):
+            ingest(jobs=None if parallel else 1)  # sans effet si les artefacts sont à jour
+        with ThreadPoolExecutor(max_workers=len(SOURCES) if parallel else 1) as pool:
+            futures = {name: pool.submit(read_source, name) for name in SOURCES}
+            df_processed = build_panel(lambda name: futures[name].result())
+        df_original = original_frame(futures['whr'].result())
+        sp.rows_out = len(df_processed)
+    return df_processed, df_original
+
+
+def original_frame(df):
+    """Données WHR 2005-2020 brutes avec ``year`` en texte et l'identifiant ``id`` (année-pays)."""
+    # Identifiants texte, construits une seule fois pour l'affichage
+    df = df.copy()
+    df['year'] = df['year'].astype('str')
+    df['id'] = df['year'] + "-" + df['Country name']
+    return df
+
+
+def _fill(target, rows, key, values):
+    """Complète les cases NaN de ``target`` (une par clé de ``rows``) par ``values`` aux clés ``key``.
+
+    Les clés absentes de ``rows`` sont ignorées ; une clé en double dans la
+    source garde sa première valeur. Retourne le nombre de cases complétées.
+    """
+    pos = rows.get_indexer(key)
+    keep = (pos >= 0) & ~pd.Index(key).duplicated()
+    pos, values = pos[keep], np.asarray(values, dtype=np.float64)[keep]
+    empty = np.isnan(target[pos])
+    target[pos[empty]] = values[empty]
+    return int(empty.sum())
+
+
+def build_panel(source):
+    """Panel prétraité à partir des sources ; ``source(name)`` retourne le DataFrame de la source ``name``.
+
+    Les lignes sont triées par (année, pays) avec un index 0..n-1, colonnes
+    et types selon ``whr.schema.PANEL_SCHEMA``.
+    """
+    # Initial Load (l'OMS continue de se charger)
+    with tracing.span("initial_load") as sp:
+        df = source('whr')
+        ID = source('id_base')
+        GDP = source('gdp')
+        releases = [(s, source(s.name)) for s in RELEASES]
+        sp.rows_out = len(df) + len(ID) + len(GDP) + sum(len(r) for _, r in releases)
+
+    # Chaque source est rattachée à un code ISO3 du référentiel avant toute jointure
+    with tracing.span("resolve_countries", rows_in=len(ID) + len(df) + sum(len(r) for _, r in releases)) as sp:
+        table = countries.CountryTable.from_sources(ID, GDP)
+        n = len(table)
+        id_key = keys.pack(ID['year'], table.resolve(ID['Country name'], 'id_base'), n)
+        whr_key = keys.pack(df['year'], table.resolve(df['Country name'], 'whr'), n)
+        release_keys = [keys.pack(np.full(len(r), s.release), table.resolve(r['Country name'], s.name), n)
+                        for s, r in releases]
+        table.warn_unresolved()
+        sp.rows_out = n
+
+    # Lignes du panel : couples (année, pays) de la base Id et des rapports, une seule fois chacun
+    with tracing.span("assemble", rows_in=len(id_key) + len(whr_key) + sum(map(len, release_keys))) as sp:
+        rows = np.unique(np.concatenate([id_key, whr_key, *release_keys]))
+        rows = pd.Index(rows[rows != keys.MISSING_KEY])
+        values = {col: np.full(len(rows), np.nan) for col in INDICATORS}
+        whr = df.rename(columns={
+            'Log GDP per capita': 'Logged GDP per capita',
+            'Healthy life expectancy at birth': 'Healthy life expectancy'
+        })
+        for col in INDICATORS:
+            _fill(values[col], rows, whr_key, whr[col])
+
+        # Fill NaN from new data : rapports annuels (2020, 2021...), du plus récent au plus ancien
+        for (s, release), key in zip(releases, release_keys):
+            _fill(values['Life Ladder'], rows, key, release['Ladder score'])
+            for col in ['Logged GDP per capita', 'Social support', 'Healthy life expectancy',
+                        'Freedom to make life choices', 'Generosity', 'Perceptions of corruption']:
+                _fill(values[col], rows, key, release[col])
+        sp.rows_out = len(rows)
+
+    # Load Life Expectancy data (clé (année, ISO))
+    # Seules les lignes 'Both sexes' et les colonnes utiles de l'OMS sont conservées à l'ingestion
+    with tracing.span("load_life") as sp:
+        Life = source('life')
+        sp.rows_out = len(Life)
+
+    # Merge GDP & Life Expectancy data (sources désignant les pays par code ; codes hors panel ignorés)
+    # rows_out : cases du panel complétées par la source
+    with tracing.span("merge_gdp", rows_in=len(GDP)) as sp:
+        sp.rows_out = _fill(values['Logged GDP per capita'], rows,
+                            keys.pack(GDP['Time'], table.resolve(GDP['Country Code']), n), GDP['LN'])
+    with tracing.span("merge_life", rows_in=len(Life)) as sp:
+        sp.rows_out = _fill(values['Healthy life expectancy'], rows,
+                            keys.pack(Life['Period'], table.resolve(Life['SpatialDimValueCode']), n),
+                            Life['FactValueNumeric'])
+
+    # Région de chaque pays : premier rapport annuel qui la donne, sinon whr.countries.REGIONS
+    with tracing.span("regions", rows_in=len(rows)):
+        region = np.full(n, None, dtype=object)
+        # Du plus récent au plus ancien : le plus ancien écrit en dernier
+        for (s, release), key in zip(releases, release_keys):
+            code = keys.unpack(key, n)[1]
+            known = (key != keys.MISSING_KEY) & release['Regional indicator'].notna().to_numpy()
+            region[code[known]] = release['Regional indicator'].to_numpy(dtype=object)[known]
+        overrides = table.codes.get_indexer(list(countries.REGIONS))
+        missing = np.array([r is None for r in region], dtype=bool)
+        for pos, value in zip(overrides, countries.REGIONS.values()):
+            if pos >= 0 and missing[pos]:
+                region[pos] = value
+
+    # Drop rows that are entirely NaN in relevant columns (couples de la base Id sans aucune donnée)
+    with tracing.span("drop_nan", rows_in=len(rows)) as sp:
+        year, code = keys.unpack(rows.to_numpy(), n)
+        panel = pd.DataFrame({
+            'year': year,
+            'Country name': table.names[code],
+            'ISO-alpha3 Code': table.codes.to_numpy(dtype=object)[code],
+            'Regional indicator': region[code],
+            **values,
+        })
+        panel = panel.loc[~panel[INDICATORS].isna().all(axis=1)]
+        sp.rows_out = len(panel)
+
+    # Types compacts déclarés dans whr/schema.py (id calculé à la demande pour l'affichage)
+    panel = panel.sort_values(['year', 'Country name'], kind='stable')
+    return schema.enforce(panel).reset_index(drop=True)
@@ -0,0 +1,144 @@
+"""Classements des pays par indicateur, année et région (page "Classements").
+
+:class:`RankTables` est construit une fois par version des données. Les
+valeurs du panel sont rangées dans un cube (indicateur, année, pays), puis
+classées en un seul ``np.argsort`` par périmètre (monde entier et chaque
+région) pour toutes les années et tous les indicateurs à la fois. On garde :
+
+- l'ordre des pays de chaque (périmètre, indicateur, année), valeur la plus
+  élevée en tête, pays sans valeur en fin ;
+- le rang dense de chaque pays (1 = valeur la plus élevée, ex aequo au même
+  rang, 0 = non classé) et le nombre de pays classés.
+
+Les N premiers et N derniers sont des tranches de l'ordre, le rang d'un pays
+une lecture, les plus fortes progressions entre deux années une différence
+de deux vecteurs de rangs suivie d'un ``np.argpartition`` : aucune requête
+ne trie le panel.
+
+Les tables suivent les filtres communs des pages d'analyse : elles sont
+construites une fois par version des données et clé de filtre
+(:func:`cached_rank_tables`), sur les pays et années retenus.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import NO_FILTER, filtered_panel
+from whr.pipeline import INDICATORS
+
+# Rang des pays sans valeur pour l'indicateur et l'année
+UNRANKED = 0
+
+
+class RankTables:
+    """Ordres et rangs denses des pays par (périmètre, indicateur, année)."""
+
+    def __init__(self, panel, indicators=INDICATORS):
+        panel = panel.dropna(subset=['ISO-alpha3 Code'])
+        year = panel['year'].to_numpy().astype(np.int64)
+        self.indicators = list(indicators)
+        self.years = np.unique(year)
+        country_codes, self.countries = pd.factorize(panel['ISO-alpha3 Code'].to_numpy(), sort=True)
+
+        # Nom et région les plus récents de chaque pays
+        latest = panel.assign(year=year).sort_values('year', kind='stable').groupby('ISO-alpha3 Code')
+        self.names = latest['Country name'].last().reindex(self.countries).to_numpy()
+        region = latest['Regional indicator'].last().reindex(self.countries)
+        region_codes, self.regions = pd.factorize(region.to_numpy(), sort=True)
+
+        values = np.full((len(self.indicators), len(self.years), len(self.countries)), np.nan)
+        values[:, np.searchsorted(self.years, year), country_codes] = panel[self.indicators].to_numpy(np.float64).T
+
+        # Périmètre 0 : tous les pays ; périmètre r + 1 : pays de la région r
+        members = np.vstack([np.ones(len(self.countries), dtype=bool),
+                             region_codes[None, :] == np.arange(len(self.regions))[:, None]])
+        scoped = np.where(members[:, None, None, :], values[None], np.nan)
+
+        # Tri décroissant, NaN en fin ; rang dense : +1 à chaque changement de valeur dans l'ordre
+        self.order = np.argsort(-scoped, axis=-1, kind='stable')
+        ordered = np.take_along_axis(scoped, self.order, axis=-1)
+        step = np.ones(ordered.shape, dtype=np.int32)
+        step[..., 1:] = ordered[..., 1:] != ordered[..., :-1]
+        self.ranks = np.empty(ordered.shape, dtype=np.int32)
+        np.put_along_axis(self.ranks, self.order, np.cumsum(step, axis=-1, dtype=np.int32), axis=-1)
+        present = ~np.isnan(scoped)
+        self.ranks[~present] = UNRANKED
+        self.counts = present.sum(axis=-1)
+        self.values = values
+
+        self._country_pos = {iso: i for i, iso in enumerate(self.countries)}
+        self._region_pos = {r: i + 1 for i, r in enumerate(self.regions)}
+        self._indicator_pos = {ind: i for i, ind in enumerate(self.indicators)}
+
+    def _cell(self, indicator, year, region=None):
+        scope = 0 if region is None else self._region_pos[region]
+        return scope, self._indicator_pos[indicator], int(np.searchsorted(self.years, int(year)))
+
+    def _frame(self, positions, scope, i, y):
+        return pd.DataFrame({
+            'Rang': self.ranks[scope, i, y, positions],
+            'Pays': self.names[positions],
+            'ISO-alpha3 Code': self.countries[positions],
+            self.indicators[i]: self.values[i, y, positions],
+        })
+
+    def top(self, indicator, year, n=10, region=None):
+        """Les ``n`` pays aux valeurs les plus élevées, du premier au ``n``-ième."""
+        scope, i, y = self._cell(indicator, year, region)
+        positions = self.order[scope, i, y, :min(n, self.counts[scope, i, y])]
+        return self._frame(positions, scope, i, y)
+
+    def bottom(self, indicator, year, n=10, region=None):
+        """Les ``n`` pays aux valeurs les plus faibles, du dernier classé au ``n``-ième avant lui."""
+        scope, i, y = self._cell(indicator, year, region)
+        count = self.counts[scope, i, y]
+        positions = self.order[scope, i, y, max(count - n, 0):count][::-1]
+        return self._frame(positions, scope, i, y)
+
+    def rank(self, country, indicator, year, region=None):
+        """``(rang, nombre de pays classés)`` du pays ``country`` (code ISO) ; rang ``UNRANKED`` sans valeur."""
+        scope, i, y = self._cell(indicator, year, region)
+        pos = self._country_pos.get(country)
+        rank = UNRANKED if pos is None else int(self.ranks[scope, i, y, pos])
+        return rank, int(self.counts[scope, i, y])
+
+    def movers(self, indicator, first, last, n=10, region=None):
+        """Plus fortes progressions et reculs de rang entre les années ``first`` et ``last``.
+
+        Retourne ``(gains, pertes)`` : ``n`` pays classés les deux années,
+        triés par nombre de places gagnées (ou perdues).
+        """
+        scope, i, a = self._cell(indicator, first, region)
+        b = self._cell(indicator, last, region)[2]
+        before, after = self.ranks[scope, i, a], self.ranks[scope, i, b]
+        both = np.flatnonzero((before != UNRANKED) & (after != UNRANKED))
+        change = before[both].astype(np.int64) - after[both]
+
+        def pick(score):
+            k = min(n, len(both))
+            if k == 0:
+                return both[:0]
+            best = np.argpartition(-score, k - 1)[:k]
+            return both[best[np.lexsort((self.names[both[best]], -score[best]))]]
+
+        def frame(positions):
+            return pd.DataFrame({
+                'Pays': self.names[positions],
+                'ISO-alpha3 Code': self.countries[positions],
+                f'Rang {first}': before[positions],
+                f'Rang {last}': after[positions],
+                'Places gagnées': before[positions].astype(np.int64) - after[positions],
+            })
+
+        return frame(pick(change)), frame(pick(-change))
+
+
+@functools.lru_cache(maxsize=32)
+def cached_rank_tables(version, key):
+    """Classements du panel filtré par ``key`` (``whr.filters``) ; ``version`` invalide le cache."""
+    from whr import registry
+
+    if key == NO_FILTER:
+        return registry.get("rankings")
+    return RankTables(filtered_panel(version, key))
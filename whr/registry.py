@@ -0,0 +1,163 @@
+"""Registre des jeux de données partagés par toutes les sessions.
+
+Streamlit ré-exécute le script principal à chaque interaction, mais les
+modules importés restent en mémoire pour toute la durée du processus
+serveur. Chaque jeu de données déclaré ici est donc chargé au plus une fois
+par processus, à la première demande, puis partagé par toutes les sessions
+(même sémantique que ``st.cache_resource``, sans dépendre de Streamlit pour
+les outils en ligne de commande).
+
+Les objets retournés sont partagés : ils ne doivent jamais être modifiés en
+place. Avec le copy-on-write de pandas, toute transformation (filtre,
+sélection de colonnes, ``rename``...) produit un nouvel objet sans toucher
+à l'original.
+
+Les modules de calcul (pandas, pyarrow...) ne sont importés que par les
+fonctions de chargement : importer le registre ne coûte rien à une page qui
+ne lit aucune donnée.
+"""
+import threading
+
+from whr import tracing
+
+_LOADERS = {}
+_DATASETS = {}
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def dataset(name):
+    """Décorateur déclarant la fonction de chargement du jeu de données ``name``."""
+    def decorator(loader):
+        _LOADERS[name] = loader
+        return loader
+    return decorator
+
+
+def names():
+    return tuple(_LOADERS)
+
+
+def is_loaded(name):
+    return name in _DATASETS
+
+
+def get(name):
+    """Retourne le jeu de données ``name``, chargé au premier appel seulement."""
+    try:
+        return _DATASETS[name]
+    except KeyError:
+        pass
+    if name not in _LOADERS:
+        raise KeyError(f"Jeu de données inconnu : {name!r} (disponibles : {', '.join(_LOADERS)})")
+    with _LOCKS_GUARD:
+        lock = _LOCKS.setdefault(name, threading.Lock())
+    # Un verrou par jeu de données : deux sessions simultanées ne le chargent pas deux fois,
+    # et le chargement d'un jeu peut demander ses dépendances sans interblocage.
+    with lock:
+        if name not in _DATASETS:
+            with tracing.span(f"dataset:{name}", cat="dataset"):
+                _DATASETS[name] = _LOADERS[name]()
+    return _DATASETS[name]
+
+
+def clear():
+    """Oublie tous les jeux de données chargés (rechargés à la prochaine demande)."""
+    with _LOCKS_GUARD:
+        _DATASETS.clear()
+
+
+# --- Jeux de données bruts ---
+
+@dataset("whr_2005_2020")
+def _load_whr_2005_2020():
+    from whr.ingest import read_source
+    return read_source('whr')
+
+
+@dataset("whr_2021")
+def _load_whr_2021():
+    from whr.ingest import read_source
+    return read_source('whr_2021')
+
+
+@dataset("id_base")
+def _load_id_base():
+    from whr.ingest import read_source
+    return read_source('id_base')
+
+
+# --- Jeux de données dérivés ---
+
+@dataset("data_version")
+def _load_data_version():
+    # Empreinte des sources au moment du chargement : clé des caches de résultats
+    from whr import snapshot
+    return snapshot.source_fingerprint()
+
+
+@dataset("snapshot")
+def _load_snapshot():
+    from whr import snapshot
+    return snapshot.load_snapshot()
+
+
+@dataset("panel")
+def _load_panel():
+    state = get("snapshot")
+    return state["processed"], state["original"]
+
+
+@dataset("df_processed")
+def _load_df_processed():
+    return get("panel")[0]
+
+
+@dataset("df_original")
+def _load_df_original():
+    return get("panel")[1]
+
+
+@dataset("merge_df_ISO")
+def _load_merge_df_iso():
+    # Base df avec code ID & Pays : df_original contient déjà la colonne 'id'
+    from whr import pipeline
+    return pipeline.merge_id_base(get("id_base"), get("df_original"))
+
+
+@dataset("yearly_summary")
+def _load_yearly_summary():
+    # Calculée avec le snapshot (années modifiées seulement lors d'une mise à jour incrémentale)
+    return get("snapshot")["summary"]
+
+
+@dataset("panel_index")
+def _load_panel_index():
+    from whr import filters
+    return filters.PanelIndex(get("df_processed"))
+
+
+@dataset("rankings")
+def _load_rankings():
+    from whr import rankings
+    return rankings.RankTables(get("df_processed"))
+
+
+@dataset("similarity")
+def _load_similarity():
+    from whr import similarity
+    return similarity.SimilarityIndex(get("df_processed"))
+
+
+@dataset("filter_options")
+def _load_filter_options():
+    df_processed = get("df_processed")
+    years = df_processed['year'].astype(int)
+    # Pays désignés par leur code ISO (un seul choix par pays même s'il a changé de nom), nom le plus récent affiché
+    latest = df_processed.dropna(subset=['ISO-alpha3 Code']).sort_values('year').groupby('ISO-alpha3 Code')['Country name'].last()
+    return {
+        'regions': sorted(df_processed['Regional indicator'].dropna().unique()),
+        'countries': sorted(latest.index, key=latest.get),
+        'country_names': latest.to_dict(),
+        'years': (int(years.min()), int(years.max())),
+    }
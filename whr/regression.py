@@ -0,0 +1,220 @@
+"""Régressions du Life Ladder sur les six facteurs du WHR (page "Facteurs du bonheur").
+
+Modèles linéaires ``Life Ladder ~ facteurs`` estimés par moindres carrés
+ordinaires, sur tout le panel (``by=None``), par année (``by='year'``) ou
+par région (``by='Regional indicator'``), avec effets fixes pays en option
+(estimateur *within* : variables centrées par pays dans chaque groupe, pays
+repérés par leur code ISO3). Un coefficient n'est pas estimé (NaN) quand son
+facteur ne varie pas dans le groupe une fois centré, ni aucun coefficient du
+groupe quand il n'y a pas plus d'observations que de paramètres : par année,
+un pays n'a qu'une observation et les effets fixes absorbent tout.
+
+Variables et cible sont centrées-réduites sur le panel : les coefficients
+sont comparables d'un facteur à l'autre. Tous les groupes sont estimés en un
+seul appel d'algèbre linéaire : les observations complètes sont rangées dans
+un tenseur (groupes, lignes, variables) complété par des zéros, puis les
+équations normales de tous les groupes sont résolues ensemble
+(``np.linalg.pinv`` sur la pile de matrices). Le bootstrap des coefficients
+(rééchantillonnage des lignes dans chaque groupe) est fait par lots de
+tirages, répartis dans un pool de processus ; le résultat ne dépend pas du
+nombre de processus.
+
+Les résultats sont mis en cache par version des données, clé de filtre
+(``whr.filters``) et modèle.
+"""
+import functools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import filtered_panel
+
+TARGET = 'Life Ladder'
+FACTORS = ['Logged GDP per capita', 'Social support', 'Healthy life expectancy',
+           'Freedom to make life choices', 'Generosity', 'Perceptions of corruption']
+
+# Regroupements proposés : None (panel entier), par année, par région
+GROUPINGS = (None, 'year', 'Regional indicator')
+
+COLUMNS = ['coef', 'std_err', 'ci_low', 'ci_high', 'n', 'r2']
+
+
+def design(panel, by=None, fixed_effects=False):
+    """Observations complètes du modèle : ``(groups, X, y, group_codes, country_codes)``.
+
+    ``X`` (facteurs) et ``y`` (Life Ladder) sont centrés-réduits ;
+    ``country_codes`` vaut None sans effets fixes.
+    """
+    complete = panel[[TARGET] + FACTORS].notna().all(axis=1).to_numpy()
+    if by is not None:
+        complete = complete & panel[by].notna().to_numpy()
+    data = panel.loc[complete]
+    values = data[[TARGET] + FACTORS].to_numpy(dtype=np.float64)
+    if len(values):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = (values - values.mean(axis=0)) / values.std(axis=0)
+    if by is None:
+        codes, groups = np.zeros(len(data), dtype=np.intp), pd.Index(['Panel'] if len(data) else [])
+    else:
+        codes, groups = pd.factorize(data[by].to_numpy(), sort=True)
+    countries = pd.factorize(data['ISO-alpha3 Code'].to_numpy())[0] if fixed_effects else None
+    return groups, values[:, 1:], values[:, 0], codes, countries
+
+
+def _padded(codes, n_groups, rows=None):
+    """Positions des lignes de chaque groupe : matrice (groupes, effectif max) et masque des cases utilisées.
+
+    ``rows`` (tirages bootstrap, dimensions ``(..., groupes, effectif max)``)
+    remplace la i-ème ligne du groupe g par sa ligne ``rows[..., g, i] % n_g``.
+    """
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    width = max(int(counts.max(initial=0)), 1)
+    slot = np.arange(width)
+    mask = slot < counts[:, None]
+    local = slot if rows is None else rows % np.maximum(counts, 1)[:, None]
+    positions = order[np.minimum(starts[:, None] + local, max(len(codes) - 1, 0))]
+    return positions, np.broadcast_to(mask, positions.shape)
+
+
+def _demean(values, mask, countries):
+    """Centre ``values`` (lots, lignes[, variables]) par pays dans chaque lot (cases masquées ignorées)."""
+    n_batch, width = mask.shape
+    n_countries = int(countries.max(initial=-1)) + 1
+    ids = (np.arange(n_batch)[:, None] * n_countries + countries)[mask]
+    flat = values[mask].reshape(len(ids), -1)
+    size = np.bincount(ids, minlength=n_batch * n_countries)
+    sums = np.stack([np.bincount(ids, weights=flat[:, j], minlength=n_batch * n_countries)
+                     for j in range(flat.shape[1])], axis=1)
+    means = sums / np.maximum(size, 1)[:, None]
+    centered = np.zeros((n_batch, width, flat.shape[1]))
+    centered[mask] = flat - means[ids]
+    n_effects = (size > 0).reshape(n_batch, n_countries).sum(axis=1)
+    return centered.reshape(values.shape), n_effects
+
+
+def batched_ols(X, y, mask, countries=None):
+    """Moindres carrés de chaque lot d'un tenseur complété par des zéros.
+
+    ``X`` (lots, lignes, variables), ``y`` et ``mask`` (lots, lignes) ;
+    ``countries`` (lots, lignes) active les effets fixes. Retourne
+    ``(coef, std_err, n, r2)`` ; ``coef`` exclut la constante.
+    """
+    n = mask.sum(axis=1)
+    if not len(mask):
+        empty = np.empty((0, X.shape[2]))
+        return empty, empty, n, np.empty(0)
+    if countries is not None:
+        X, n_effects = _demean(X, mask, countries)
+        y, _ = _demean(y, mask, countries)
+        ddof = n_effects
+    else:
+        X = np.concatenate([np.ones(mask.shape + (1,)), X], axis=2)
+        ddof = np.zeros_like(n)
+    X = X * mask[..., None]
+    y = y * mask
+
+    xtx = np.einsum('bmp,bmq->bpq', X, X)
+    inv = np.linalg.pinv(xtx)
+    coef = np.einsum('bpq,bq->bp', inv, np.einsum('bmp,bm->bp', X, y))
+    resid = (y - np.einsum('bmp,bp->bm', X, coef)) * mask
+    rss = (resid ** 2).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y_mean = y.sum(axis=1) / n
+        tss = (((y - y_mean[:, None]) * mask) ** 2).sum(axis=1)
+        dof = n - X.shape[2] - ddof
+        sigma2 = np.where(dof > 0, rss / dof, np.nan)
+        std_err = np.sqrt(sigma2[:, None] * np.diagonal(inv, axis1=1, axis2=2))
+        r2 = np.where(dof > 0, 1 - rss / tss, np.nan)
+    # Facteur sans variation (après centrage) ou degrés de liberté épuisés : coefficient non identifié
+    constant = np.diagonal(xtx, axis1=1, axis2=2) <= 1e-12 * np.maximum(n, 1)[:, None]
+    unidentified = constant | (dof <= 0)[:, None]
+    coef, std_err = np.where(unidentified, np.nan, coef), np.where(unidentified, np.nan, std_err)
+    if countries is None:
+        coef, std_err = coef[:, 1:], std_err[:, 1:]
+    return coef, std_err, n, r2
+
+
+def _group_tensors(X, y, codes, countries, n_groups, rows=None):
+    """Tenseurs ``(X, y, mask, countries)`` de :func:`batched_ols`, un lot par groupe (et par tirage)."""
+    positions, mask = _padded(codes, n_groups, rows)
+    width = positions.shape[-1]
+    return (X[positions].reshape(-1, width, X.shape[1]), y[positions].reshape(-1, width), mask.reshape(-1, width),
+            countries[positions].reshape(-1, width) if countries is not None else None)
+
+
+def fit(panel, by=None, fixed_effects=False):
+    """Coefficients standardisés par groupe : DataFrame indexé par (groupe, facteur), colonnes de ``COLUMNS``.
+
+    L'intervalle est l'approximation normale ``coef ± 1,96 std_err``.
+    """
+    groups, X, y, codes, countries = design(panel, by, fixed_effects)
+    coef, std_err, n, r2 = batched_ols(*_group_tensors(X, y, codes, countries, len(groups)))
+    return _table(groups, coef, std_err, coef - 1.96 * std_err, coef + 1.96 * std_err, n, r2, by)
+
+
+def _table(groups, coef, std_err, low, high, n, r2, by):
+    index = pd.MultiIndex.from_product([groups, FACTORS], names=[by or 'model', 'factor'])
+    table = pd.DataFrame({
+        'coef': coef.ravel(), 'std_err': std_err.ravel(), 'ci_low': low.ravel(), 'ci_high': high.ravel(),
+        'n': np.repeat(n, len(FACTORS)), 'r2': np.repeat(r2, len(FACTORS)),
+    }, index=index)
+    # Groupes trop petits pour estimer les six coefficients
+    table.loc[table['n'] <= len(FACTORS) + 1, ['coef', 'std_err', 'ci_low', 'ci_high', 'r2']] = np.nan
+    return table
+
+
+def _bootstrap_chunk(X, y, codes, countries, n_groups, n_draws, seed):
+    """Coefficients de ``n_draws`` rééchantillonnages de toutes les lignes de chaque groupe : (tirages, groupes, facteurs)."""
+    rng = np.random.default_rng(seed)
+    width = _padded(codes, n_groups)[1].shape[1]
+    rows = rng.integers(0, np.iinfo(np.int64).max, (n_draws, n_groups, width))
+    coef = batched_ols(*_group_tensors(X, y, codes, countries, n_groups, rows))[0]
+    return coef.reshape(n_draws, n_groups, -1)
+
+
+def bootstrap(panel, by=None, fixed_effects=False, n_boot=500, ci=95, seed=0, batch=50, jobs=None):
+    """Comme :func:`fit`, avec des intervalles bootstrap percentile (rééchantillonnage des lignes par groupe).
+
+    Les tirages sont faits par lots de ``batch``, chacun avec sa graine dérivée
+    de ``seed`` ; les lots sont répartis sur ``jobs`` processus (défaut :
+    nombre de cœurs, ``jobs=1`` en séquence).
+    """
+    groups, X, y, codes, countries = design(panel, by, fixed_effects)
+    coef, std_err, n, r2 = batched_ols(*_group_tensors(X, y, codes, countries, len(groups)))
+    if not len(groups):
+        return _table(groups, coef, std_err, coef, coef, n, r2, by)
+
+    sizes = [min(batch, n_boot - start) for start in range(0, n_boot, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(X, y, codes, countries, len(groups), size, s) for size, s in zip(sizes, seeds)]
+    jobs = min(len(args), jobs or os.cpu_count() or 1)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            draws = list(pool.map(_bootstrap_chunk, *zip(*args)))
+    else:
+        draws = [_bootstrap_chunk(*a) for a in args]
+    draws = np.concatenate(draws)
+
+    alpha = (100 - ci) / 2
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # groupe trop petit : tirages tous NaN
+        low, high = np.nanpercentile(draws, [alpha, 100 - alpha], axis=0)
+        std_err = np.nanstd(draws, axis=0, ddof=1)
+    return _table(groups, coef, std_err, low, high, n, r2, by)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_regression(version, key, by=None, fixed_effects=False, n_boot=0):
+    """Régression du panel filtré par ``key`` ; ``n_boot > 0`` pour des intervalles bootstrap.
+
+    ``version`` invalide le cache.
+    """
+    panel = filtered_panel(version, key)
+    if n_boot:
+        return bootstrap(panel, by, fixed_effects, n_boot=n_boot)
+    return fit(panel, by, fixed_effects)
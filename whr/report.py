@@ -0,0 +1,365 @@
+"""Rapport statique : toutes les pages rendues en HTML, sans navigateur.
+
+Les fonctions de page du paquet ``vues`` sont exécutées telles quelles avec un
+``st`` remplacé par :class:`HtmlRecorder`, qui traduit chaque élément
+(titres, markdown, tableaux, images) en HTML ; les figures sont intégrées en
+PNG base64. Les pages sont rendues en parallèle dans un pool de processus.
+
+Chaque page est écrite dans un fichier nommé d'après l'empreinte de ses
+entrées (code de l'application et version des données si la page en lit) ;
+``manifest.json`` conserve ces empreintes pour qu'une nouvelle génération ne
+refasse que les pages dont une entrée a changé.
+
+Usage (depuis la racine du dépôt) :
+    python -m whr.report [--out build/report] [--jobs N] [--force]
+"""
+import argparse
+import base64
+import contextlib
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import textwrap
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from whr import registry, storage
+
+REPORT_DIR = os.path.join("build", "report")
+MANIFEST_FILE = "manifest.json"
+# A incrémenter quand le rendu HTML change : force la régénération de toutes les pages
+REPORT_VERSION = 1
+
+STYLE = """
+body { font-family: sans-serif; max-width: 1400px; margin: 2rem auto; padding: 0 1rem; color: #262730; }
+.row { display: flex; gap: 1.5rem; } .col { min-width: 0; }
+.alert { padding: .75rem 1rem; border-radius: .5rem; margin: .5rem 0; }
+.info { background: #e8f0fe; } .warning { background: #fff6d6; }
+table { border-collapse: collapse; font-size: .8rem; } td, th { border: 1px solid #ddd; padding: 2px 6px; }
+img { max-width: 100%; } details { margin: .5rem 0; } pre { font-size: .75rem; }
+"""
+
+
+# --- Conversion markdown minimale (le sous-ensemble utilisé par les pages) ---
+
+def _inline(text):
+    text = html.escape(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return text.replace("\\*", "*")
+
+
+def markdown_to_html(text):
+    out, paragraph, items = [], [], []
+
+    def flush():
+        if paragraph:
+            out.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            out.append("<ul>" + "".join(f"<li>{_inline(i)}</li>" for i in items) + "</ul>")
+            items.clear()
+
+    for line in textwrap.dedent(text).splitlines():
+        line = line.strip()
+        heading = re.match(r"^(#{1,6})\s*(.*)$", line)
+        if not line:
+            flush()
+        elif line == "---":
+            flush()
+            out.append("<hr>")
+        elif heading:
+            flush()
+            if heading.group(2):
+                level = len(heading.group(1))
+                out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif line.startswith("- "):
+            if paragraph:
+                flush()
+            items.append(line[2:])
+        else:
+            paragraph.append(line)
+    flush()
+    return "\n".join(out)
+
+
+# --- Enregistreur remplaçant ``st`` ---
+
+class _Block:
+    """Conteneur HTML (colonne, expander...) ; utilisable avec ``with``."""
+
+    def __init__(self, recorder, open_tag="", close_tag=""):
+        self._recorder = recorder
+        self.open_tag, self.close_tag = open_tag, close_tag
+        self.children = []
+
+    def __enter__(self):
+        self._recorder._stack.append(self.children)
+        return self
+
+    def __exit__(self, *exc):
+        self._recorder._stack.pop()
+
+    def __str__(self):
+        return self.open_tag + "".join(map(str, self.children)) + self.close_tag
+
+
+class HtmlRecorder:
+    """Sous-ensemble de l'API ``st`` utilisé par les pages, traduit en HTML.
+
+    Les widgets retournent leur valeur par défaut : le rapport montre chaque
+    page dans son état initial.
+    """
+
+    def __init__(self):
+        self._root = []
+        self._stack = [self._root]
+        self.title_text = None
+        self.sidebar = self
+
+    def _emit(self, fragment):
+        self._stack[-1].append(fragment)
+
+    def html(self):
+        return "".join(map(str, self._root))
+
+    # Texte
+    def title(self, body, **kwargs):
+        self.title_text = self.title_text or body
+        self._emit(f"<h1>{_inline(body)}</h1>")
+
+    def header(self, body, **kwargs):
+        self._emit(f"<h2>{_inline(body)}</h2>")
+
+    def subheader(self, body, **kwargs):
+        self._emit(f"<h3>{_inline(body)}</h3>")
+
+    def markdown(self, body, **kwargs):
+        self._emit(markdown_to_html(body))
+
+    def caption(self, body, **kwargs):
+        self._emit(f"<p><small>{_inline(body)}</small></p>")
+
+    def text(self, body, **kwargs):
+        self._emit(f"<pre>{html.escape(str(body))}</pre>")
+
+    def write(self, *args, **kwargs):
+        for arg in args:
+            if hasattr(arg, "to_html"):
+                self.dataframe(arg)
+            else:
+                self.markdown(str(arg))
+
+    def info(self, body, **kwargs):
+        self._emit(f'<div class="alert info">{markdown_to_html(body)}</div>')
+
+    def warning(self, body, **kwargs):
+        self._emit(f'<div class="alert warning">{markdown_to_html(body)}</div>')
+
+    # Données et images
+    def dataframe(self, data, **kwargs):
+        self._emit(data.to_html(na_rep="NaN", float_format=lambda v: f"{v:.6g}"))
+
+    table = dataframe
+
+    def image(self, image, width=None, **kwargs):
+        if isinstance(image, str):
+            if not os.path.exists(image):
+                self._emit(f"<!-- image absente : {html.escape(image)} -->")
+                return
+            with open(image, "rb") as f:
+                image = f.read()
+        mime = "image/png" if image[:4] == b"\x89PNG" else "image/jpeg"
+        style = f' style="width:{width}px"' if isinstance(width, int) else ""
+        self._emit(f'<img src="data:{mime};base64,{base64.b64encode(image).decode()}"{style}>')
+
+    # Mise en page
+    def columns(self, spec, **kwargs):
+        weights = [1] * spec if isinstance(spec, int) else list(spec)
+        row = _Block(self, '<div class="row">', "</div>")
+        self._emit(row)
+        cols = [_Block(self, f'<div class="col" style="flex:{w}">', "</div>") for w in weights]
+        row.children.extend(cols)
+        return cols
+
+    def expander(self, label, **kwargs):
+        block = _Block(self, f"<details><summary>{_inline(label)}</summary>", "</details>")
+        self._emit(block)
+        return block
+
+    def container(self, **kwargs):
+        block = _Block(self)
+        self._emit(block)
+        return block
+
+    def spinner(self, *args, **kwargs):
+        return contextlib.nullcontext()
+
+    def get_option(self, name):
+        return None
+
+    # Widgets : valeur par défaut
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    selectbox = radio
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return list(default or [])
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return min_value if value is None else value
+
+    select_slider = slider
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    toggle = checkbox
+
+    def __getattr__(self, name):
+        raise AttributeError(f"Elément Streamlit non pris en charge par le rapport statique : st.{name}")
+
+
+# --- Génération ---
+
+def slugify(title):
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def code_version():
+    """Empreinte du code de l'application (paquets vues et whr)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = sorted(glob.glob(os.path.join(root, "vues", "*.py"))) + sorted(glob.glob(os.path.join(root, "whr", "*.py")))
+    h = hashlib.sha256(f"report-v{REPORT_VERSION}".encode())
+    for path in paths:
+        h.update(storage.file_digest(path).encode())
+    return h.hexdigest()
+
+
+def page_fingerprint(title, code, data_version, datasets):
+    # La version des données n'entre dans l'empreinte que si la page lit des données
+    inputs = [title, code] + ([data_version] + sorted(datasets) if datasets else [])
+    return hashlib.sha256("\0".join(inputs).encode()).hexdigest()
+
+
+def render_page(title):
+    """Exécute une page avec l'enregistreur HTML ; retourne ``(html, titre, jeux de données lus, durée)``."""
+    import vues
+    from vues import commun
+
+    recorder = HtmlRecorder()
+    used = set()
+    load_dataset = commun.load_dataset
+
+    def tracking_load(name):
+        used.add(name)
+        return load_dataset(name)
+
+    # Le module de la page et les fonctions communes écrivent dans l'enregistreur
+    modules = [vues.page_module(title), commun]
+    start = time.perf_counter()
+    for module in modules:
+        module.st = recorder
+        if hasattr(module, "load_dataset"):
+            module.load_dataset = tracking_load
+    try:
+        vues.PAGES[title]()
+    finally:
+        for module in modules:
+            module.st = sys.modules["streamlit"]
+            if hasattr(module, "load_dataset"):
+                module.load_dataset = load_dataset
+    return recorder.html(), recorder.title_text or title, sorted(used), time.perf_counter() - start
+
+
+def _page_document(title, body, built_at):
+    return (f'<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<style>{STYLE}</style></head><body><p><a href="index.html">&larr; Sommaire</a> · '
+            f'généré le {built_at}</p>{body}</body></html>')
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"pages": {}}
+
+
+def build(out_dir=REPORT_DIR, jobs=None, force=False, log=print):
+    """Génère le rapport dans ``out_dir`` ; ne refait que les pages dont les entrées ont changé."""
+    import vues
+
+    os.makedirs(out_dir, exist_ok=True)
+    code = code_version()
+    # Données chargées avant la création du pool : les processus fils en héritent
+    data_version = registry.get("data_version")
+    registry.get("panel")
+
+    previous = read_manifest(out_dir)["pages"]
+    pages, todo = {}, []
+    for title in vues.PAGES:
+        old = previous.get(title)
+        if (not force and old and os.path.exists(os.path.join(out_dir, old["file"]))
+                and old["fingerprint"] == page_fingerprint(title, code, data_version, old["datasets"])):
+            pages[title] = old
+            log(f"  inchangée  {title}")
+        else:
+            todo.append(title)
+
+    built_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for title, (body, heading, datasets, seconds) in zip(todo, pool.map(render_page, todo)):
+                fingerprint = page_fingerprint(title, code, data_version, datasets)
+                file_name = f"{slugify(title)}-{fingerprint[:10]}.html"
+                with storage.atomic_path(os.path.join(out_dir, file_name)) as tmp:
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(_page_document(heading, body, built_at))
+                pages[title] = {"file": file_name, "fingerprint": fingerprint, "datasets": datasets,
+                                "seconds": round(seconds, 3), "built_at": built_at}
+                log(f"  générée    {title} ({seconds:.2f} s)")
+
+    links = "".join(f'<li><a href="{pages[t]["file"]}">{html.escape(t)}</a> '
+                    f'<small>({pages[t]["built_at"]})</small></li>' for t in vues.PAGES)
+    index = (f'<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>Analyse du World Happiness '
+             f'Report</title><style>{STYLE}</style></head><body><h1>🌍 Analyse du bien-être</h1><ul>{links}</ul>'
+             f'<p><small>Données {data_version} · code {code[:12]}</small></p></body></html>')
+    with storage.atomic_path(os.path.join(out_dir, "index.html")) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(index)
+    manifest = {"data_version": data_version, "code_version": code, "pages": pages}
+    with storage.atomic_path(os.path.join(out_dir, MANIFEST_FILE)) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    # Pages des versions précédentes devenues inutiles
+    keep = {page["file"] for page in pages.values()} | {"index.html"}
+    for path in glob.glob(os.path.join(out_dir, "*.html")):
+        if os.path.basename(path) not in keep:
+            os.remove(path)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère le rapport HTML statique de toutes les pages.")
+    parser.add_argument("--out", default=REPORT_DIR, help=f"répertoire de sortie (défaut : {REPORT_DIR})")
+    parser.add_argument("--jobs", type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--force", action="store_true", help="régénère toutes les pages")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    build(args.out, jobs=args.jobs, force=args.force)
+    print(f"Rapport écrit dans {os.path.join(args.out, 'index.html')} en {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
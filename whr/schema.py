@@ -0,0 +1,75 @@
+"""Schéma des colonnes du panel prétraité (``df_processed``).
+
+Le pipeline (``whr.pipeline.build_panel``) et la mise à jour incrémentale
+(``whr.delta``) appliquent :func:`enforce` à leur résultat : toutes les
+copies du panel (snapshot, vues filtrées, résultats en cache) ont les types
+déclarés dans ``PANEL_SCHEMA`` :
+
+- ``year`` : entier ``int16`` ;
+- pays, code ISO et région : catégories partagées par toutes les lignes (un
+  code entier par ligne, une seule copie de chaque libellé). Les catégories
+  sont les valeurs présentes, triées : un panel reconstruit entièrement et
+  un panel mis à jour pays par pays ont exactement les mêmes ;
+- indicateurs : ``float32``. Les indicateurs ont au plus quatre chiffres
+  significatifs dans les sources, ``float32`` en garde sept. Quelques
+  valeurs des sources sont des ``float32`` déjà élargis en ``float64``
+  (``4.310999870300293`` pour ``4.311``) : elles redeviennent égales.
+
+Valeurs manquantes : une valeur absente d'un indicateur est ``NaN``, jamais
+remplacée (ni par 0, ni par une moyenne) ; une valeur infinie est une
+erreur. Un libellé absent est une catégorie manquante (code -1). L'année
+n'est jamais absente.
+
+L'identifiant texte ``id`` (année-code ISO) n'est plus stocké : il est
+calculé à la demande pour l'affichage (:func:`panel_id`, :func:`with_id`).
+Les calculs convertissent les indicateurs en ``float64`` avant d'agréger.
+"""
+import numpy as np
+import pandas as pd
+
+INDICATORS = ['Life Ladder', 'Logged GDP per capita', 'Social support', 'Healthy life expectancy',
+              'Freedom to make life choices', 'Generosity', 'Perceptions of corruption', 'Positive affect',
+              'Negative affect']
+
+CATEGORIES = ['Country name', 'ISO-alpha3 Code', 'Regional indicator']
+
+# Colonne -> type stocké, dans l'ordre des colonnes du panel
+PANEL_SCHEMA = {'year': 'int16', **{col: 'category' for col in CATEGORIES},
+                **{col: 'float32' for col in INDICATORS}}
+
+
+class PanelSchemaError(ValueError):
+    """Panel non conforme à ``PANEL_SCHEMA``."""
+
+
+def _categorical(values):
+    # Catégories = valeurs présentes triées, quelle que soit l'origine (texte, catégories d'un autre panel)
+    codes, categories = pd.factorize(np.asarray(values, dtype=object), sort=True)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories.astype(str)))
+
+
+def enforce(panel):
+    """Panel aux types de ``PANEL_SCHEMA`` (colonnes dans l'ordre du schéma, index conservé)."""
+    missing = [col for col in PANEL_SCHEMA if col not in panel.columns]
+    if missing:
+        raise PanelSchemaError(f"Colonnes absentes du panel : {missing}")
+    if panel['year'].isna().any():
+        raise PanelSchemaError("Année manquante dans le panel")
+    values = panel[INDICATORS].to_numpy(dtype=np.float64)
+    if np.isinf(values).any():
+        raise PanelSchemaError("Valeur infinie dans les indicateurs (seul NaN marque une valeur manquante)")
+    columns = {'year': panel['year'].to_numpy().astype(np.int16)}
+    columns.update({col: _categorical(panel[col]) for col in CATEGORIES})
+    columns.update({col: values[:, j].astype(np.float32) for j, col in enumerate(INDICATORS)})
+    return pd.DataFrame(columns, index=panel.index)
+
+
+def panel_id(panel):
+    """Identifiant texte ``année-code ISO`` de chaque ligne."""
+    return panel['year'].astype('str') + "-" + panel['ISO-alpha3 Code'].astype('str')
+
+
+def with_id(panel):
+    """Copie de ``panel`` précédée de la colonne ``id`` (affichage)."""
+    return panel.assign(id=panel_id(panel))[['id'] + list(panel.columns)]
+
@@ -0,0 +1,248 @@
+"""Pays les plus proches d'un pays donné, une année donnée (page "Pays similaires").
+
+Chaque pays-année est décrit par le Life Ladder et les six facteurs du WHR,
+centrés-réduits année par année : la distance compare les pays à la
+distribution de la même année. Politique des valeurs manquantes : un pays
+auquel il manque plus de ``MAX_MISSING`` indicateurs une année n'est pas
+indexé cette année-là ; les autres valeurs manquantes sont remplacées par 0,
+c'est-à-dire la moyenne de l'année (elles ne rapprochent ni n'éloignent).
+
+:class:`SimilarityIndex` construit, une fois par version des données, un
+arbre k-d (:class:`KDTree`) par année. Une requête des k plus proches
+voisins ou des pays à moins d'une distance donnée n'explore que les
+feuilles dont la boîte englobante peut encore contenir un résultat, au lieu
+de calculer la distance à tous les pays.
+
+L'index suit les filtres communs des pages d'analyse
+(:func:`cached_similarity_index`) : seuls les pays et années retenus sont
+indexés, et centrés-réduits entre eux.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from whr.filters import NO_FILTER, filtered_panel
+from whr.regression import FACTORS
+
+FEATURES = ['Life Ladder'] + FACTORS
+
+# Nombre maximal d'indicateurs manquants pour qu'un pays-année soit indexé
+MAX_MISSING = 2
+
+
+class KDTree:
+    """Arbre k-d sur les lignes de ``points`` ; feuilles d'au plus ``leaf_size`` points."""
+
+    def __init__(self, points, leaf_size=64):
+        points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self.index = np.arange(len(points))
+        self._nodes = []  # (début, fin, gauche, droite) dans self.index
+        self._bounds = []
+        if len(points):
+            self._build(points, 0, len(points))
+        self.data = points[self.index]  # points rangés dans l'ordre des feuilles
+        self.low = np.array([b[0] for b in self._bounds]).reshape(len(self._bounds), points.shape[1])
+        self.high = np.array([b[1] for b in self._bounds]).reshape(len(self._bounds), points.shape[1])
+        self.nodes = [tuple(node) for node in self._nodes]
+
+    def __len__(self):
+        return len(self.index)
+
+    def _build(self, points, lo, hi):
+        node = len(self._nodes)
+        block = points[self.index[lo:hi]]
+        self._nodes.append([lo, hi, -1, -1])
+        self._bounds.append((block.min(axis=0), block.max(axis=0)))
+        if hi - lo > self.leaf_size:
+            # Coupe à la médiane de la dimension la plus étendue
+            dim = int(np.argmax(self._bounds[node][1] - self._bounds[node][0]))
+            mid = (lo + hi) // 2
+            self.index[lo:hi] = self.index[lo:hi][np.argpartition(block[:, dim], mid - lo)]
+            self._nodes[node][2] = self._build(points, lo, mid)
+            self._nodes[node][3] = self._build(points, mid, hi)
+        return node
+
+    def _min_dist2(self, node, x):
+        gap = np.maximum(self.low[node] - x, 0) + np.maximum(x - self.high[node], 0)
+        return float(gap @ gap)
+
+    def query(self, x, k=1):
+        """``(distances, positions)`` des ``k`` points les plus proches de ``x``, du plus proche au plus lointain."""
+        x = np.asarray(x, dtype=np.float64)
+        k = min(k, len(self))
+        best_d2, best_pos = np.full(0, np.inf), np.empty(0, dtype=np.intp)
+        if k == 0:
+            return best_d2, best_pos
+        stack = [(0.0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best_d2) == k and bound >= best_d2[-1]:
+                continue
+            lo, hi, left, right = self.nodes[node]
+            if left < 0:
+                diff = self.data[lo:hi] - x
+                d2 = np.concatenate([best_d2, np.einsum('ij,ij->i', diff, diff)])
+                pos = np.concatenate([best_pos, np.arange(lo, hi)])
+                keep = np.argsort(d2, kind='stable')[:k]
+                best_d2, best_pos = d2[keep], pos[keep]
+                continue
+            d_left, d_right = self._min_dist2(left, x), self._min_dist2(right, x)
+            # Le fils le plus proche est exploré en premier : les bornes se resserrent plus vite
+            stack.extend([(d_right, right), (d_left, left)] if d_left <= d_right else [(d_left, left), (d_right, right)])
+        return np.sqrt(best_d2), self.index[best_pos]
+
+    def query_radius(self, x, radius):
+        """``(distances, positions)`` des points à au plus ``radius`` de ``x``, du plus proche au plus lointain."""
+        x = np.asarray(x, dtype=np.float64)
+        r2 = radius * radius
+        found_d2, found_pos = [], []
+        stack = [0] if len(self) else []
+        while stack:
+            node = stack.pop()
+            if self._min_dist2(node, x) > r2:
+                continue
+            lo, hi, left, right = self.nodes[node]
+            if left < 0:
+                diff = self.data[lo:hi] - x
+                d2 = np.einsum('ij,ij->i', diff, diff)
+                inside = d2 <= r2
+                found_d2.append(d2[inside])
+                found_pos.append(np.arange(lo, hi)[inside])
+            else:
+                stack.extend((left, right))
+        if not found_d2:
+            return np.empty(0), np.empty(0, dtype=np.intp)
+        d2, pos = np.concatenate(found_d2), np.concatenate(found_pos)
+        order = np.argsort(d2, kind='stable')
+        return np.sqrt(d2[order]), self.index[pos[order]]
+
+    def query_pairs(self, radius):
+        """Toutes les paires ``(i, j, distance)`` de points à au plus ``radius``, ``i < j`` (positions d'origine).
+
+        Parcours simultané de l'arbre avec lui-même : un couple de nœuds dont
+        les boîtes sont trop éloignées est écarté, un couple de feuilles est
+        traité en un calcul matriciel.
+        """
+        r2 = radius * radius
+        left, right, found_d2 = [], [], []
+        stack = [(0, 0)] if len(self) else []
+        while stack:
+            a, b = stack.pop()
+            gap = np.maximum(np.maximum(self.low[a] - self.high[b], self.low[b] - self.high[a]), 0)
+            if gap @ gap > r2:
+                continue
+            a_lo, a_hi, a_left, a_right = self.nodes[a]
+            b_lo, b_hi, b_left, b_right = self.nodes[b]
+            if a == b and a_left >= 0:
+                stack.extend([(a_left, a_left), (a_right, a_right), (a_left, a_right)])
+            elif a_left < 0 and b_left < 0:
+                diff = self.data[a_lo:a_hi, None, :] - self.data[None, b_lo:b_hi, :]
+                d2 = np.einsum('ijk,ijk->ij', diff, diff)
+                close = d2 <= r2
+                if a == b:
+                    close = np.triu(close, k=1)
+                i, j = np.nonzero(close)
+                left.append(a_lo + i)
+                right.append(b_lo + j)
+                found_d2.append(d2[i, j])
+            elif b_left < 0 or (a_left >= 0 and a_hi - a_lo >= b_hi - b_lo):
+                stack.extend([(a_left, b), (a_right, b)])
+            else:
+                stack.extend([(a, b_left), (a, b_right)])
+        if not found_d2:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+        i, j = self.index[np.concatenate(left)], self.index[np.concatenate(right)]
+        d = np.sqrt(np.concatenate(found_d2))
+        return np.minimum(i, j), np.maximum(i, j), d
+
+
+def standardize(values):
+    """Centre-réduit chaque colonne (NaN ignorés) ; retourne ``(z, lignes indexables)`` selon ``MAX_MISSING``."""
+    missing = np.isnan(values)
+    present = (~missing).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present > 0, np.nansum(values, axis=0) / np.maximum(present, 1), 0.0)
+        centered = np.where(missing, 0.0, values - mean)
+        std = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(present - 1, 1))
+        z = np.where(std > 0, centered / std, 0.0)
+    return z, missing.sum(axis=1) <= MAX_MISSING
+
+
+class SimilarityIndex:
+    """Un arbre k-d par année sur les indicateurs centrés-réduits des pays de cette année."""
+
+    def __init__(self, panel, features=FEATURES, leaf_size=64):
+        panel = panel.dropna(subset=['ISO-alpha3 Code'])
+        self.features = list(features)
+        self.years = {}
+        for year, rows in panel.groupby(panel['year'].astype(int), sort=True):
+            z, keep = standardize(rows[self.features].to_numpy(dtype=np.float64))
+            rows = rows.loc[keep]
+            self.years[int(year)] = {
+                'points': z[keep],
+                'tree': KDTree(z[keep], leaf_size),
+                'iso': rows['ISO-alpha3 Code'].to_numpy(dtype=object),
+                'name': rows['Country name'].to_numpy(dtype=object),
+                'region': rows['Regional indicator'].to_numpy(dtype=object),
+                'position': {iso: i for i, iso in enumerate(rows['ISO-alpha3 Code'])},
+            }
+            # Un arbre par région pour les paires intra-régionales
+            entry = self.years[int(year)]
+            entry['regions'] = {}
+            for region in pd.unique(entry['region']):
+                members = np.flatnonzero(entry['region'] == region)
+                entry['regions'][region] = (members, KDTree(entry['points'][members], leaf_size))
+
+    def available_years(self, country):
+        """Années où ``country`` (code ISO) est indexé."""
+        return [year for year, entry in self.years.items() if country in entry['position']]
+
+    def _frame(self, entry, distances, positions):
+        return pd.DataFrame({
+            'Pays': entry['name'][positions],
+            'ISO-alpha3 Code': entry['iso'][positions],
+            'Région': entry['region'][positions],
+            'Distance': distances,
+        })
+
+    def neighbours(self, country, year, k=5):
+        """Les ``k`` pays les plus proches de ``country`` l'année ``year`` (le pays lui-même exclu)."""
+        entry = self.years[int(year)]
+        pos = entry['position'][country]
+        distances, positions = entry['tree'].query(entry['points'][pos], k + 1)
+        keep = positions != pos
+        return self._frame(entry, distances[keep][:k], positions[keep][:k])
+
+    def within(self, country, year, radius):
+        """Pays à au plus ``radius`` (en écarts-types) de ``country`` l'année ``year``."""
+        entry = self.years[int(year)]
+        pos = entry['position'][country]
+        distances, positions = entry['tree'].query_radius(entry['points'][pos], radius)
+        keep = positions != pos
+        return self._frame(entry, distances[keep], positions[keep])
+
+    def region_pairs(self, year, region, radius):
+        """Toutes les paires de pays de ``region`` à au plus ``radius`` l'une de l'autre l'année ``year``."""
+        entry = self.years[int(year)]
+        if region not in entry['regions']:
+            return pd.DataFrame(columns=['Pays 1', 'Pays 2', 'Distance'])
+        members, tree = entry['regions'][region]
+        left, right, distances = tree.query_pairs(radius)
+        order = np.argsort(distances, kind='stable')
+        return pd.DataFrame({
+            'Pays 1': entry['name'][members[left[order]]],
+            'Pays 2': entry['name'][members[right[order]]],
+            'Distance': distances[order],
+        })
+
+
+@functools.lru_cache(maxsize=32)
+def cached_similarity_index(version, key):
+    """Index du panel filtré par ``key`` (``whr.filters``) ; ``version`` invalide le cache."""
+    from whr import registry
+
+    if key == NO_FILTER:
+        return registry.get("similarity")
+    return SimilarityIndex(filtered_panel(version, key))
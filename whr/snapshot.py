@@ -0,0 +1,199 @@
+"""Snapshot sur disque du panel prétraité.
+
+Le résultat de ``load_and_preprocess_data`` est écrit au format Arrow IPC
+(non compressé) dans un répertoire dont le nom est une empreinte du contenu
+des six fichiers sources, de ``PIPELINE_VERSION`` et du référentiel des pays
+(``whr.countries``). Un nouveau processus relit donc le panel final
+directement et ne relance le traitement que si une source a changé.
+
+Les fichiers sont relus par ``mmap`` : les colonnes numériques et les
+colonnes texte (stockage Arrow de pandas) pointent directement dans le cache
+de pages du système. Toutes les sessions et tous les processus serveur
+partagent ainsi la même copie physique du panel, qui n'est jamais recopiée.
+Les NaN des colonnes numériques sont écrits tels quels (sans masque de
+validité Arrow) pour que la conversion vers pandas reste sans copie.
+
+Chaque snapshot contient aussi la table annuelle (``yearly_summary``) et
+l'empreinte de chaque ligne des sources (``whr.delta``). Le fichier
+``LATEST`` désigne le dernier snapshot publié : quand une source change, le
+nouveau snapshot est dérivé de celui-ci en ne recalculant que les pays
+touchés, au lieu de relancer tout le traitement.
+
+Chaque snapshot est écrit dans un répertoire temporaire puis publié par un
+``os.rename`` atomique : un lecteur ne voit jamais un snapshot à moitié
+écrit. Un verrou fichier évite que plusieurs processus démarrés en même
+temps reconstruisent le même panel en parallèle.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import warnings
+
+import pyarrow as pa
+
+from whr import countries, delta, pipeline, storage
+from whr.sources import SOURCE_FILES
+
+CACHE_DIR = os.environ.get("WHR_CACHE_DIR", os.path.join(".cache", "whr"))
+
+SNAPSHOT_FORMAT = "arrow-ipc"
+SNAPSHOT_FILES = {"processed": "processed.arrow", "original": "original.arrow",
+                  "summary": "summary.arrow", "rows": "rows.arrow"}
+META_FILE = "meta.json"
+LATEST_FILE = "LATEST"
+
+# Répertoires temporaires abandonnés (processus tué pendant l'écriture)
+STALE_TMP_SECONDS = 3600
+
+
+def source_fingerprint(paths=SOURCE_FILES):
+    """Empreinte des fichiers sources, de la version du traitement et du référentiel des pays."""
+    h = hashlib.sha256(f"pipeline-v{pipeline.PIPELINE_VERSION}-{SNAPSHOT_FORMAT}".encode())
+    h.update(countries.reference_digest().encode())
+    for path in paths:
+        h.update(os.path.basename(path).encode())
+        h.update(storage.file_digest(path).encode())
+    return h.hexdigest()[:24]
+
+
+def _write_frame(frame, path):
+    # Un seul lot par fichier : le contenu écrit ne dépend pas de l'historique des colonnes texte
+    # (une colonne issue d'une concaténation garde un morceau Arrow par partie)
+    table = pa.Table.from_pandas(frame, preserve_index=True).combine_chunks()
+    # Les colonnes du DataFrame viennent en tête de la table, dans l'ordre (puis l'index)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and i < frame.shape[1]:
+            # NaN conservés comme valeurs : pas de masque de validité, lecture sans copie
+            values = pa.array(frame.iloc[:, i].to_numpy(), type=field.type, from_pandas=False)
+            table = table.set_column(i, field, values)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _map_frame(path):
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    # split_blocks : une colonne par bloc, pas de consolidation (donc pas de copie)
+    return table.to_pandas(split_blocks=True)
+
+
+def _read_snapshot(target):
+    """État d'un snapshot (frames mappées et empreintes des sources), ou None."""
+    if not os.path.isdir(target):
+        return None
+    try:
+        state = {name: _map_frame(os.path.join(target, file)) for name, file in SNAPSHOT_FILES.items()}
+        with open(os.path.join(target, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception as exc:  # snapshot illisible : on le reconstruit
+        warnings.warn(f"Snapshot illisible ignoré ({target}) : {exc}")
+        return None
+    # Autre traitement ou autre référentiel des pays : pas de mise à jour incrémentale possible
+    if (meta.get("pipeline_version") != pipeline.PIPELINE_VERSION
+            or meta.get("countries") != countries.reference_digest()):
+        return None
+    state["digests"] = meta["sources"]
+    return state
+
+
+def _publish_snapshot(state, cache_dir, key):
+    tmp = tempfile.mkdtemp(prefix=f".tmp-{key}-", dir=cache_dir)
+    try:
+        for name, file in SNAPSHOT_FILES.items():
+            _write_frame(state[name], os.path.join(tmp, file))
+        with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"pipeline_version": pipeline.PIPELINE_VERSION, "countries": countries.reference_digest(),
+                       "sources": state["digests"]}, f, indent=2)
+        os.rename(tmp, os.path.join(cache_dir, key))
+    except OSError:
+        # Un autre processus a publié le même snapshot entre-temps
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(os.path.join(cache_dir, key)):
+            raise
+    with storage.atomic_path(os.path.join(cache_dir, LATEST_FILE)) as tmp_latest:
+        with open(tmp_latest, "w", encoding="utf-8") as f:
+            f.write(key)
+
+
+def _previous_snapshot(cache_dir):
+    """Dernier snapshot publié (point de départ d'une mise à jour incrémentale), ou None."""
+    try:
+        with open(os.path.join(cache_dir, LATEST_FILE), encoding="utf-8") as f:
+            key = f.read().strip()
+    except OSError:
+        return None
+    return _read_snapshot(os.path.join(cache_dir, key)) if key else None
+
+
+def _build(cache_dir):
+    previous = _previous_snapshot(cache_dir)
+    if previous is None:
+        return delta.full_build()
+    return delta.incremental_build(previous)
+
+
+def _prune(cache_dir, keep):
+    now = time.time()
+    for entry in os.scandir(cache_dir):
+        if entry.name.startswith(keep) or entry.name == LATEST_FILE:
+            continue
+        try:
+            if entry.name.startswith(".tmp-"):
+                if now - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.name.endswith(".lock"):
+                # Un verrou récent peut être détenu par un processus qui construit une autre empreinte :
+                # le supprimer laisserait un troisième processus en créer un nouveau (autre inode)
+                if now - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def load_snapshot(cache_dir=None):
+    """État courant depuis le snapshot, construit (ou mis à jour depuis le précédent) si besoin.
+
+    Dict avec ``processed``, ``original``, ``summary`` (table annuelle),
+    ``rows`` (empreintes des lignes des sources) et ``digests``.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    key = source_fingerprint()
+    target = os.path.join(cache_dir, key)
+
+    state = _read_snapshot(target)
+    if state is not None:
+        return state
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as exc:
+        warnings.warn(f"Cache {cache_dir} inaccessible, snapshot désactivé : {exc}")
+        return delta.full_build()
+
+    with storage.file_lock(os.path.join(cache_dir, f"{key}.lock")):
+        # Un autre processus a pu publier le snapshot pendant l'attente du verrou
+        state = _read_snapshot(target)
+        if state is not None:
+            return state
+        # Snapshot illisible ou d'une autre version du traitement : remplacé
+        shutil.rmtree(target, ignore_errors=True)
+        state = _build(cache_dir)
+        try:
+            _publish_snapshot(state, cache_dir, key)
+        except OSError as exc:
+            warnings.warn(f"Echec de l'écriture du snapshot {target} : {exc}")
+            return state
+    _prune(cache_dir, keep=key)
+    # Relecture par mmap : ce processus partage lui aussi la copie du cache de pages
+    return _read_snapshot(target) or state
+
+
+def load_panel(cache_dir=None):
+    """Retourne ``(df_processed, df_original)`` depuis le snapshot, ou le construit."""
+    state = load_snapshot(cache_dir)
+    return state["processed"], state["original"]
+
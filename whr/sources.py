@@ -0,0 +1,104 @@
+"""Fichiers sources et schémas déclarés.
+
+Chaque source décrit le fichier brut, les colonnes conservées avec leur type
+attendu et, le cas échéant, le filtre de lignes appliqué dès l'ingestion.
+``whr.ingest`` valide chaque fichier contre ce schéma avant d'écrire
+l'artefact Parquet typé lu par l'application.
+
+Les rapports annuels (un classement pour une seule année) sont déclarés avec
+``release=<année>`` : le traitement les fusionne tous, sans code propre à une
+année. Un nouveau rapport se déclare sans toucher au code, dans le fichier
+``releases.json`` du répertoire des données (``WHR_RELEASES`` pour un autre
+chemin) ; il doit contenir les colonnes de ``_RELEASE_COLUMNS`` ::
+
+    [{"name": "whr_2022", "path": "WHR2022.xlsx", "release": 2022}]
+"""
+import json
+import os
+from dataclasses import dataclass, field
+
+# --- Configuration des chemins de fichiers ---
+FILE_PATH_WHR = "world-happiness-report.csv"
+FILE_PATH_MERGE_ID = "Merge_ID_Year_Country.csv"
+FILE_PATH_WHR_2020 = "WHR20_DataForFigure2.1.xlsx"
+FILE_PATH_WHR_2021 = "world-happiness-report-2021.csv"
+FILE_PATH_GDP = "Logged_GDP_per_Capita_2005-2023.xlsx"
+FILE_PATH_LIFE = "Healthy Life Expectancy 2000-2021.csv"
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    path: str
+    columns: dict  # colonne -> dtype pandas attendu
+    sep: str = ','
+    row_filter: dict = field(default_factory=dict)  # colonne -> valeur conservée
+    entity: str = 'Country name'  # colonne identifiant le pays (nom, ou code ISO pour la Banque mondiale et l'OMS)
+    year: str = None  # colonne de l'année (None pour un rapport annuel)
+    release: int = None  # année couverte par un rapport annuel
+
+    @property
+    def is_excel(self):
+        return self.path.endswith(".xlsx")
+
+
+# Colonnes d'un rapport annuel utilisées par le traitement
+_RELEASE_COLUMNS = {
+    'Country name': 'str', 'Regional indicator': 'str', 'Ladder score': 'float64',
+    'Logged GDP per capita': 'float64', 'Social support': 'float64', 'Healthy life expectancy': 'float64',
+    'Freedom to make life choices': 'float64', 'Generosity': 'float64', 'Perceptions of corruption': 'float64',
+}
+
+SOURCES = {source.name: source for source in (
+    Source("whr", FILE_PATH_WHR, {
+        'Country name': 'str', 'year': 'int64', 'Life Ladder': 'float64', 'Log GDP per capita': 'float64',
+        'Social support': 'float64', 'Healthy life expectancy at birth': 'float64',
+        'Freedom to make life choices': 'float64', 'Generosity': 'float64', 'Perceptions of corruption': 'float64',
+        'Positive affect': 'float64', 'Negative affect': 'float64',
+    }, year='year'),
+    Source("id_base", FILE_PATH_MERGE_ID, {
+        'id': 'str', 'year': 'int64', 'Country name': 'str', 'ISO-alpha3 Code': 'str',
+    }, sep=';', year='year'),
+    Source("whr_2020", FILE_PATH_WHR_2020, _RELEASE_COLUMNS, release=2020),
+    # Le fichier 2021 est conservé en entier : la page "Synthèse jeux de données" le présente tel quel
+    Source("whr_2021", FILE_PATH_WHR_2021, {
+        'Country name': 'str', 'Regional indicator': 'str', 'Ladder score': 'float64',
+        'Standard error of ladder score': 'float64', 'upperwhisker': 'float64', 'lowerwhisker': 'float64',
+        'Logged GDP per capita': 'float64', 'Social support': 'float64', 'Healthy life expectancy': 'float64',
+        'Freedom to make life choices': 'float64', 'Generosity': 'float64', 'Perceptions of corruption': 'float64',
+        'Ladder score in Dystopia': 'float64', 'Explained by: Log GDP per capita': 'float64',
+        'Explained by: Social support': 'float64', 'Explained by: Healthy life expectancy': 'float64',
+        'Explained by: Freedom to make life choices': 'float64', 'Explained by: Generosity': 'float64',
+        'Explained by: Perceptions of corruption': 'float64', 'Dystopia + residual': 'float64',
+    }, release=2021),
+    Source("gdp", FILE_PATH_GDP, {
+        'Country Name': 'str', 'Country Code': 'str', 'Time': 'int64', 'LN': 'float64',
+    }, entity='Country Code', year='Time'),
+    Source("life", FILE_PATH_LIFE, {
+        'Period': 'int64', 'SpatialDimValueCode': 'str', 'Dim1': 'str', 'FactValueNumeric': 'float64',
+    }, sep=';', row_filter={'Dim1': 'Both sexes'}, entity='SpatialDimValueCode', year='Period'),
+)}
+
+RELEASES_FILE = os.environ.get("WHR_RELEASES", "releases.json")
+
+
+def declared_releases(path=RELEASES_FILE):
+    """Rapports annuels supplémentaires déclarés dans ``path`` (liste vide si le fichier n'existe pas)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    return [Source(e["name"], e["path"], _RELEASE_COLUMNS, sep=e.get("sep", ","), release=int(e["release"]))
+            for e in entries]
+
+
+for _source in declared_releases():
+    if _source.name in SOURCES:
+        raise ValueError(f"Source déjà déclarée : {_source.name!r} ({RELEASES_FILE})")
+    SOURCES[_source.name] = _source
+
+SOURCE_FILES = tuple(source.path for source in SOURCES.values())
+
+# Rapports annuels, du plus récent au plus ancien
+RELEASES = tuple(sorted((s for s in SOURCES.values() if s.release), key=lambda s: s.release, reverse=True))
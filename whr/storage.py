@@ -0,0 +1,53 @@
+"""Utilitaires fichiers partagés par le snapshot et les artefacts d'ingestion."""
+import contextlib
+import hashlib
+import os
+import tempfile
+
+_HASH_MEMO = {}
+
+
+def file_digest(path):
+    """Hash SHA-256 du contenu d'un fichier, mémorisé par (taille, mtime)."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _HASH_MEMO.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _HASH_MEMO[memo_key] = digest
+    return digest
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Verrou exclusif entre processus (flock) ; sans effet sous Windows."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a+") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Donne un chemin temporaire à remplir, publié sur ``path`` par ``os.replace``."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    os.close(fd)
+    try:
+        yield tmp
+        os.chmod(tmp, 0o644)  # mkstemp crée le fichier en 0600
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
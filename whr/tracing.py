@@ -0,0 +1,195 @@
+"""Traces par étape du pipeline et des pages.
+
+Chaque étape instrumentée est entourée d'un ``span`` qui mesure la durée
+réelle, le temps CPU du thread, les lignes en entrée et en sortie et la
+variation de mémoire résidente du processus. Les spans terminés sont
+conservés dans un tampon borné, affichés par le panneau de diagnostic de la
+barre latérale et exportables au format Chrome trace (``chrome://tracing``,
+Perfetto).
+
+``python -m whr.tracing trace.json`` trace une exécution complète du
+pipeline et le rendu headless de chaque page, puis exporte la trace.
+
+Le traçage est désactivé par défaut : ``span`` retourne alors un objet
+inerte partagé et le coût se limite à deux tests. Il s'active pour tout le
+processus (``WHR_TRACE=1`` ou :func:`enable`) ou pour le seul thread courant
+(:func:`session`, le thread d'une session Streamlit) sans toucher aux autres
+sessions.
+
+    with tracing.span("merge_gdp", rows_in=len(df)) as sp:
+        df = df.merge(...)
+        sp.rows_out = len(df)
+"""
+import argparse
+import collections
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+MAX_SPANS = 10_000
+
+_enabled = os.environ.get("WHR_TRACE", "") not in ("", "0")
+_spans = collections.deque(maxlen=MAX_SPANS)
+_lock = threading.Lock()
+_local = threading.local()
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def _rss_bytes():
+    """Mémoire résidente du processus (Linux : /proc/self/statm), None ailleurs."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _NoopSpan:
+    """Span inerte renvoyé quand le traçage est désactivé."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "cat", "rows_in", "rows_out", "args", "_start", "_cpu", "_rss", "_depth")
+
+    def __init__(self, name, cat, rows_in, args):
+        self.name, self.cat, self.rows_in, self.rows_out, self.args = name, cat, rows_in, None, args
+
+    def __enter__(self):
+        self._depth = getattr(_local, "depth", 0)
+        _local.depth = self._depth + 1
+        self._rss = _rss_bytes()
+        self._cpu = time.thread_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        cpu = time.thread_time() - self._cpu
+        rss = _rss_bytes()
+        _local.depth = self._depth
+        record = {
+            "name": self.name, "cat": self.cat,
+            "start": self._start, "wall_s": end - self._start, "cpu_s": cpu,
+            "rows_in": self.rows_in, "rows_out": self.rows_out,
+            "mem_delta": rss - self._rss if rss is not None and self._rss is not None else None,
+            "depth": self._depth, "tid": threading.get_ident(), "pid": os.getpid(),
+            "error": exc_type.__name__ if exc_type else None, **self.args,
+        }
+        with _lock:
+            _spans.append(record)
+        return False
+
+
+def span(name, cat="pipeline", rows_in=None, **args):
+    """Context manager mesurant une étape ; ``rows_out`` peut être renseigné dans le bloc."""
+    if not (_enabled or getattr(_local, "enabled", False)):
+        return _NOOP
+    return Span(name, cat, rows_in, args)
+
+
+def is_enabled():
+    return _enabled or getattr(_local, "enabled", False)
+
+
+@contextlib.contextmanager
+def session(enabled):
+    """Active (ou non) le traçage pour le thread courant le temps du bloc, sans changer l'état du processus."""
+    previous = getattr(_local, "enabled", False)
+    _local.enabled = bool(enabled)
+    try:
+        yield
+    finally:
+        _local.enabled = previous
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def records():
+    """Copie des spans terminés, du plus ancien au plus récent."""
+    with _lock:
+        return list(_spans)
+
+
+def clear():
+    with _lock:
+        _spans.clear()
+
+
+def chrome_trace(spans=None):
+    """Spans au format Chrome trace (événements complets ``"ph": "X"``, temps en microsecondes)."""
+    spans = records() if spans is None else spans
+    events = []
+    for s in spans:
+        args = {k: v for k, v in s.items()
+                if k not in ("name", "cat", "start", "wall_s", "pid", "tid", "depth") and v is not None}
+        events.append({"name": s["name"], "cat": s["cat"], "ph": "X",
+                       "ts": round(s["start"] * 1e6, 3), "dur": round(s["wall_s"] * 1e6, 3),
+                       "pid": s["pid"], "tid": s["tid"], "args": args})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export(path, spans=None):
+    """Ecrit la trace Chrome des spans dans ``path``."""
+    from whr import storage
+
+    with storage.atomic_path(path) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(spans), f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trace le pipeline et le rendu des pages, export Chrome trace.")
+    parser.add_argument("output", nargs="?", default="whr-trace.json")
+    parser.add_argument("--no-pages", action="store_true", help="ne trace que le pipeline")
+    args = parser.parse_args(argv)
+
+    from whr import pipeline, report
+
+    enable()
+    pipeline.load_and_preprocess_data()
+    if not args.no_pages:
+        import vues
+        for title in vues.PAGES:
+            with span(f"page:{title}", cat="page"):
+                report.render_page(title)
+    export(args.output)
+    for s in sorted(records(), key=lambda s: s["start"]):
+        print(f"{'  ' * s['depth']}{s['name']:<{45 - 2 * s['depth']}}{s['wall_s'] * 1000:>10.1f} ms")
+    print(f"Trace écrite dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    # Module importé sous son nom : les spans du pipeline vont dans le même tampon
+    from whr.tracing import main as _main
+    sys.exit(_main())